@@ -1,746 +1,66 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import os
+import tempfile
 from datetime import datetime, timedelta
 import time
-
-# Nakshatra data with market characteristics
-nakshatras = [
-    ("Ashwini", 0, 13+20/60, "Impulsive", "High volatility, quick moves"),
-    ("Bharani", 13+20/60, 26+40/60, "Restrictive", "Resistance levels, consolidation"),
-    ("Krittika", 26+40/60, 40, "Sharp", "Sharp moves, breakouts"),
-    ("Rohini", 40, 53+20/60, "Growth", "Steady uptrend, bull market"),
-    ("Mrigashira", 53+20/60, 66+40/60, "Searching", "Range-bound, uncertainty"),
-    ("Ardra", 66+40/60, 80, "Destructive", "High volatility, corrections"),
-    ("Punarvasu", 80, 93+20/60, "Renewal", "Recovery, bounce back"),
-    ("Pushya", 93+20/60, 106+40/60, "Nourishing", "Steady growth, accumulation"),
-    ("Ashlesha", 106+40/60, 120, "Entangling", "Sideways, manipulation"),
-    ("Magha", 120, 133+20/60, "Royal", "Leadership stocks outperform"),
-    ("Purva Phalguni", 133+20/60, 146+40/60, "Enjoyment", "Consumption stocks up"),
-    ("Uttara Phalguni", 146+40/60, 160, "Service", "Service sector strength"),
-    ("Hasta", 160, 173+20/60, "Skillful", "Technical analysis works"),
-    ("Chitra", 173+20/60, 186+40/60, "Beautiful", "Luxury goods, aesthetics"),
-    ("Swati", 186+40/60, 200, "Independent", "Individual stock moves"),
-    ("Vishakha", 200, 213+20/60, "Purposeful", "Directional moves"),
-    ("Anuradha", 213+20/60, 226+40/60, "Friendly", "Broad market participation"),
-    ("Jyeshtha", 226+40/60, 240, "Chief", "Large cap leadership"),
-    ("Mula", 240, 253+20/60, "Root", "Fundamental analysis focus"),
-    ("Purva Ashadha", 253+20/60, 266+40/60, "Invincible", "Strong trending moves"),
-    ("Uttara Ashadha", 266+40/60, 280, "Victory", "Final push, completion"),
-    ("Shravana", 280, 293+20/60, "Listening", "News-driven moves"),
-    ("Dhanishta", 293+20/60, 306+40/60, "Wealthy", "Financial sector focus"),
-    ("Shatabhisha", 306+40/60, 320, "Healing", "Recovery after correction"),
-    ("Purva Bhadrapada", 320, 333+20/60, "Dual", "Mixed signals, confusion"),
-    ("Uttara Bhadrapada", 333+20/60, 346+40/60, "Depth", "Value investing"),
-    ("Revati", 346+40/60, 360, "Wealthy", "Prosperity, bull market end")
-]
-
-# Zodiac signs and market characteristics
-zodiac_market_traits = {
-    "Aries": {"trend": "Bullish", "volatility": "High", "sectors": "Energy, Defense, Metals"},
-    "Taurus": {"trend": "Stable", "volatility": "Low", "sectors": "Banking, FMCG, Real Estate"},
-    "Gemini": {"trend": "Volatile", "volatility": "Medium", "sectors": "IT, Telecom, Media"},
-    "Cancer": {"trend": "Defensive", "volatility": "Medium", "sectors": "Healthcare, Food, Home"},
-    "Leo": {"trend": "Strong", "volatility": "Medium", "sectors": "Luxury, Entertainment, Gold"},
-    "Virgo": {"trend": "Cautious", "volatility": "Low", "sectors": "Pharma, Services, Analytics"},
-    "Libra": {"trend": "Balanced", "volatility": "Low", "sectors": "Beauty, Fashion, Harmony"},
-    "Scorpio": {"trend": "Intense", "volatility": "High", "sectors": "Mining, Chemicals, Research"},
-    "Sagittarius": {"trend": "Optimistic", "volatility": "Medium", "sectors": "Travel, Education, Export"},
-    "Capricorn": {"trend": "Conservative", "volatility": "Low", "sectors": "Infrastructure, Government"},
-    "Aquarius": {"trend": "Innovative", "volatility": "High", "sectors": "Technology, Renewables, EV"},
-    "Pisces": {"trend": "Emotional", "volatility": "High", "sectors": "Water, Oil, Spirituality"}
-}
-
-# Market sessions
-market_sessions = {
-    "Pre-Market": {"start": "09:00", "end": "09:15", "characteristics": "Gap analysis, overnight news impact"},
-    "Opening": {"start": "09:15", "end": "10:00", "characteristics": "High volatility, trend setting, institutional orders"},
-    "Morning": {"start": "10:00", "end": "11:30", "characteristics": "Primary trend development, momentum building"},
-    "Mid-Session": {"start": "11:30", "end": "13:30", "characteristics": "Institutional activity, large orders"},
-    "Afternoon": {"start": "13:30", "end": "15:00", "characteristics": "Retail participation, profit booking"},
-    "Closing": {"start": "15:00", "end": "15:30", "characteristics": "Settlement, final adjustments, closing prices"}
-}
-
-# Enhanced planet weights for aspect strength
-planet_weights = {
-    "Sun": 2.0, "Moon": 1.8, "Mars": 1.5, "Mercury": 1.2,
-    "Jupiter": 2.2, "Venus": 1.6, "Saturn": 1.8,
-    "Rahu": 1.4, "Ketu": 1.4
-}
-
-# Planetary market influences
-planetary_influences = {
-    "Sun": {
-        "positive": "Government policies favorable, PSU stocks rise, leadership emergence",
-        "negative": "Ego-driven decisions, power struggles, overconfidence in markets"
-    },
-    "Moon": {
-        "positive": "FMCG sector strength, emotional buying, consumer sentiment positive", 
-        "negative": "Emotional trading, mood swings, panic selling"
-    },
-    "Mars": {
-        "positive": "Energy sector boom, metals rally, defense stocks up, aggressive buying",
-        "negative": "War-like conditions, aggressive selling, conflict in markets"
-    },
-    "Mercury": {
-        "positive": "IT sector leadership, quick gains, communication stocks up, trading activity",
-        "negative": "Volatility, confusion, technical glitches, communication breakdown"
-    },
-    "Jupiter": {
-        "positive": "Banking sector strength, financial optimism, investment inflows, wisdom prevails",
-        "negative": "Over-expansion, excessive optimism, bubble formation"
-    },
-    "Venus": {
-        "positive": "Luxury goods up, beauty sector strong, consumption increase, aesthetic appeal",
-        "negative": "Speculation, materialism, luxury bubble, over-indulgence"
-    },
-    "Saturn": {
-        "positive": "Infrastructure development, disciplined trading, long-term investments",
-        "negative": "Restrictions, delays, bear market, regulatory hurdles"
-    },
-    "Rahu": {
-        "positive": "Innovation boom, foreign investment, technology adoption, unconventional gains",
-        "negative": "Illusion, manipulation, fake news impact, sudden reversals"
-    },
-    "Ketu": {
-        "positive": "Spiritual stocks, detachment from materialism, research-based decisions",
-        "negative": "Sudden exits, abandonment, loss of interest, unexpected events"
-    }
-}
-
-# Base planetary positions for July 30, 2025 (realistic astronomical data)
-BASE_PLANETARY_DATA = {
-    datetime(2025, 7, 30, 12, 0, 0): {
-        "Sun": {"longitude": 127.5, "retrograde": False},      # Leo
-        "Moon": {"longitude": 165.3, "retrograde": False},     # Virgo  
-        "Mars": {"longitude": 52.1, "retrograde": False},      # Taurus
-        "Mercury": {"longitude": 115.8, "retrograde": True},   # Cancer (Retrograde)
-        "Jupiter": {"longitude": 108.9, "retrograde": True},   # Cancer (Retrograde)
-        "Venus": {"longitude": 63.5, "retrograde": False},     # Gemini
-        "Saturn": {"longitude": 340.2, "retrograde": True},    # Pisces (Retrograde)
-        "Rahu": {"longitude": 325.7, "retrograde": True},      # Pisces (Always Retrograde)
-        "Ketu": {"longitude": 145.7, "retrograde": True}       # Virgo (Always Retrograde)
-    }
-}
-
-# Planetary daily movement speeds (degrees per day)
-PLANETARY_SPEEDS = {
-    "Sun": 1.0,           # ~1 degree per day
-    "Moon": 13.0,         # ~13 degrees per day (fastest)
-    "Mercury": 1.5,       # ~1-2 degrees per day (retrograde: -1.0)
-    "Venus": 1.2,         # ~1.2 degrees per day
-    "Mars": 0.6,          # ~0.5-0.7 degrees per day
-    "Jupiter": 0.08,      # ~0.08 degrees per day (retrograde: -0.05)
-    "Saturn": 0.033,      # ~0.033 degrees per day (retrograde: -0.02)
-    "Rahu": -0.05,        # Always retrograde
-    "Ketu": -0.05         # Always retrograde
-}
-
-def get_nakshatra_pada(degree):
-    """Calculate Nakshatra and Pada from longitude with market characteristics"""
-    for nak_data in nakshatras:
-        nak, start, end = nak_data[0], nak_data[1], nak_data[2]
-        if start <= degree < end:
-            pada = int((degree - start) // (13+20/60 / 4)) + 1
-            return nak, pada, nak_data[3], nak_data[4]
-    return "Unknown", 0, "Neutral", "No specific influence"
-
-def get_zodiac_house(degree):
-    """Get zodiac sign and house from longitude"""
-    sign_index = int(degree // 30) % 12
-    house_index = int(degree // 30) % 12
-    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-             "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-    return signs[sign_index], f"House {house_index + 1}"
-
-def convert_degree_to_dms(degree):
-    """Convert decimal degree to degrees, minutes, seconds format"""
-    degree_in_sign = degree % 30
-    degree_int = int(degree_in_sign)
-    minute_int = int((degree_in_sign - degree_int) * 60)
-    second_int = int(((degree_in_sign - degree_int) * 60 - minute_int) * 60)
-    return f"{degree_int}° {minute_int}' {second_int}\""
-
-def calculate_planetary_positions(target_datetime):
-    """Calculate planetary positions for any given date/time using astronomical data"""
-    
-    # Find the closest base date
-    base_date = datetime(2025, 7, 30, 12, 0, 0)
-    base_data = BASE_PLANETARY_DATA[base_date]
-    
-    # Calculate time difference in days
-    time_diff = (target_datetime - base_date).total_seconds() / (24 * 3600)
-    
-    positions = []
-    
-    for planet, base_info in base_data.items():
-        base_longitude = base_info["longitude"]
-        is_retrograde = base_info["retrograde"]
-        
-        # Calculate speed (adjust for retrograde periods)
-        speed = PLANETARY_SPEEDS[planet]
-        
-        # Special retrograde adjustments
-        if planet == "Mercury" and is_retrograde:
-            speed = -1.0  # Retrograde Mercury
-        elif planet == "Jupiter" and is_retrograde:
-            speed = -0.05  # Retrograde Jupiter
-        elif planet == "Saturn" and is_retrograde:
-            speed = -0.02  # Retrograde Saturn
-        
-        # Calculate new position
-        new_longitude = (base_longitude + speed * time_diff) % 360
-        
-        # Get zodiac and nakshatra info
-        sign, house = get_zodiac_house(new_longitude)
-        nak, pada, nak_nature, nak_influence = get_nakshatra_pada(new_longitude)
-        
-        # Format degree
-        degree_formatted = convert_degree_to_dms(new_longitude)
-        
-        positions.append({
-            "Planet": planet,
-            "Sign": sign,
-            "Degree": degree_formatted,
-            "Full_Degree": new_longitude,
-            "House": house,
-            "Nakshatra": nak,
-            "Pada": pada,
-            "Retrograde": "Yes" if is_retrograde else "No",
-            "Date": target_datetime.strftime("%Y-%m-%d %H:%M:%S IST"),
-            "Nakshatra_Nature": nak_nature,
-            "Market_Influence": nak_influence
-        })
-    
-    return pd.DataFrame(positions)
-
-def get_aspects(positions):
-    """Calculate aspects between planets with market context"""
-    if positions.empty:
-        return pd.DataFrame(), []
-    
-    aspects = []
-    planets = positions["Planet"].tolist()
-    full_degrees = positions["Full_Degree"].tolist()
-    
-    # Define aspect angles with orbs and market interpretations
-    aspect_config = {
-        0: ("Conjunction", 2.0, "Unity", "Combined planetary energy - sector focus"),
-        60: ("Sextile", 2.0, "Opportunity", "Favorable trading opportunities - buy zones"),
-        90: ("Square", 2.0, "Tension", "Market stress and volatility - caution needed"),
-        120: ("Trine", 2.0, "Harmony", "Smooth trending moves - follow momentum"),
-        180: ("Opposition", 2.0, "Conflict", "Reversal potential - exit/hedge positions"),
-        30: ("Semisextile", 1.0, "Adjustment", "Minor corrections - fine-tune positions"),
-        45: ("Semisquare", 1.0, "Friction", "Intraday volatility - scalping opportunities"),
-        135: ("Sesquiquadrate", 1.0, "Crisis", "Sharp moves - breakout/breakdown alerts"),
-        150: ("Quincunx", 1.0, "Adjustment", "Unexpected moves - stay flexible")
-    }
-    
-    for i, p1 in enumerate(planets):
-        for j, p2 in enumerate(planets[i+1:], start=i+1):
-            deg1 = full_degrees[i]
-            deg2 = full_degrees[j]
-            diff = abs(deg2 - deg1)
-            if diff > 180:
-                diff = 360 - diff
-            
-            for angle, (aspect_name, orb, nature, market_effect) in aspect_config.items():
-                if abs(diff - angle) <= orb:
-                    # Calculate weight based on planets involved
-                    weight = (planet_weights.get(p1, 1.0) + planet_weights.get(p2, 1.0)) / 2
-                    
-                    # Determine market tendency
-                    if aspect_name in ["Sextile", "Trine"]:
-                        tendency = "Bullish"
-                        if p1 in ["Jupiter", "Venus"] or p2 in ["Jupiter", "Venus"]:
-                            weight *= 1.4  # Extra bullish for benefics
-                    elif aspect_name in ["Square", "Opposition"]:
-                        tendency = "Bearish"
-                        if p1 in ["Mars", "Saturn", "Rahu", "Ketu"] or p2 in ["Mars", "Saturn", "Rahu", "Ketu"]:
-                            weight *= 1.4  # Extra bearish for malefics
-                    elif aspect_name == "Conjunction":
-                        # Conjunction tendency depends on planets involved
-                        if (p1 in ["Jupiter", "Venus", "Moon"] or p2 in ["Jupiter", "Venus", "Moon"]):
-                            tendency = "Bullish"
-                            weight *= 1.2
-                        elif (p1 in ["Mars", "Saturn", "Rahu", "Ketu"] or p2 in ["Mars", "Saturn", "Rahu", "Ketu"]):
-                            tendency = "Bearish" 
-                            weight *= 1.2
-                        else:
-                            tendency = "Neutral"
-                    else:
-                        tendency = "Neutral"
-                        weight *= 0.8
-                    
-                    # Special combinations
-                    combo_effect = ""
-                    if (p1 == "Sun" and p2 == "Mercury") or (p1 == "Mercury" and p2 == "Sun"):
-                        combo_effect = "IT sector focus, communication boost"
-                    elif (p1 == "Moon" and p2 == "Venus") or (p1 == "Venus" and p2 == "Moon"):
-                        combo_effect = "FMCG and luxury goods strength"
-                    elif (p1 == "Mars" and p2 == "Saturn") or (p1 == "Saturn" and p2 == "Mars"):
-                        combo_effect = "Infrastructure and energy sector impact"
-                    elif (p1 == "Jupiter" and p2 == "Mercury") or (p1 == "Mercury" and p2 == "Jupiter"):
-                        combo_effect = "Banking and fintech opportunities"
-                    
-                    aspects.append({
-                        "Planet1": p1,
-                        "Planet2": p2,
-                        "Aspect": aspect_name,
-                        "Exact_Degree": f"{diff:.2f}°",
-                        "Orb": f"{abs(diff - angle):.2f}°",
-                        "Weight": round(weight, 2),
-                        "Tendency": tendency,
-                        "Strength": "Strong" if abs(diff - angle) <= orb/2 else "Moderate",
-                        "Nature": nature,
-                        "Market_Effect": market_effect,
-                        "Combo_Effect": combo_effect
-                    })
-                    break
-    
-    return pd.DataFrame(aspects), aspects
-
-def analyze_market_session(time_str, aspects_df, positions_df):
-    """Analyze market characteristics for specific session with enhanced logic"""
-    hour = int(time_str.split(':')[0])
-    minute = int(time_str.split(':')[1])
-    time_decimal = hour + minute/60
-    
-    # Determine session
-    if 9.0 <= time_decimal < 9.25:
-        session = "Pre-Market"
-        session_emoji = "🌅"
-    elif 9.25 <= time_decimal < 10.0:
-        session = "Opening" 
-        session_emoji = "🔔"
-    elif 10.0 <= time_decimal < 11.5:
-        session = "Morning"
-        session_emoji = "🌄"
-    elif 11.5 <= time_decimal < 13.5:
-        session = "Mid-Session"
-        session_emoji = "🌇"
-    elif 13.5 <= time_decimal < 15.0:
-        session = "Afternoon"
-        session_emoji = "🌆"
-    elif 15.0 <= time_decimal <= 15.5:
-        session = "Closing"
-        session_emoji = "🌃"
-    else:
-        session = "After-Hours"
-        session_emoji = "🌙"
-    
-    # Calculate session characteristics
-    bullish_count = len(aspects_df[aspects_df["Tendency"] == "Bullish"])
-    bearish_count = len(aspects_df[aspects_df["Tendency"] == "Bearish"])
-    total_weight = aspects_df["Weight"].sum()
-    bullish_weight = aspects_df[aspects_df["Tendency"] == "Bullish"]["Weight"].sum()
-    bearish_weight = aspects_df[aspects_df["Tendency"] == "Bearish"]["Weight"].sum()
-    
-    # Enhanced outlook calculation
-    if total_weight > 0:
-        bullish_ratio = bullish_weight / total_weight
-        bearish_ratio = bearish_weight / total_weight
-        
-        if bullish_ratio > 0.7:
-            outlook = "Strong Bullish"
-            emoji = "🚀"
-        elif bullish_ratio > 0.55:
-            outlook = "Bullish"
-            emoji = "📈"
-        elif bearish_ratio > 0.7:
-            outlook = "Strong Bearish"
-            emoji = "💥"
-        elif bearish_ratio > 0.55:
-            outlook = "Bearish"
-            emoji = "📉"
-        else:
-            outlook = "Neutral"
-            emoji = "➡️"
-    else:
-        outlook = "Neutral"
-        emoji = "➡️"
-    
-    # Session-specific adjustments
-    if session == "Opening" and bullish_count > bearish_count:
-        outlook += " (Gap Up Likely)"
-    elif session == "Opening" and bearish_count > bullish_count:
-        outlook += " (Gap Down Likely)"
-    elif session == "Closing":
-        if bullish_count > bearish_count:
-            outlook += " (Positive Close)"
-        elif bearish_count > bullish_count:
-            outlook += " (Negative Close)"
-    
-    return {
-        "session": session,
-        "session_emoji": session_emoji,
-        "outlook": outlook,
-        "emoji": emoji,
-        "bullish_aspects": bullish_count,
-        "bearish_aspects": bearish_count,
-        "bullish_weight": round(bullish_weight, 2),
-        "bearish_weight": round(bearish_weight, 2),
-        "strength": "High" if total_weight > 10 else "Medium" if total_weight > 5 else "Low"
-    }
-
-def generate_market_insights(positions_df, aspects_df):
-    """Generate detailed market insights with sector focus"""
-    insights = []
-    
-    # Planetary influence analysis
-    key_influences = []
-    sector_focus = []
-    
-    for _, pos in positions_df.iterrows():
-        planet = pos["Planet"]
-        sign = pos["Sign"]
-        retrograde = pos["Retrograde"]
-        nakshatra = pos["Nakshatra"]
-        
-        trait = zodiac_market_traits.get(sign, {})
-        planet_info = planetary_influences.get(planet, {})
-        
-        # Key planets for market analysis
-        if planet in ["Sun", "Moon", "Mercury", "Jupiter", "Mars"]:
-            retro_text = " (Retrograde)" if retrograde == "Yes" else ""
-            
-            influence_text = f"**{planet} in {sign}{retro_text}** → {trait.get('trend', 'Neutral')} sentiment"
-            
-            if retrograde == "Yes":
-                if planet == "Mercury":
-                    influence_text += " → Communication delays, tech volatility, review financial decisions"
-                elif planet == "Jupiter": 
-                    influence_text += " → Banking sector caution, review expansion plans"
-                elif planet == "Mars":
-                    influence_text += " → Energy sector consolidation, delayed projects"
-            
-            # Add sector focus
-            sectors = trait.get('sectors', '')
-            if sectors:
-                influence_text += f" | **Sectors**: {sectors}"
-            
-            key_influences.append(influence_text)
-            
-            # Nakshatra-specific influence
-            if pos["Market_Influence"] and pos["Market_Influence"] != "No specific influence":
-                sector_focus.append(f"{planet} in {nakshatra}: {pos['Market_Influence']}")
-    
-    # Critical aspects analysis
-    critical_aspects = []
-    for _, aspect in aspects_df.iterrows():
-        if aspect["Strength"] == "Strong" and aspect["Weight"] > 2.0:
-            effect_text = f"**{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']}** → {aspect['Market_Effect']}"
-            
-            if aspect["Combo_Effect"]:
-                effect_text += f" | {aspect['Combo_Effect']}"
-            
-            critical_aspects.append(effect_text)
-    
-    return {
-        "key_influences": key_influences,
-        "sector_focus": sector_focus,
-        "critical_aspects": critical_aspects
-    }
-
-def detect_planetary_transits(current_positions, previous_positions=None):
-    """Detect detailed planetary transits with market impact"""
-    if previous_positions is None or previous_positions.empty:
-        return []
-    
-    transits = []
-    for _, current_row in current_positions.iterrows():
-        planet = current_row["Planet"]
-        prev_row = previous_positions[previous_positions["Planet"] == planet]
-        
-        if not prev_row.empty:
-            prev_row = prev_row.iloc[0]
-            
-            # Sign change (major transit)
-            if current_row["Sign"] != prev_row["Sign"]:
-                old_trait = zodiac_market_traits.get(prev_row["Sign"], {})
-                new_trait = zodiac_market_traits.get(current_row["Sign"], {})
-                impact = f"Market shift: {old_trait.get('trend', 'Neutral')} → {new_trait.get('trend', 'Neutral')}"
-                transits.append({
-                    "type": "Sign Change",
-                    "planet": planet,
-                    "change": f"{prev_row['Sign']} → {current_row['Sign']}",
-                    "impact": impact,
-                    "sectors": new_trait.get('sectors', 'General'),
-                    "strength": "High"
-                })
-            
-            # Nakshatra change (moderate transit)
-            elif current_row["Nakshatra"] != prev_row["Nakshatra"]:
-                transits.append({
-                    "type": "Nakshatra Change", 
-                    "planet": planet,
-                    "change": f"{prev_row['Nakshatra']} → {current_row['Nakshatra']}",
-                    "impact": current_row["Market_Influence"],
-                    "sectors": "Sector-specific",
-                    "strength": "Medium"
-                })
-            
-            # Significant degree movement
-            else:
-                deg_diff = abs(current_row["Full_Degree"] - prev_row["Full_Degree"])
-                if deg_diff > 0.5:  # More than 30 minutes of movement
-                    transits.append({
-                        "type": "Degree Movement",
-                        "planet": planet, 
-                        "change": f"{deg_diff:.1f}° movement",
-                        "impact": "Gradual influence change",
-                        "sectors": "Intraday impact",
-                        "strength": "Low"
-                    })
-    
-    return transits
-
-def calculate_enhanced_trading_signal(aspects_df, session_info, new_aspects=None, dissolved_aspects=None, transits=None):
-    """Calculate enhanced trading signal with comprehensive analysis"""
-    if aspects_df.empty:
-        return "Neutral", "gray", 0, 0, "No planetary aspects active", []
-    
-    # Base score calculation with aspect strength
-    bullish_score = 0
-    bearish_score = 0
-    signal_reasons = []
-    
-    for _, aspect in aspects_df.iterrows():
-        weight = aspect["Weight"]
-        strength_multiplier = 1.5 if aspect["Strength"] == "Strong" else 1.0
-        
-        if aspect["Tendency"] == "Bullish":
-            bullish_score += weight * strength_multiplier
-        elif aspect["Tendency"] == "Bearish":
-            bearish_score += weight * strength_multiplier
-    
-    # New aspects bonus (formation)
-    if new_aspects:
-        for aspect in new_aspects:
-            if aspect["Strength"] == "Strong":
-                bonus = aspect["Weight"] * 0.5
-                if aspect["Tendency"] == "Bullish":
-                    bullish_score += bonus
-                    signal_reasons.append(f"New {aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']} forming (+{bonus:.1f})")
-                elif aspect["Tendency"] == "Bearish":
-                    bearish_score += bonus
-                    signal_reasons.append(f"New {aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']} forming (-{bonus:.1f})")
-    
-    # Dissolved aspects impact (separation)
-    if dissolved_aspects:
-        for aspect in dissolved_aspects:
-            bonus = aspect["Weight"] * 0.3
-            if aspect["Tendency"] == "Bullish":
-                bearish_score += bonus  # Loss of bullish aspect = bearish
-                signal_reasons.append(f"{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']} dissolving (-{bonus:.1f})")
-            elif aspect["Tendency"] == "Bearish":
-                bullish_score += bonus  # Loss of bearish aspect = bullish
-                signal_reasons.append(f"{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']} dissolving (+{bonus:.1f})")
-    
-    # Transit impact
-    if transits:
-        for transit in transits:
-            if transit["strength"] == "High":
-                if "Bullish" in transit["impact"] or "growth" in transit["impact"].lower():
-                    bullish_score += 1.0
-                    signal_reasons.append(f"{transit['planet']} {transit['change']} (+1.0)")
-                elif "Bearish" in transit["impact"] or "caution" in transit["impact"].lower():
-                    bearish_score += 1.0
-                    signal_reasons.append(f"{transit['planet']} {transit['change']} (-1.0)")
-    
-    # Session-based adjustments
-    session = session_info["session"]
-    if session == "Opening":
-        bullish_score *= 1.2
-        bearish_score *= 1.2
-        signal_reasons.append("Opening volatility amplification")
-    elif session == "Closing":
-        bullish_score *= 0.9
-        bearish_score *= 0.9
-        signal_reasons.append("Closing moderation effect")
-    
-    # Calculate net score and determine signal
-    net_score = bullish_score - bearish_score
-    total_score = bullish_score + bearish_score
-    
-    if total_score == 0:
-        signal = "Neutral"
-        color = "gray"
-    else:
-        signal_ratio = abs(net_score) / total_score
-        
-        if signal_ratio > 0.65:  # Strong signal threshold
-            if net_score > 0:
-                signal = "Strong Buy"
-                color = "darkgreen"
-            else:
-                signal = "Strong Sell" 
-                color = "darkred"
-        elif signal_ratio > 0.35:  # Moderate signal
-            if net_score > 0:
-                signal = "Buy"
-                color = "lightgreen" 
-            else:
-                signal = "Sell"
-                color = "lightcoral"
-        else:
-            signal = "Neutral"
-            color = "gray"
-    
-    # Generate detailed signal explanation
-    signal_details = f"Score: {bullish_score:.1f}B - {bearish_score:.1f}B = {net_score:.1f}"
-    
-    return signal, color, round(bullish_score, 2), round(bearish_score, 2), signal_details, signal_reasons
-
-def generate_daily_report(date, positions_df, timeline_df):
-    """Generate comprehensive daily report like DeepSeek"""
-    date_str = date.strftime("%d-%b-%Y").upper()
-    
-    # Header
-    report = f"""
-## 📈📉 NIFTY & BANKNIFTY ASTRO TREND REPORT | {date_str}
-**(Market Hours: 9:15 AM - 3:30 PM IST)**
-
-### 🌕 KEY PLANETARY INFLUENCES"""
-    
-    # Add key planetary influences
-    for _, pos in positions_df.iterrows():
-        if pos["Planet"] in ["Sun", "Moon", "Mercury", "Jupiter", "Mars", "Saturn"]:
-            sign = pos["Sign"]
-            retro = " (Retrograde)" if pos["Retrograde"] == "Yes" else ""
-            trait = zodiac_market_traits.get(sign, {})
-            
-            report += f"\n- **{pos['Planet']} in {sign}{retro}** → {trait.get('trend', 'Neutral')} sentiment"
-            
-            if pos["Retrograde"] == "Yes":
-                if pos["Planet"] == "Mercury":
-                    report += " → Volatility in banking/financials, communication delays"
-                elif pos["Planet"] == "Jupiter":
-                    report += " → Banking sector review, cautious expansion"
-                elif pos["Planet"] == "Saturn":
-                    report += " → Infrastructure delays, regulatory reviews"
-            
-            # Add sector focus
-            sectors = trait.get('sectors', '')
-            if sectors:
-                report += f" | Focus: {sectors}"
-    
-    # Session analysis
-    report += "\n\n### ⏰ INTRADAY TREND TIMELINE"
-    
-    # Group timeline by sessions with enhanced analysis
-    session_data = {
-        "morning": [],
-        "mid": [],
-        "afternoon": []
-    }
-    
-    for _, row in timeline_df.iterrows():
-        time_str = row["DateTime"].split(" ")[1]
-        hour = int(time_str.split(":")[0])
-        
-        signal_emoji = "🚀" if row["Signal"] == "Strong Buy" else "📈" if "Buy" in row["Signal"] else "💥" if row["Signal"] == "Strong Sell" else "📉" if "Sell" in row["Signal"] else "➡️"
-        time_signal = f"{time_str} → {signal_emoji} {row['Signal']}"
-        
-        if 9 <= hour < 11.5:
-            session_data["morning"].append(time_signal)
-        elif 11.5 <= hour < 13.5:
-            session_data["mid"].append(time_signal)
-        else:
-            session_data["afternoon"].append(time_signal)
-    
-    # Morning Session
-    if session_data["morning"]:
-        report += "\n\n**🌅 Morning Session (9:15-11:30 AM)**"
-        morning_signals = [s.split(" → ")[1] for s in session_data["morning"]]
-        buy_count = sum(1 for s in morning_signals if "Buy" in s)
-        sell_count = sum(1 for s in morning_signals if "Sell" in s)
-        
-        if buy_count > sell_count:
-            report += "\n- 📈 **Bullish Bias** - Early strength expected, buy on dips"
-        elif sell_count > buy_count:
-            report += "\n- 📉 **Bearish Pressure** - Early weakness likely, avoid longs"
-        else:
-            report += "\n- ➡️ **Sideways Movement** - Range-bound trading expected"
-        
-        for signal in session_data["morning"][:2]:
-            report += f"\n  - {signal}"
-    
-    # Mid Session
-    if session_data["mid"]:
-        report += "\n\n**🌇 Mid-Session (11:30 AM-1:30 PM)**"
-        mid_signals = [s.split(" → ")[1] for s in session_data["mid"]]
-        buy_count = sum(1 for s in mid_signals if "Buy" in s)
-        sell_count = sum(1 for s in mid_signals if "Sell" in s)
-        
-        if buy_count > sell_count:
-            report += "\n- 📈 **Institutional Buying** - Strong momentum continuation"
-        elif sell_count > buy_count:
-            report += "\n- 📉 **Profit Booking** - Correction phase, institutional selling"
-        else:
-            report += "\n- ➡️ **Consolidation** - Institutional activity balanced"
-        
-        for signal in session_data["mid"][:2]:
-            report += f"\n  - {signal}"
-    
-    # Afternoon Session  
-    if session_data["afternoon"]:
-        report += "\n\n**🌆 Afternoon Session (1:30-3:30 PM)**"
-        afternoon_signals = [s.split(" → ")[1] for s in session_data["afternoon"]]
-        buy_count = sum(1 for s in afternoon_signals if "Buy" in s)
-        sell_count = sum(1 for s in afternoon_signals if "Sell" in s)
-        
-        if buy_count > sell_count:
-            report += "\n- 📈 **Recovery Mode** - Late session bounce, positive close likely"
-        elif sell_count > buy_count:
-            report += "\n- 📉 **Weakness Continues** - Selling pressure persists"
-        else:
-            report += "\n- ➡️ **Settlement Phase** - Balanced closing expected"
-        
-        for signal in session_data["afternoon"][:2]:
-            report += f"\n  - {signal}"
-    
-    # Overall analysis
-    total_buy_signals = len([row for _, row in timeline_df.iterrows() if "Buy" in row["Signal"]])
-    total_sell_signals = len([row for _, row in timeline_df.iterrows() if "Sell" in row["Signal"]])
-    strong_buy_signals = len([row for _, row in timeline_df.iterrows() if row["Signal"] == "Strong Buy"])
-    strong_sell_signals = len([row for _, row in timeline_df.iterrows() if row["Signal"] == "Strong Sell"])
-    
-    # Critical timing analysis
-    max_activity_times = timeline_df.nlargest(3, "Active_Aspects")["DateTime"].str.split(" ").str[1].tolist()
-    
-    # Final outlook
-    if strong_buy_signals > strong_sell_signals and total_buy_signals > total_sell_signals:
-        overall_outlook = "🟢 **Strong Bullish** (High probability gains)"
-        strategy = "**Buy on dips, hold positions, target higher levels**"
-    elif total_buy_signals > total_sell_signals:
-        overall_outlook = "🟢 **Bullish** (Favorable for long positions)"
-        strategy = "**Selective buying, book partial profits at resistance**"
-    elif strong_sell_signals > strong_buy_signals and total_sell_signals > total_buy_signals:
-        overall_outlook = "🔴 **Strong Bearish** (High caution advised)"
-        strategy = "**Avoid longs, consider shorts, strict stop losses**"
-    elif total_sell_signals > total_buy_signals:
-        overall_outlook = "🔴 **Bearish** (Selling pressure likely)"
-        strategy = "**Book profits, reduce positions, wait for reversal**"
-    else:
-        overall_outlook = "🟡 **Neutral** (Range-bound movement)"
-        strategy = "**Range trading, buy support, sell resistance**"
-    
-    report += f"""
-
-### 🎯 FINAL OUTLOOK
-- **Overall Trend**: {overall_outlook}
-- **Key Strategy**: {strategy}
-- **Critical Times**: {", ".join(max_activity_times[:2])} (High activity periods)
-- **Risk Level**: {"High" if strong_sell_signals > 2 else "Medium" if total_sell_signals > total_buy_signals else "Low"}
-
-### 📊 Signal Summary
-- 🚀 Strong Buy: {strong_buy_signals} | 📈 Buy: {total_buy_signals - strong_buy_signals} | 📉 Sell: {total_sell_signals - strong_sell_signals} | 💥 Strong Sell: {strong_sell_signals}
-"""
-    
-    return report
+from astro_engine.aspect_rules import rules_error
+from astro_engine.aspect_sweep import sweep_aspects
+from astro_engine.bodies import BODY_GROUPS, available_asteroids, extended_positions
+from astro_engine.charts import MAX_CHART_POINTS, build_analysis_figure, build_sector_heatmap
+from astro_engine.core import (
+    aspect_rules,
+    convert_degree_to_dms,
+    get_zodiac_house,
+    get_trading_advice,
+    planet_longitudes
+)
+from astro_engine.divisional import DIVISIONAL_CHARTS, divisional_ingresses
+from astro_engine.exchanges import engine_now
+from astro_engine.export import EXPORT_FORMATS, EXPORT_KINDS, export_range
+from astro_engine.prewarm import PREWARM_ENABLED, LiveWarmer, Prewarmer
+from astro_engine.houses import HOUSE_SYSTEMS, exchange_angles, house_cusps, lagna_changes
+from astro_engine.jobs import JOB_PROCESS_WORKERS, default_queue
+from astro_engine.live import live_bundle
+from astro_engine.metrics import (
+    METRICS_FILE,
+    METRICS_PORT,
+    default_registry,
+    stage_summary,
+    start_metrics_file_writer,
+    start_metrics_server,
+    timed
+)
+from astro_engine.result_cache import default_cache, engine_params_hash
+from astro_engine.sectors import SECTOR_PERIODS, sector_heatmap
+from astro_engine.tables import (
+    CRITICALITY_ROW_CSS,
+    PAGE_SIZES,
+    SIGNAL_ROW_CSS,
+    TENDENCY_ROW_CSS,
+    criticality_row_classes,
+    page_count,
+    page_rows,
+    signal_row_classes,
+    style_rows,
+    tendency_row_classes
+)
+from astro_engine.timeline import (
+    DEFAULT_REPORT_SYMBOLS,
+    INDEX_SYMBOLS,
+    INTERVAL_MINUTES,
+    REPORT_INDEX_SYMBOLS,
+    compute_day_aspects,
+    compute_exchange_reports,
+    compute_range_aspects,
+    day_aspects_cache_fields,
+    explain_timeline_rows,
+    score_timeline,
+    summarize_range
+)
+from astro_engine.trading_calendar import trading_days
+from astro_engine.validation import VALIDATION_CASES, VALIDATION_SAMPLE_RATE, default_sampler
 
 # Streamlit App Configuration
 st.set_page_config(
@@ -769,21 +89,214 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Aspect rules are re-read whenever the rule file changes; a rejected edit keeps the previous rules
+aspect_rules()
+if rules_error():
+    st.warning(f"⚠️ Aspect rule file edit rejected, previous rules still in use: {rules_error()}")
+
+# One set of background warmers per server process fills the shared caches for every session
+@st.cache_resource
+def start_prewarmer():
+    """Start the cache warmer for today and the coming trading days, and the live bundle warmer"""
+    prewarmer = Prewarmer(default_cache())
+    prewarmer.start()
+    LiveWarmer().start()
+    return prewarmer
+
+# Metrics are exported once per server process, when a port or file is configured
+@st.cache_resource
+def start_metrics_exporters():
+    """Serve and/or write the Prometheus metrics text"""
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    if METRICS_FILE:
+        start_metrics_file_writer(METRICS_FILE)
+    return True
+
+if METRICS_PORT or METRICS_FILE:
+    start_metrics_exporters()
+
+@st.fragment
+def metrics_panel():
+    """Stage latencies and cache hit rates of this server process"""
+    with st.expander("🛠️ Admin: Runtime Metrics"):
+        st.button("🔄 Refresh", key="refresh_metrics")
+        stages = pd.DataFrame(stage_summary())
+        if not stages.empty:
+            stages[["Mean_s", "P50_s", "P95_s"]] = stages[["Mean_s", "P50_s", "P95_s"]] * 1000
+            stages = stages.rename(columns={"Mean_s": "Mean ms", "P50_s": "P50 ms", "P95_s": "P95 ms"})
+            st.dataframe(stages.set_index("Stage").round(2), use_container_width=True)
+        else:
+            st.caption("No stages timed yet")
+        requests = default_registry().counter(
+            "astro_result_cache_requests_total", "Result cache lookups by result kind and outcome", ("kind", "result")
+        ).values()
+        if requests:
+            lookups = pd.Series(requests).unstack(fill_value=0).reindex(columns=["hit", "miss"], fill_value=0)
+            lookups["Hit Rate"] = (lookups["hit"] / (lookups["hit"] + lookups["miss"])).round(3)
+            st.dataframe(lookups, use_container_width=True)
+        if VALIDATION_SAMPLE_RATE:
+            outcomes = {key[0]: count for key, count in VALIDATION_CASES.values().items()}
+            st.caption(f"Differential validation of {VALIDATION_SAMPLE_RATE:.1%} of analyses: "
+                       + ", ".join(f"{count} {result}" for result, count in sorted(outcomes.items())))
+            if default_sampler().recent:
+                st.dataframe(pd.DataFrame(list(default_sampler().recent)), use_container_width=True)
+        exposition = default_registry().render()
+        st.download_button("📥 Prometheus metrics", exposition, file_name="astro_metrics.prom", mime="text/plain")
+        if METRICS_PORT:
+            st.caption(f"Served at http://127.0.0.1:{METRICS_PORT}/metrics")
+
 # Sidebar Configuration
 st.sidebar.header("🎛️ Analysis Configuration")
 st.sidebar.markdown("---")
+if PREWARM_ENABLED:
+    prewarm_status = start_prewarmer().status
+    warmed_days = ", ".join(day.strftime("%d %b") for day in prewarm_status["days"])
+    if prewarm_status["state"] == "failed":
+        st.sidebar.caption(f"🔥 Cache warmer failed, retrying: {prewarm_status['error']}")
+    else:
+        st.sidebar.caption(f"🔥 Cache warmer {prewarm_status['state']} · {warmed_days}")
+with st.sidebar:
+    metrics_panel()
+
+# Long analyses run as background jobs on a shared queue; these run off the script thread, so no st calls
+@timed("intraday_analysis")
+def run_intraday_analysis(analysis_mode, analysis_date, range_end_date, start_time, end_time, interval_minutes,
+                          symbol, period_label, progress):
+    """Unfiltered aspects of a day or date range, which the intraday tab filters and scores on display"""
+    result_cache = default_cache()
+    if analysis_mode == "Date Range":
+        steps, aspects = compute_range_aspects(
+            analysis_date, range_end_date, start_time, end_time, interval_minutes,
+            max_workers=JOB_PROCESS_WORKERS, progress=progress, cache=result_cache
+        )
+    else:
+        steps, aspects = result_cache.get_or_compute(
+            lambda: compute_day_aspects(
+                datetime.combine(analysis_date, start_time), datetime.combine(analysis_date, end_time),
+                interval_minutes, progress=progress
+            ),
+            **day_aspects_cache_fields(analysis_date, start_time, end_time, interval_minutes)
+        )
+    # A sampled share is re-checked against the scalar references in the background, cached results included
+    default_sampler().maybe_check(steps, aspects)
+    return {
+        "steps": steps,
+        "aspects": aspects,
+        "time_column": "DateTime" if analysis_mode == "Date Range" else "Time",
+        "period_label": period_label,
+        "symbol": symbol
+    }
+
+def scored_analysis(analysis, min_aspect_weight, show_transits):
+    """The stored analysis filtered and scored with the current options, rescored only when they change"""
+    options = (min_aspect_weight, show_transits)
+    if analysis.get("options") != options:
+        timeline_df = score_timeline(analysis["steps"], analysis["aspects"], min_aspect_weight, show_transits)
+        analysis.update(
+            options=options,
+            timeline_df=timeline_df,
+            day_summaries=summarize_range(timeline_df) if "Date" in timeline_df else pd.DataFrame(),
+            row_classes=signal_row_classes(timeline_df["Signal"]) if not timeline_df.empty else None
+        )
+    return analysis
+
+@timed("daily_report")
+def run_daily_report(report_date, report_symbols, progress):
+    """Report timeline and rendered daily report of each exchange, both persisted in the result cache"""
+    reports = compute_exchange_reports(report_date, report_symbols, cache=default_cache(), progress=progress)
+    return {"date": report_date, "reports": reports}
+
+@timed("bulk_export")
+def run_bulk_export(kind, start_date, end_date, fmt, interval_minutes, min_aspect_weight, progress):
+    """Export a date range to a temporary file of its own; returns its path, download name, row count and format"""
+    file_name = f"astro_{kind}_{start_date:%Y%m%d}_{end_date:%Y%m%d}{EXPORT_FORMATS[fmt]}"
+    handle, export_path = tempfile.mkstemp(prefix="astro_export_", suffix=EXPORT_FORMATS[fmt])
+    os.close(handle)
+    try:
+        rows = export_range(kind, start_date, end_date, export_path, fmt, interval_minutes=interval_minutes,
+                            min_aspect_weight=min_aspect_weight, progress=progress)
+    except BaseException:
+        os.unlink(export_path)
+        raise
+    return {"path": export_path, "file_name": file_name, "rows": rows, "format": fmt}
+
+@st.fragment(run_every="1s")
+def job_progress(job_id):
+    """Live progress and cancel button of a running job; hands over to a full rerun once it ends"""
+    queue = default_queue()
+    job = queue.get(job_id)
+    if job is None or job.state not in ("queued", "running"):
+        st.rerun()
+    counts = queue.counts()
+    st.progress(job.progress, text=f"{job.label}: {job.message}")
+    cancel_col, status_col = st.columns([1, 4])
+    with cancel_col:
+        if st.button("⏹️ Cancel", key=f"cancel_{job.id}"):
+            queue.cancel(job.id)
+    with status_col:
+        st.caption(f"Job {job.id} · {job.state} · {job.elapsed():.0f}s · "
+                   f"{counts['running']} running, {counts['queued']} queued on the server")
+
+def follow_job(job_key, result_key):
+    """Show the session's job in job_key; a finished job's result moves to result_key"""
+    job = default_queue().get(st.session_state.get(job_key))
+    if job is None:
+        return
+    if job.state in ("queued", "running"):
+        job_progress(job.id)
+    elif job.state == "done":
+        st.session_state[result_key] = job.result
+        del st.session_state[job_key]
+    elif job.state == "failed":
+        st.error(f"❌ {job.label} failed: {job.error}")
+    else:
+        st.warning(f"⏹️ {job.label} was cancelled")
+
+# Large tables are paged; only the visible page is styled and sent to the browser
+def show_paged_table(df, key, row_classes=None, css_by_class=None, height=None, explain=None):
+    """Render a table one page at a time, styling rows from precomputed classes
+
+    explain, if given, receives the visible page and returns it with any
+    lazily built columns added.
+    """
+    rows = slice(0, len(df))
+    if len(df) > PAGE_SIZES[0]:
+        page_col1, page_col2, page_col3 = st.columns([1, 1, 3])
+        with page_col1:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+        pages = page_count(len(df), page_size)
+        with page_col2:
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page_{page_size}")
+        with page_col3:
+            st.caption(f"{len(df):,} rows · page {page} of {pages}")
+        rows = page_rows(len(df), page, page_size)
+    
+    page_df = df.iloc[rows]
+    if explain is not None:
+        page_df = explain(page_df)
+    if row_classes is not None:
+        page_df = style_rows(page_df, row_classes[rows], css_by_class)
+    if height is not None:
+        st.dataframe(page_df, use_container_width=True, height=height)
+    else:
+        st.dataframe(page_df, use_container_width=True)
 
 # Enhanced tabs
 tab1, tab2, tab3 = st.tabs(["📊 Live Market Analysis", "🔍 Intraday Deep Dive", "📋 Professional Daily Report"])
 
+# Each tab is a fragment: its widgets rerun only that tab, never the others
 # Tab 1: Live Market Analysis
-with tab1:
+@st.fragment
+def live_market_tab():
+    """Live positions, aspects and signal for the current minute"""
     st.header("📊 Live Planetary Positions & Market Impact")
     
-    current_time = datetime.now()
+    current_time = engine_now().replace(second=0, microsecond=0)
     
     with st.spinner("🔮 Calculating current planetary positions..."):
-        current_positions = calculate_planetary_positions(current_time)
+        snapshot = live_bundle(current_time, engine_params_hash())
+        current_positions = snapshot["positions"]
         
         if not current_positions.empty:
             # Status indicator
@@ -791,21 +304,91 @@ with tab1:
             
             # Enhanced positions display
             st.subheader("🪐 Current Planetary Positions")
-            display_positions = current_positions[["Planet", "Sign", "Degree", "Nakshatra", "Retrograde", "Nakshatra_Nature", "Market_Influence"]]
+            display_positions = current_positions[["Planet", "Sign", "Degree", "House", "Nakshatra", "Navamsa", "Dasamsa", "Retrograde", "Nakshatra_Nature", "Market_Influence"]]
             st.dataframe(display_positions, use_container_width=True)
             
+            # Ascendant at the exchange and the day's lagna changes
+            with st.expander("🌅 Lagna & House Cusps at the Exchange (Mumbai)"):
+                angles = exchange_angles([current_time]).iloc[0]
+                lagna_col1, lagna_col2, lagna_col3 = st.columns(3)
+                with lagna_col1:
+                    st.metric("Lagna", angles["Lagna"], convert_degree_to_dms(angles["Ascendant"]))
+                with lagna_col2:
+                    st.metric("Midheaven", convert_degree_to_dms(angles["Midheaven"]))
+                with lagna_col3:
+                    st.metric("Local Sidereal Time", f"{int(angles['Sidereal_Time']):02d}:{int(angles['Sidereal_Time'] % 1 * 60):02d}")
+                
+                house_system = st.selectbox("House System", HOUSE_SYSTEMS)
+                cusps = house_cusps([current_time], system=house_system).iloc[0]
+                st.dataframe(
+                    pd.DataFrame({"House": cusps.index, "Cusp": [f"{get_zodiac_house(c)[0]} {convert_degree_to_dms(c)}" for c in cusps]}),
+                    use_container_width=True
+                )
+                
+                day_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+                todays_lagnas = lagna_changes(day_start, day_start + timedelta(days=1))
+                todays_lagnas["DateTime"] = todays_lagnas["DateTime"].dt.strftime("%H:%M:%S")
+                st.dataframe(todays_lagnas.rename(columns={"DateTime": "Time (IST)"}), use_container_width=True)
+            
+            # Divisional sign changes over the next day at one-minute resolution
+            with st.expander("🔱 Divisional Chart Ingresses (Next 24 Hours)"):
+                chart_division = st.selectbox(
+                    "Divisional Chart", [d for d in DIVISIONAL_CHARTS if d > 1], index=4,
+                    format_func=lambda d: f"D{d} {DIVISIONAL_CHARTS[d]}"
+                )
+                upcoming_minutes = pd.date_range(current_time.replace(second=0, microsecond=0), periods=24 * 60, freq="min")
+                ingresses = divisional_ingresses(planet_longitudes(upcoming_minutes), chart_division)
+                if ingresses.empty:
+                    st.info("No divisional sign changes in the next 24 hours")
+                else:
+                    ingresses["DateTime"] = ingresses["DateTime"].dt.strftime("%d-%b %H:%M")
+                    st.dataframe(ingresses, use_container_width=True)
+            
+            # Sector exposure from sign placements over a long horizon
+            with st.expander("🗺️ Sector Rotation Heatmap"):
+                heatmap_col1, heatmap_col2, heatmap_col3 = st.columns(3)
+                with heatmap_col1:
+                    heatmap_start = st.date_input("From", current_time.date() - timedelta(days=365), key="sector_from")
+                with heatmap_col2:
+                    heatmap_end = st.date_input("To", current_time.date() + timedelta(days=365), key="sector_to")
+                with heatmap_col3:
+                    heatmap_period = st.radio("Aggregate", list(SECTOR_PERIODS), index=1, horizontal=True)
+                if heatmap_start > heatmap_end:
+                    st.error("❌ The heatmap must end after it starts.")
+                else:
+                    heatmap_df = sector_heatmap(heatmap_start, heatmap_end, heatmap_period)
+                    st.plotly_chart(
+                        build_sector_heatmap(heatmap_df, f"{heatmap_period} Sector Exposure (weighted sign placements)"),
+                        use_container_width=True
+                    )
+            
             # Current aspects analysis
-            current_aspects_df, _ = get_aspects(current_positions)
+            current_aspects_df = snapshot["aspects_df"]
             
             if not current_aspects_df.empty:
                 st.subheader("⚡ Active Planetary Aspects")
                 
                 # Enhanced aspects display
-                aspect_display = current_aspects_df[["Planet1", "Planet2", "Aspect", "Tendency", "Strength", "Weight", "Market_Effect", "Combo_Effect"]]
+                aspect_display = current_aspects_df[["Planet1", "Planet2", "Aspect", "Tendency", "Strength", "Phase", "Hours_To_Exact", "Weight", "Market_Effect", "Combo_Effect"]]
                 st.dataframe(aspect_display, use_container_width=True)
                 
+                # Outer planets, asteroids and fixed stars through the sweep aspect finder
+                with st.expander("🌌 Extended Bodies: Outer Planets, Asteroids & Fixed Stars"):
+                    body_groups = st.multiselect("Include", BODY_GROUPS, default=["Outer Planets", "Fixed Stars"])
+                    if "Asteroids" in body_groups and not available_asteroids():
+                        st.caption("Asteroid ephemeris files not found; set ASTRO_EPHE_PATH to the folder with seas_*.se1")
+                    extended = extended_positions(current_time, body_groups)
+                    extended_aspects_df, _ = sweep_aspects(extended)
+                    st.caption(f"{len(extended)} bodies · {len(extended_aspects_df)} aspects in orb · all positions here, "
+                               "the nine planets included, are true ephemeris positions and can differ from the engine's above")
+                    if not extended_aspects_df.empty:
+                        show_paged_table(
+                            extended_aspects_df[["Planet1", "Planet2", "Aspect", "Orb", "Tendency", "Strength", "Phase", "Weight", "Market_Effect"]],
+                            "extended_aspects"
+                        )
+                
                 # Current session analysis
-                session_info = analyze_market_session(current_time.strftime("%H:%M"), current_aspects_df, current_positions)
+                session_info = snapshot["session_info"]
                 
                 # Session metrics
                 col1, col2, col3, col4, col5 = st.columns(5)
@@ -821,9 +404,7 @@ with tab1:
                     st.metric("Signal Strength", session_info['strength'])
                 
                 # Current trading signal with enhanced analysis
-                signal, color, bull_score, bear_score, signal_details, signal_reasons = calculate_enhanced_trading_signal(
-                    current_aspects_df, session_info
-                )
+                signal, color, bull_score, bear_score, signal_details, signal_reasons = snapshot["signal"]
                 
                 # Signal display with detailed reasoning
                 st.subheader("🎯 Current Trading Signal & Analysis")
@@ -856,80 +437,20 @@ with tab1:
                 
                 # Current planetary speeds and movement
                 st.subheader("🌍 Real-time Planetary Movement Analysis")
-                
-                movement_data = []
-                for _, pos in current_positions.iterrows():
-                    planet = pos["Planet"]
-                    speed = PLANETARY_SPEEDS.get(planet, 0)
-                    daily_movement = abs(speed)
-                    
-                    # Calculate when planet will change nakshatra/sign
-                    current_deg = pos["Full_Degree"] % 30
-                    if speed > 0:
-                        deg_to_next = 30 - current_deg
-                        hours_to_sign_change = deg_to_next / (daily_movement / 24) if daily_movement > 0 else 999
-                    else:
-                        hours_to_sign_change = current_deg / (daily_movement / 24) if daily_movement > 0 else 999
-                    
-                    movement_data.append({
-                        "Planet": planet,
-                        "Current_Position": f"{pos['Sign']} {pos['Degree']}",
-                        "Daily_Speed": f"{daily_movement:.2f}°/day",
-                        "Next_Sign_Change": f"~{hours_to_sign_change:.1f} hours" if hours_to_sign_change < 48 else ">2 days",
-                        "Movement_Direction": "Forward" if speed > 0 else "Retrograde",
-                        "Market_Impact": pos["Market_Influence"]
-                    })
-                
-                movement_df = pd.DataFrame(movement_data)
-                st.dataframe(movement_df, use_container_width=True)
+                st.dataframe(snapshot["movement_df"], use_container_width=True)
                 
                 # Upcoming aspect predictions
                 st.subheader("🔮 Upcoming Aspect Formations (Next 24 Hours)")
                 
-                upcoming_aspects = []
-                future_times = [current_time + timedelta(hours=h) for h in [1, 3, 6, 12, 24]]
-                
-                for future_time in future_times:
-                    future_positions = calculate_planetary_positions(future_time)
-                    future_aspects_df, _ = get_aspects(future_positions)
-                    
-                    # Find new aspects that will form
-                    current_keys = set((row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in current_aspects_df.iterrows())
-                    future_keys = set((row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in future_aspects_df.iterrows())
-                    
-                    new_future_keys = future_keys - current_keys
-                    
-                    for _, aspect in future_aspects_df.iterrows():
-                        if (aspect["Planet1"], aspect["Planet2"], aspect["Aspect"]) in new_future_keys:
-                            hours_ahead = (future_time - current_time).total_seconds() / 3600
-                            upcoming_aspects.append({
-                                "Time_Ahead": f"{hours_ahead:.0f}h",
-                                "Aspect": f"{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']}",
-                                "Tendency": aspect["Tendency"],
-                                "Weight": aspect["Weight"],
-                                "Market_Effect": aspect["Market_Effect"],
-                                "Formation_Time": future_time.strftime("%H:%M")
-                            })
-                
-                if upcoming_aspects:
-                    upcoming_df = pd.DataFrame(upcoming_aspects)
-                    upcoming_df = upcoming_df.sort_values("Weight", ascending=False).head(8)
-                    
-                    def highlight_upcoming(row):
-                        if row["Tendency"] == "Bullish":
-                            return ['background-color: #e8f5e8; color: #2e7d32;'] * len(row)
-                        elif row["Tendency"] == "Bearish":
-                            return ['background-color: #ffebee; color: #c62828;'] * len(row)
-                        else:
-                            return [''] * len(row)
-                    
-                    styled_upcoming = upcoming_df.style.apply(highlight_upcoming, axis=1)
+                upcoming_df = snapshot["upcoming_df"]
+                if not upcoming_df.empty:
+                    styled_upcoming = style_rows(upcoming_df, tendency_row_classes(upcoming_df["Tendency"]), TENDENCY_ROW_CSS)
                     st.dataframe(styled_upcoming, use_container_width=True)
                 else:
                     st.info("No major new aspects forming in the next 24 hours")
                 
                 # Market insights
-                insights = generate_market_insights(current_positions, current_aspects_df)
+                insights = snapshot["insights"]
                 
                 # Display insights in columns
                 insight_col1, insight_col2 = st.columns(2)
@@ -956,8 +477,13 @@ with tab1:
             else:
                 st.info("ℹ️ No significant planetary aspects currently active")
 
+with tab1:
+    live_market_tab()
+
 # Tab 2: Intraday Deep Dive
-with tab2:
+@st.fragment
+def intraday_tab():
+    """Intraday and date-range timelines, kept in session state between reruns"""
     st.header("🔍 Comprehensive Intraday Analysis")
     
     # Enhanced input section
@@ -965,8 +491,13 @@ with tab2:
     
     with analysis_col1:
         st.subheader("📈 Market Settings")
-        symbol = st.selectbox("Select Index", ["NIFTY", "BANKNIFTY", "SENSEX", "FINNIFTY"], index=0)
-        analysis_date = st.date_input("Analysis Date", datetime(2025, 7, 30))
+        symbol = st.selectbox("Select Index", INDEX_SYMBOLS, index=0)
+        analysis_mode = st.radio("Analysis Mode", ["Single Day", "Date Range"], horizontal=True)
+        analysis_date = st.date_input("Analysis Date" if analysis_mode == "Single Day" else "Range Start Date", datetime(2025, 7, 30))
+        if analysis_mode == "Date Range":
+            range_end_date = st.date_input("Range End Date", datetime(2025, 8, 8))
+            range_days = trading_days(analysis_date, range_end_date)
+            st.caption(f"📅 {len(range_days)} NSE trading days in range (weekends and exchange holidays skipped)")
         
         # Advanced options
         with st.expander("🔧 Advanced Options"):
@@ -978,7 +509,7 @@ with tab2:
         st.subheader("⏰ Time Configuration")
         start_time = st.time_input("Market Start Time", datetime(2025, 7, 30, 9, 15).time())
         end_time = st.time_input("Market End Time", datetime(2025, 7, 30, 15, 30).time())
-        time_interval = st.selectbox("Analysis Interval", ["15 minutes", "30 minutes", "1 hour"], index=0)
+        time_interval = st.selectbox("Analysis Interval", list(INTERVAL_MINUTES), index=2)
         
         # Market session highlights
         st.info("""
@@ -997,404 +528,247 @@ with tab2:
         if start_datetime >= end_datetime:
             st.error("❌ End time must be after start time.")
         else:
-            interval_minutes = {"15 minutes": 15, "30 minutes": 30, "1 hour": 60}[time_interval]
-            
-            # Progress tracking
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Analysis execution with enhanced tracking
-            timeline = []
-            previous_positions = None
-            previous_aspects_df = pd.DataFrame()
-            
-            total_intervals = int((end_datetime - start_datetime).total_seconds() / (interval_minutes * 60))
-            current_time = start_datetime
-            interval_count = 0
-            
-            while current_time <= end_datetime:
-                progress = min(interval_count / max(total_intervals, 1), 1.0)
-                progress_bar.progress(progress)
-                status_text.text(f"🔮 Analyzing: {current_time.strftime('%H:%M')} ({interval_count + 1}/{total_intervals + 1})")
-                
-                # Calculate positions and aspects
-                positions = calculate_planetary_positions(current_time)
-                aspects_df, _ = get_aspects(positions)
-                
-                # Filter aspects by minimum weight
-                aspects_df = aspects_df[aspects_df["Weight"] >= min_aspect_weight]
-                
-                # Detect aspect changes (new formations and dissolutions)
-                new_aspects = []
-                dissolved_aspects = []
-                
-                if not previous_aspects_df.empty:
-                    # Compare current vs previous aspects
-                    prev_keys = set((row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in previous_aspects_df.iterrows())
-                    curr_keys = set((row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in aspects_df.iterrows())
-                    
-                    # New aspect formations
-                    new_aspect_keys = curr_keys - prev_keys
-                    new_aspects = [row for _, row in aspects_df.iterrows() 
-                                 if (row["Planet1"], row["Planet2"], row["Aspect"]) in new_aspect_keys]
-                    
-                    # Dissolved aspects
-                    dissolved_aspect_keys = prev_keys - curr_keys  
-                    dissolved_aspects = [row for _, row in previous_aspects_df.iterrows()
-                                       if (row["Planet1"], row["Planet2"], row["Aspect"]) in dissolved_aspect_keys]
-                
-                # Enhanced transit analysis
-                transits = []
-                if previous_positions is not None and show_transits:
-                    transits = detect_planetary_transits(positions, previous_positions)
+            # Queued as a background job; the tab polls its progress instead of blocking
+            if analysis_mode == "Date Range":
+                period_label = f"{analysis_date.strftime('%d %B %Y')} to {range_end_date.strftime('%d %B %Y')}"
+            else:
+                range_end_date = analysis_date
+                period_label = analysis_date.strftime('%d %B %Y')
+            st.session_state["intraday_job"] = default_queue().submit(
+                run_intraday_analysis, analysis_mode, analysis_date, range_end_date, start_time, end_time,
+                INTERVAL_MINUTES[time_interval], symbol, period_label,
+                label=f"{symbol} analysis for {period_label}"
+            )
+    
+    follow_job("intraday_job", "intraday_analysis")
+    
+    # The weight filter and transit option rescore the stored aspects without recomputing positions
+    intraday_analysis = st.session_state.get("intraday_analysis")
+    if intraday_analysis is not None:
+        intraday_analysis = scored_analysis(intraday_analysis, min_aspect_weight, show_transits)
+        timeline_df = intraday_analysis["timeline_df"]
+        day_summaries = intraday_analysis["day_summaries"]
+        time_column = intraday_analysis["time_column"]
+        period_label = intraday_analysis["period_label"]
+        analysed_symbol = intraday_analysis["symbol"]
+        
+        if timeline_df.empty:
+            st.warning("⚠️ No trading days in the selected range")
+        else:
+            # Enhanced summary metrics
+            st.subheader(f"📊 {analysed_symbol} Complete Analysis - {period_label}")
+            
+            # Signal distribution
+            signal_counts = timeline_df["Signal"].value_counts()
+            metric_col1, metric_col2, metric_col3, metric_col4, metric_col5 = st.columns(5)
+            
+            with metric_col1:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric("🚀 Strong Buy", signal_counts.get("Strong Buy", 0))
+                st.markdown('</div>', unsafe_allow_html=True)
+            with metric_col2:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric("📈 Buy", signal_counts.get("Buy", 0))
+                st.markdown('</div>', unsafe_allow_html=True)
+            with metric_col3:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric("➡️ Neutral", signal_counts.get("Neutral", 0))
+                st.markdown('</div>', unsafe_allow_html=True)
+            with metric_col4:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric("📉 Sell", signal_counts.get("Sell", 0))
+                st.markdown('</div>', unsafe_allow_html=True)
+            with metric_col5:
+                st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                st.metric("💥 Strong Sell", signal_counts.get("Strong Sell", 0))
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Detailed timeline with enhanced information
+            st.subheader("📈 Detailed Trading Timeline with Aspect Analysis")
+            st.caption("Tithi and Panchang_Nakshatra come from the ephemeris's sidereal (Lahiri) Sun and Moon; "
+                       "the positions table and the aspects use the engine's own planetary model")
+            
+            # Enhanced column selection; explanation columns are built only for the visible page
+            base_columns = [time_column, "Session", "Hora", "Choghadiya", "Rahu_Kaal", "Tithi", "Panchang_Nakshatra", "Signal", "Net_Score", "Session_Outlook", "Active_Aspects"]
+            
+            # Add optional columns
+            if show_transits:
+                base_columns.extend(["Transits", "Aspect_Changes"])
+            if show_combos:
+                base_columns.append("Combo_Effects")
+            
+            # Always show signal reasoning
+            base_columns.extend(["Signal_Reasons", "New_Aspects", "Dissolved_Aspects"])
+            
+            def explain_page(page_df, columns):
+                """Page rows joined with their explanation text, in display order"""
+                explanations = explain_timeline_rows(timeline_df, page_df.index, show_transits, show_combos)
+                return page_df.join(explanations)[columns]
+            
+            show_paged_table(
+                timeline_df, "timeline", intraday_analysis["row_classes"], SIGNAL_ROW_CSS, height=500,
+                explain=lambda page_df: explain_page(page_df, base_columns)
+            )
+            
+            # Per-day summaries for range analysis
+            if not day_summaries.empty:
+                st.subheader("📅 Trading Day Summaries")
+                show_paged_table(day_summaries, "day_summaries")
+            
+            # Aspect Change Summary
+            st.subheader("⚡ Aspect Formation & Dissolution Analysis")
+            
+            changed = timeline_df[(timeline_df["New_Aspects"] > 0) | (timeline_df["Dissolved_Aspects"] > 0)]
+            
+            if not changed.empty:
+                aspect_df = pd.DataFrame({
+                    "Time": changed[time_column],
+                    "New_Formations": changed["New_Aspects"],
+                    "Dissolutions": changed["Dissolved_Aspects"],
+                    "Net_Change": changed["New_Aspects"] - changed["Dissolved_Aspects"],
+                    "Signal_Impact": changed["Signal"]
+                })
                 
-                # Session analysis
-                session_info = analyze_market_session(current_time.strftime("%H:%M"), aspects_df, positions)
+                def explain_changes(page_df):
+                    """Change rows with the names of the aspects that formed and dissolved"""
+                    details = explain_timeline_rows(timeline_df, page_df.index, show_transits, show_combos)
+                    return page_df.assign(Aspect_Details=details["Aspect_Changes"]).reset_index(drop=True)
                 
-                # Enhanced signal calculation with all factors
-                signal, color, bull_score, bear_score, signal_details, signal_reasons = calculate_enhanced_trading_signal(
-                    aspects_df, session_info, new_aspects, dissolved_aspects, transits
+                show_paged_table(aspect_df, "aspect_changes", explain=explain_changes)
+            else:
+                st.info("No significant aspect changes detected during this period")
+            
+            # Advanced visualizations
+            st.subheader("📊 Advanced Market Analysis Charts")
+            
+            # Zoom window for long timelines; each window is downsampled separately
+            chart_df = timeline_df
+            if len(timeline_df) > MAX_CHART_POINTS:
+                chart_times = pd.to_datetime(timeline_df["DateTime"])
+                window_start, window_end = st.slider(
+                    "Chart Window",
+                    min_value=chart_times.iloc[0].to_pydatetime(),
+                    max_value=chart_times.iloc[-1].to_pydatetime(),
+                    value=(chart_times.iloc[0].to_pydatetime(), chart_times.iloc[-1].to_pydatetime()),
+                    format="DD MMM HH:mm"
                 )
-                
-                # Aspect combinations
-                combo_effects = []
-                if show_combos:
-                    combo_effects = [row["Combo_Effect"] for _, row in aspects_df.iterrows() if row["Combo_Effect"]]
-                
-                # Format transit information
-                transit_text = "None"
-                if transits:
-                    major_transits = [t for t in transits if t["strength"] == "High"]
-                    if major_transits:
-                        transit_text = "; ".join([f"{t['planet']} {t['change']}" for t in major_transits])
-                    else:
-                        transit_text = "; ".join([f"{t['planet']} {t['change']}" for t in transits[:2]])
-                
-                # New/Dissolved aspects info
-                aspect_changes = []
-                if new_aspects:
-                    aspect_changes.extend([f"NEW: {a['Planet1']}-{a['Planet2']} {a['Aspect']}" for a in new_aspects])
-                if dissolved_aspects:
-                    aspect_changes.extend([f"END: {a['Planet1']}-{a['Planet2']} {a['Aspect']}" for a in dissolved_aspects])
-                
-                # Timeline entry with enhanced information
-                timeline.append({
-                    "DateTime": current_time.strftime("%Y-%m-%d %H:%M"),
-                    "Time": current_time.strftime("%H:%M"),
-                    "Day": current_time.strftime("%A"),
-                    "Session": f"{session_info['session_emoji']} {session_info['session']}",
-                    "Signal": signal,
-                    "Net_Score": round(bull_score - bear_score, 2),
-                    "Bullish_Weight": bull_score,
-                    "Bearish_Weight": bear_score,
-                    "Active_Aspects": len(aspects_df),
-                    "Session_Outlook": f"{session_info['emoji']} {session_info['outlook']}",
-                    "Transits": transit_text,
-                    "Aspect_Changes": "; ".join(aspect_changes) if aspect_changes else "None",
-                    "Combo_Effects": "; ".join(combo_effects) if combo_effects else "None",
-                    "Signal_Details": signal_details,
-                    "Signal_Reasons": "; ".join(signal_reasons[:3]) if signal_reasons else "Base aspects only",
-                    "Strength": session_info['strength'],
-                    "New_Aspects": len(new_aspects),
-                    "Dissolved_Aspects": len(dissolved_aspects)
+                chart_df = timeline_df[(chart_times >= window_start) & (chart_times <= window_end)]
+            
+            fig = build_analysis_figure(
+                chart_df, time_column,
+                f"Comprehensive Astrological Analysis - {analysed_symbol} | {period_label}"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Key insights and recommendations with critical timing
+            st.subheader("🔍 Key Insights & Critical Trading Times")
+            
+            # Identify critical times based on multiple factors
+            # (scored locally: timeline_df is the frame scored_analysis keeps for every rerun)
+            criticality = (
+                timeline_df["Active_Aspects"] * 0.3 +
+                abs(timeline_df["Net_Score"]) * 0.4 +
+                timeline_df["New_Aspects"] * 2.0 +
+                timeline_df["Dissolved_Aspects"] * 1.5
+            )
+            
+            critical_scores = criticality.nlargest(5)
+            critical_times = timeline_df.loc[critical_scores.index].assign(Criticality_Score=critical_scores)
+            
+            # Analysis insights
+            max_bullish = timeline_df.loc[timeline_df["Bullish_Weight"].idxmax()]
+            max_bearish = timeline_df.loc[timeline_df["Bearish_Weight"].idxmax()]
+            max_activity = timeline_df.loc[timeline_df["Active_Aspects"].idxmax()]
+            peak_explanations = explain_timeline_rows(
+                timeline_df, [max_bullish.name, max_bearish.name, max_activity.name], show_transits, show_combos
+            )
+            
+            insight_col1, insight_col2, insight_col3 = st.columns(3)
+            
+            with insight_col1:
+                st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+                st.subheader("🚀 Peak Bullish Moment")
+                st.write(f"**Time**: {max_bullish[time_column]}")
+                st.write(f"**Signal**: {max_bullish['Signal']}")
+                st.write(f"**Score**: {max_bullish['Bullish_Weight']:.2f}")
+                st.write(f"**Session**: {max_bullish['Session']}")
+                bullish_reasons = peak_explanations.loc[max_bullish.name, "Signal_Reasons"]
+                if bullish_reasons:
+                    st.write(f"**Why**: {bullish_reasons[:100]}...")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with insight_col2:
+                st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+                st.subheader("💥 Peak Bearish Moment")
+                st.write(f"**Time**: {max_bearish[time_column]}")
+                st.write(f"**Signal**: {max_bearish['Signal']}")
+                st.write(f"**Score**: {max_bearish['Bearish_Weight']:.2f}")
+                st.write(f"**Session**: {max_bearish['Session']}")
+                bearish_reasons = peak_explanations.loc[max_bearish.name, "Signal_Reasons"]
+                if bearish_reasons:
+                    st.write(f"**Why**: {bearish_reasons[:100]}...")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with insight_col3:
+                st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+                st.subheader("⚡ Maximum Activity")
+                st.write(f"**Time**: {max_activity[time_column]}")
+                st.write(f"**Aspects**: {max_activity['Active_Aspects']}")
+                st.write(f"**Signal**: {max_activity['Signal']}")
+                st.write(f"**Outlook**: {max_activity['Session_Outlook']}")
+                activity_changes = peak_explanations.loc[max_activity.name, "Aspect_Changes"]
+                if activity_changes != "None":
+                    st.write(f"**Changes**: {activity_changes[:80]}...")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Critical times analysis
+            st.subheader("⏰ Most Critical Trading Times")
+            st.write("**Times when maximum astrological activity occurs - ideal for entries/exits:**")
+            
+            critical_display = []
+            for _, row in critical_times.iterrows():
+                reason_parts = []
+                if row["New_Aspects"] > 0:
+                    reason_parts.append(f"{row['New_Aspects']} new aspects forming")
+                if row["Dissolved_Aspects"] > 0:
+                    reason_parts.append(f"{row['Dissolved_Aspects']} aspects dissolving")
+                if abs(row["Net_Score"]) > 3:
+                    reason_parts.append(f"Strong signal ({row['Signal']})")
+                if row["Active_Aspects"] > 8:
+                    reason_parts.append(f"High aspect activity ({row['Active_Aspects']})")
+                
+                critical_display.append({
+                    "Time": row[time_column],
+                    "Session": row["Session"].split(" ")[1] if " " in row["Session"] else row["Session"],
+                    "Signal": row["Signal"],
+                    "Critical_Score": f"{row['Criticality_Score']:.1f}",
+                    "Why_Critical": "; ".join(reason_parts[:2]),
+                    "Trading_Advice": get_trading_advice(row["Signal"], row["Session"].split(" ")[1] if " " in row["Session"] else row["Session"])
                 })
-                
-                previous_positions = positions.copy()
-                previous_aspects_df = aspects_df.copy()
-                current_time += timedelta(minutes=interval_minutes)
-                interval_count += 1
             
-            progress_bar.progress(1.0)
-            status_text.text("✅ Comprehensive Analysis Complete!")
+            critical_df = pd.DataFrame(critical_display)
             
-            if timeline:
-                timeline_df = pd.DataFrame(timeline)
-                
-                # Enhanced summary metrics
-                st.subheader(f"📊 {symbol} Complete Analysis - {analysis_date.strftime('%d %B %Y')}")
-                
-                # Signal distribution
-                signal_counts = timeline_df["Signal"].value_counts()
-                metric_col1, metric_col2, metric_col3, metric_col4, metric_col5 = st.columns(5)
-                
-                with metric_col1:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("🚀 Strong Buy", signal_counts.get("Strong Buy", 0))
-                    st.markdown('</div>', unsafe_allow_html=True)
-                with metric_col2:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("📈 Buy", signal_counts.get("Buy", 0))
-                    st.markdown('</div>', unsafe_allow_html=True)
-                with metric_col3:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("➡️ Neutral", signal_counts.get("Neutral", 0))
-                    st.markdown('</div>', unsafe_allow_html=True)
-                with metric_col4:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("📉 Sell", signal_counts.get("Sell", 0))
-                    st.markdown('</div>', unsafe_allow_html=True)
-                with metric_col5:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("💥 Strong Sell", signal_counts.get("Strong Sell", 0))
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Detailed timeline with enhanced information
-                st.subheader("📈 Detailed Trading Timeline with Aspect Analysis")
-                
-                # Enhanced highlighting function
-                def highlight_signals_enhanced(row):
-                    if row["Signal"] == "Strong Buy":
-                        return ['background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); color: white; font-weight: bold;'] * len(row)
-                    elif row["Signal"] == "Buy":
-                        return ['background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%); color: #2c5aa0;'] * len(row)
-                    elif row["Signal"] == "Strong Sell":
-                        return ['background: linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%); color: white; font-weight: bold;'] * len(row)
-                    elif row["Signal"] == "Sell":
-                        return ['background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%); color: #8b4513;'] * len(row)
-                    else:
-                        return [''] * len(row)
-                
-                # Enhanced column selection
-                base_columns = ["Time", "Session", "Signal", "Net_Score", "Session_Outlook", "Active_Aspects"]
-                
-                # Add optional columns
-                if show_transits:
-                    base_columns.extend(["Transits", "Aspect_Changes"])
-                if show_combos:
-                    base_columns.append("Combo_Effects")
-                
-                # Always show signal reasoning
-                base_columns.extend(["Signal_Reasons", "New_Aspects", "Dissolved_Aspects"])
-                
-                display_df = timeline_df[base_columns]
-                styled_df = display_df.style.apply(highlight_signals_enhanced, axis=1)
-                st.dataframe(styled_df, use_container_width=True, height=500)
-                
-                # Aspect Change Summary
-                st.subheader("⚡ Aspect Formation & Dissolution Analysis")
-                
-                aspect_summary = []
-                for _, row in timeline_df.iterrows():
-                    if row["New_Aspects"] > 0 or row["Dissolved_Aspects"] > 0:
-                        aspect_summary.append({
-                            "Time": row["Time"],
-                            "New_Formations": row["New_Aspects"], 
-                            "Dissolutions": row["Dissolved_Aspects"],
-                            "Net_Change": row["New_Aspects"] - row["Dissolved_Aspects"],
-                            "Signal_Impact": row["Signal"],
-                            "Aspect_Details": row["Aspect_Changes"]
-                        })
-                
-                if aspect_summary:
-                    aspect_df = pd.DataFrame(aspect_summary)
-                    st.dataframe(aspect_df, use_container_width=True)
-                else:
-                    st.info("No significant aspect changes detected during this period")
-                
-                # Advanced visualizations
-                st.subheader("📊 Advanced Market Analysis Charts")
-                
-                # Create comprehensive charts
-                fig = make_subplots(
-                    rows=3, cols=1,
-                    subplot_titles=(
-                        'Session-wise Bullish vs Bearish Weights',
-                        'Net Score Trend with Signal Strength',
-                        'Active Aspects & Market Activity'
-                    ),
-                    vertical_spacing=0.08,
-                    specs=[[{"secondary_y": True}], 
-                           [{"secondary_y": True}], 
-                           [{"secondary_y": False}]]
-                )
-                
-                # Chart 1: Bullish vs Bearish weights
-                fig.add_trace(
-                    go.Scatter(x=timeline_df["Time"], y=timeline_df["Bullish_Weight"],
-                              name="Bullish Weight", line=dict(color="green", width=2),
-                              fill='tonexty'), row=1, col=1)
-                fig.add_trace(
-                    go.Scatter(x=timeline_df["Time"], y=timeline_df["Bearish_Weight"],
-                              name="Bearish Weight", line=dict(color="red", width=2),
-                              fill='tozeroy'), row=1, col=1)
-                
-                # Chart 2: Net score with signal indicators
-                signal_colors = {
-                    "Strong Buy": "darkgreen", "Buy": "lightgreen", 
-                    "Strong Sell": "darkred", "Sell": "lightcoral", 
-                    "Neutral": "gray"
-                }
-                colors = [signal_colors.get(signal, "gray") for signal in timeline_df["Signal"]]
-                
-                fig.add_trace(
-                    go.Scatter(x=timeline_df["Time"], y=timeline_df["Net_Score"],
-                              name="Net Score", mode='lines+markers',
-                              line=dict(color="blue", width=3),
-                              marker=dict(color=colors, size=10, line=dict(width=2, color="white"))), 
-                    row=2, col=1)
-                
-                # Add zero line
-                fig.add_hline(y=0, line_dash="dash", line_color="black", row=2, col=1)
-                
-                # Chart 3: Active aspects
-                fig.add_trace(
-                    go.Bar(x=timeline_df["Time"], y=timeline_df["Active_Aspects"],
-                           name="Active Aspects", marker_color="purple", opacity=0.7), 
-                    row=3, col=1)
-                
-                # Update layout
-                fig.update_layout(
-                    height=800,
-                    title_text=f"Comprehensive Astrological Analysis - {symbol} | {analysis_date.strftime('%d %B %Y')}",
-                    showlegend=True,
-                    template="plotly_white"
-                )
-                
-                # Update axes labels
-                fig.update_xaxes(title_text="Time", row=3, col=1)
-                fig.update_yaxes(title_text="Weight", row=1, col=1)
-                fig.update_yaxes(title_text="Net Score", row=2, col=1)
-                fig.update_yaxes(title_text="Count", row=3, col=1)
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Key insights and recommendations with critical timing
-                st.subheader("🔍 Key Insights & Critical Trading Times")
-                
-                # Identify critical times based on multiple factors
-                timeline_df["Criticality_Score"] = (
-                    timeline_df["Active_Aspects"] * 0.3 +
-                    abs(timeline_df["Net_Score"]) * 0.4 +
-                    timeline_df["New_Aspects"] * 2.0 +
-                    timeline_df["Dissolved_Aspects"] * 1.5
-                )
-                
-                critical_times = timeline_df.nlargest(5, "Criticality_Score")
-                
-                # Analysis insights
-                max_bullish = timeline_df.loc[timeline_df["Bullish_Weight"].idxmax()]
-                max_bearish = timeline_df.loc[timeline_df["Bearish_Weight"].idxmax()]
-                max_activity = timeline_df.loc[timeline_df["Active_Aspects"].idxmax()]
-                
-                insight_col1, insight_col2, insight_col3 = st.columns(3)
-                
-                with insight_col1:
-                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-                    st.subheader("🚀 Peak Bullish Moment")
-                    st.write(f"**Time**: {max_bullish['Time']}")
-                    st.write(f"**Signal**: {max_bullish['Signal']}")
-                    st.write(f"**Score**: {max_bullish['Bullish_Weight']:.2f}")
-                    st.write(f"**Session**: {max_bullish['Session']}")
-                    if max_bullish['Signal_Reasons']:
-                        st.write(f"**Why**: {max_bullish['Signal_Reasons'][:100]}...")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with insight_col2:
-                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-                    st.subheader("💥 Peak Bearish Moment")
-                    st.write(f"**Time**: {max_bearish['Time']}")
-                    st.write(f"**Signal**: {max_bearish['Signal']}")
-                    st.write(f"**Score**: {max_bearish['Bearish_Weight']:.2f}")
-                    st.write(f"**Session**: {max_bearish['Session']}")
-                    if max_bearish['Signal_Reasons']:
-                        st.write(f"**Why**: {max_bearish['Signal_Reasons'][:100]}...")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with insight_col3:
-                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-                    st.subheader("⚡ Maximum Activity")
-                    st.write(f"**Time**: {max_activity['Time']}")
-                    st.write(f"**Aspects**: {max_activity['Active_Aspects']}")
-                    st.write(f"**Signal**: {max_activity['Signal']}")
-                    st.write(f"**Outlook**: {max_activity['Session_Outlook']}")
-                    if max_activity['Aspect_Changes'] != "None":
-                        st.write(f"**Changes**: {max_activity['Aspect_Changes'][:80]}...")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Critical times analysis
-                st.subheader("⏰ Most Critical Trading Times")
-                st.write("**Times when maximum astrological activity occurs - ideal for entries/exits:**")
-                
-                critical_display = []
-                for _, row in critical_times.iterrows():
-                    reason_parts = []
-                    if row["New_Aspects"] > 0:
-                        reason_parts.append(f"{row['New_Aspects']} new aspects forming")
-                    if row["Dissolved_Aspects"] > 0:
-                        reason_parts.append(f"{row['Dissolved_Aspects']} aspects dissolving")
-                    if abs(row["Net_Score"]) > 3:
-                        reason_parts.append(f"Strong signal ({row['Signal']})")
-                    if row["Active_Aspects"] > 8:
-                        reason_parts.append(f"High aspect activity ({row['Active_Aspects']})")
-                    
-                    critical_display.append({
-                        "Time": row["Time"],
-                        "Session": row["Session"].split(" ")[1] if " " in row["Session"] else row["Session"],
-                        "Signal": row["Signal"],
-                        "Critical_Score": f"{row['Criticality_Score']:.1f}",
-                        "Why_Critical": "; ".join(reason_parts[:2]),
-                        "Trading_Advice": get_trading_advice(row["Signal"], row["Session"].split(" ")[1] if " " in row["Session"] else row["Session"])
-                    })
-                
-                critical_df = pd.DataFrame(critical_display)
-                
-                def highlight_critical_times(row):
-                    score = float(row["Critical_Score"])
-                    if score > 8:
-                        return ['background-color: #ff6b6b; color: white; font-weight: bold;'] * len(row)
-                    elif score > 5:
-                        return ['background-color: #ffa726; color: white;'] * len(row)
-                    else:
-                        return ['background-color: #66bb6a; color: white;'] * len(row)
-                
-                styled_critical = critical_df.style.apply(highlight_critical_times, axis=1)
-                st.dataframe(styled_critical, use_container_width=True)
+            styled_critical = style_rows(
+                critical_df, criticality_row_classes(critical_times["Criticality_Score"]), CRITICALITY_ROW_CSS
+            )
+            st.dataframe(styled_critical, use_container_width=True)
 
-def get_trading_advice(signal, session):
-    """Generate specific trading advice based on signal and session"""
-    advice_map = {
-        ("Strong Buy", "Opening"): "Aggressive long entry on gap down, expect strong rally",
-        ("Strong Buy", "Morning"): "Build long positions, momentum likely to continue",
-        ("Strong Buy", "Mid-Session"): "Institutional buying, add to longs on dips",
-        ("Strong Buy", "Afternoon"): "Late rally expected, short covering likely",
-        ("Strong Buy", "Closing"): "Positive close expected, hold overnight longs",
-        
-        ("Buy", "Opening"): "Selective long entry, watch for confirmation",
-        ("Buy", "Morning"): "Moderate buying opportunity, use stops",
-        ("Buy", "Mid-Session"): "Gradual accumulation, dollar-cost average",
-        ("Buy", "Afternoon"): "Recovery possible, light long positions",
-        ("Buy", "Closing"): "Mild positive bias, conservative approach",
-        
-        ("Strong Sell", "Opening"): "Aggressive short entry on gap up, expect sharp fall",
-        ("Strong Sell", "Morning"): "Build short positions, weakness to continue",
-        ("Strong Sell", "Mid-Session"): "Heavy institutional selling, avoid longs",
-        ("Strong Sell", "Afternoon"): "Exit all longs, sharp correction possible",
-        ("Strong Sell", "Closing"): "Negative close likely, exit before close",
-        
-        ("Sell", "Opening"): "Book profits, avoid fresh longs",
-        ("Sell", "Morning"): "Selling pressure building, lighten positions",
-        ("Sell", "Mid-Session"): "Profit booking phase, be defensive",
-        ("Sell", "Afternoon"): "Weakness emerging, book some profits",
-        ("Sell", "Closing"): "End day flat, avoid overnight risk",
-        
-        ("Neutral", "Opening"): "Wait for direction, no rush to trade",
-        ("Neutral", "Morning"): "Range-bound trading, buy support sell resistance",
-        ("Neutral", "Mid-Session"): "Consolidation phase, scalping opportunities",
-        ("Neutral", "Afternoon"): "Sideways movement, theta decay for options",
-        ("Neutral", "Closing"): "Flat close expected, square off positions"
-    }
-    
-    return advice_map.get((signal, session), "Monitor price action closely")
+with tab2:
+    intraday_tab()
 
 # Tab 3: Professional Daily Report
-with tab3:
+@st.fragment
+def daily_report_tab():
+    """Daily report for one date, kept in session state between reruns"""
     st.header("📋 Professional Daily Market Report")
     
     report_col1, report_col2 = st.columns([2, 1])
     
     with report_col1:
         report_date = st.date_input("Select Report Date", datetime(2025, 7, 30))
-        report_symbols = st.multiselect("Select Indices", ["NIFTY", "BANKNIFTY", "SENSEX", "FINNIFTY"], default=["NIFTY", "BANKNIFTY"])
+        report_symbols = st.multiselect("Select Indices", REPORT_INDEX_SYMBOLS, default=DEFAULT_REPORT_SYMBOLS,
+                                        help="Each index's exchange gets its own report in its local session")
     
     with report_col2:
         st.info("""
@@ -1405,117 +779,154 @@ with tab3:
         • Professional formatting
         • Risk assessment
         • Trading strategies
+        • NSE, BSE, NYSE and LSE sessions
         """)
     
     if st.button("📊 Generate Professional Daily Report", type="primary"):
-        with st.spinner("🔮 Generating comprehensive daily market report..."):
-            
-            # Generate comprehensive timeline for the full day
-            start_time = datetime.combine(report_date, datetime.strptime("09:15", "%H:%M").time())
-            end_time = datetime.combine(report_date, datetime.strptime("15:30", "%H:%M").time())
-            
-            timeline = []
-            current_time = start_time
-            
-            # Generate 30-minute interval analysis
-            while current_time <= end_time:
-                positions = calculate_planetary_positions(current_time)
-                aspects_df, _ = get_aspects(positions)
-                session_info = analyze_market_session(current_time.strftime("%H:%M"), aspects_df, positions)
-                
-                signal, color, bull_score, bear_score, signal_details = calculate_enhanced_trading_signal(aspects_df, session_info)
-                
-                timeline.append({
-                    "DateTime": current_time.strftime("%Y-%m-%d %H:%M"),
-                    "Signal": signal,
-                    "Active_Aspects": len(aspects_df),
-                    "Bullish_Weight": bull_score,
-                    "Bearish_Weight": bear_score,
-                    "Session": session_info["session"],
-                    "Session_Outlook": session_info["outlook"]
-                })
-                
-                current_time += timedelta(minutes=30)
-            
-            # Get planetary positions for the day
-            day_positions = calculate_planetary_positions(start_time)
-            timeline_df = pd.DataFrame(timeline)
-            
-            # Generate and display the comprehensive report
-            daily_report = generate_daily_report(report_date, day_positions, timeline_df)
-            
-            # Display report in styled container
-            st.markdown('<div class="report-container">', unsafe_allow_html=True)
-            st.markdown(daily_report)
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Additional statistical analysis
-            st.subheader("📊 Detailed Statistical Analysis")
-            
-            if not timeline_df.empty:
-                stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
-                
-                with stat_col1:
-                    buy_signals = len(timeline_df[timeline_df["Signal"].str.contains("Buy", na=False)])
-                    st.metric("Total Buy Signals", buy_signals, f"{buy_signals/len(timeline_df)*100:.1f}%")
-                
-                with stat_col2:
-                    sell_signals = len(timeline_df[timeline_df["Signal"].str.contains("Sell", na=False)])
-                    st.metric("Total Sell Signals", sell_signals, f"{sell_signals/len(timeline_df)*100:.1f}%")
-                
-                with stat_col3:
-                    max_activity = timeline_df["Active_Aspects"].max()
-                    avg_activity = timeline_df["Active_Aspects"].mean()
-                    st.metric("Peak Activity", f"{max_activity} aspects", f"Avg: {avg_activity:.1f}")
-                
-                with stat_col4:
-                    max_score = timeline_df["Bullish_Weight"].max() - timeline_df["Bearish_Weight"].min()
-                    st.metric("Max Score Range", f"{max_score:.2f}", "Volatility indicator")
-                
-                # Session-wise breakdown
-                st.subheader("📊 Session-wise Performance Breakdown")
-                
-                session_analysis = timeline_df.groupby("Session").agg({
-                    "Signal": lambda x: x.mode().iloc[0] if not x.empty else "Neutral",
-                    "Bullish_Weight": "mean",
-                    "Bearish_Weight": "mean",
-                    "Active_Aspects": "mean"
-                }).round(2)
-                
-                st.dataframe(session_analysis, use_container_width=True)
-                
-                # Risk assessment
-                st.subheader("⚠️ Risk Assessment")
-                
-                strong_sell_count = len(timeline_df[timeline_df["Signal"] == "Strong Sell"])
-                total_signals = len(timeline_df)
-                risk_percentage = (strong_sell_count / total_signals * 100) if total_signals > 0 else 0
-                
-                if risk_percentage > 30:
-                    risk_level = "🔴 HIGH RISK"
-                    risk_advice = "Exercise extreme caution. Consider reducing positions and implementing tight stop losses."
-                elif risk_percentage > 15:
-                    risk_level = "🟡 MEDIUM RISK"
-                    risk_advice = "Moderate caution advised. Monitor positions closely and be ready to adjust."
-                else:
-                    risk_level = "🟢 LOW RISK"
-                    risk_advice = "Favorable conditions for trading. Normal position sizing recommended."
-                
-                st.markdown(f"""
-                **Risk Level**: {risk_level} ({risk_percentage:.1f}% negative signals)
-                
-                **Recommendation**: {risk_advice}
-                """)
-                
-                # Download report option
-                if st.button("💾 Download Report as Text"):
-                    report_text = daily_report.replace("##", "").replace("**", "").replace("*", "")
-                    st.download_button(
-                        label="📥 Download Daily Report",
-                        data=report_text,
-                        file_name=f"astro_market_report_{report_date.strftime('%Y%m%d')}.txt",
-                        mime="text/plain"
-                    )
+        # Queued as a background job; the tab polls its progress instead of blocking
+        st.session_state["report_job"] = default_queue().submit(
+            run_daily_report, report_date, report_symbols,
+            label=f"Daily report for {report_date.strftime('%d %B %Y')}"
+        )
+    
+    follow_job("report_job", "daily_report")
+    
+    report_state = st.session_state.get("daily_report")
+    if report_state is not None:
+        report_date = report_state["date"]
+        reports = report_state["reports"]
+        if not reports:
+            st.warning(f"⚠️ None of the selected exchanges trades on {report_date.strftime('%d %B %Y')}")
+        elif len(reports) == 1:
+            show_exchange_report(report_date, *next(iter(reports.items())))
+        else:
+            for exchange_tab, (exchange, exchange_report) in zip(st.tabs(list(reports)), reports.items()):
+                with exchange_tab:
+                    show_exchange_report(report_date, exchange, exchange_report)
+
+def show_exchange_report(report_date, exchange, exchange_report):
+    """One exchange's rendered report and statistics"""
+    timeline_df, daily_report = exchange_report
+    
+    # Display report in styled container
+    st.markdown('<div class="report-container">', unsafe_allow_html=True)
+    st.markdown(daily_report)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Additional statistical analysis
+    st.subheader("📊 Detailed Statistical Analysis")
+    
+    if not timeline_df.empty:
+        stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+        
+        with stat_col1:
+            buy_signals = len(timeline_df[timeline_df["Signal"].str.contains("Buy", na=False)])
+            st.metric("Total Buy Signals", buy_signals, f"{buy_signals/len(timeline_df)*100:.1f}%")
+        
+        with stat_col2:
+            sell_signals = len(timeline_df[timeline_df["Signal"].str.contains("Sell", na=False)])
+            st.metric("Total Sell Signals", sell_signals, f"{sell_signals/len(timeline_df)*100:.1f}%")
+        
+        with stat_col3:
+            max_activity = timeline_df["Active_Aspects"].max()
+            avg_activity = timeline_df["Active_Aspects"].mean()
+            st.metric("Peak Activity", f"{max_activity} aspects", f"Avg: {avg_activity:.1f}")
+        
+        with stat_col4:
+            max_score = timeline_df["Bullish_Weight"].max() - timeline_df["Bearish_Weight"].min()
+            st.metric("Max Score Range", f"{max_score:.2f}", "Volatility indicator")
+        
+        # Session-wise breakdown
+        st.subheader("📊 Session-wise Performance Breakdown")
+        
+        session_analysis = timeline_df.groupby("Session").agg({
+            "Signal": lambda x: x.mode().iloc[0] if not x.empty else "Neutral",
+            "Bullish_Weight": "mean",
+            "Bearish_Weight": "mean",
+            "Active_Aspects": "mean"
+        }).round(2)
+        
+        st.dataframe(session_analysis, use_container_width=True)
+        
+        # Risk assessment
+        st.subheader("⚠️ Risk Assessment")
+        
+        strong_sell_count = len(timeline_df[timeline_df["Signal"] == "Strong Sell"])
+        total_signals = len(timeline_df)
+        risk_percentage = (strong_sell_count / total_signals * 100) if total_signals > 0 else 0
+        
+        if risk_percentage > 30:
+            risk_level = "🔴 HIGH RISK"
+            risk_advice = "Exercise extreme caution. Consider reducing positions and implementing tight stop losses."
+        elif risk_percentage > 15:
+            risk_level = "🟡 MEDIUM RISK"
+            risk_advice = "Moderate caution advised. Monitor positions closely and be ready to adjust."
+        else:
+            risk_level = "🟢 LOW RISK"
+            risk_advice = "Favorable conditions for trading. Normal position sizing recommended."
+        
+        st.markdown(f"""
+        **Risk Level**: {risk_level} ({risk_percentage:.1f}% negative signals)
+        
+        **Recommendation**: {risk_advice}
+        """)
+        
+        # Download report option
+        report_text = daily_report.replace("##", "").replace("**", "").replace("*", "")
+        st.download_button(
+            label="📥 Download Report as Text",
+            data=report_text,
+            file_name=f"astro_market_report_{exchange}_{report_date.strftime('%Y%m%d')}.txt",
+            mime="text/plain"
+        )
+
+# Bulk export of any date range, streamed to a temporary file in chunks
+@st.fragment
+def bulk_export_section():
+    """Export settings and download, independent of the report above"""
+    st.markdown("---")
+    st.subheader("💾 Bulk Data Export")
+    export_col1, export_col2, export_col3 = st.columns(3)
+    with export_col1:
+        export_kind = st.selectbox("Export Data", EXPORT_KINDS, format_func=str.title)
+        export_format = st.selectbox("File Format", list(EXPORT_FORMATS), format_func=str.upper)
+    with export_col2:
+        export_start = st.date_input("Export Start Date", datetime(2025, 7, 1))
+        export_end = st.date_input("Export End Date", datetime(2025, 7, 31))
+    with export_col3:
+        export_interval = st.selectbox("Export Interval", list(INTERVAL_MINUTES), index=2, disabled=export_kind == "reports")
+        export_weight = st.slider("Export Minimum Aspect Weight", 0.5, 3.0, 1.0)
+    
+    if st.button("📦 Prepare Export"):
+        # Queued as a background job, like the reports; the section polls its progress
+        st.session_state["export_job"] = default_queue().submit(
+            run_bulk_export, export_kind, export_start, export_end, export_format,
+            INTERVAL_MINUTES[export_interval], export_weight,
+            label=f"{export_kind.title()} export from {export_start:%d %b %Y} to {export_end:%d %b %Y}"
+        )
+    
+    previous_export = st.session_state.get("bulk_export")
+    follow_job("export_job", "bulk_export")
+    bulk_export = st.session_state.get("bulk_export")
+    if previous_export is not None and bulk_export is not previous_export and os.path.exists(previous_export["path"]):
+        # A new export replaces the session's previous file
+        os.unlink(previous_export["path"])
+    if bulk_export is not None:
+        if bulk_export["rows"] and os.path.exists(bulk_export["path"]):
+            st.success(f"✅ {bulk_export['rows']:,} rows ready")
+            with open(bulk_export["path"], "rb") as export_file:
+                st.download_button(
+                    label=f"📥 Download {bulk_export['format'].upper()} Export",
+                    data=export_file,
+                    file_name=bulk_export["file_name"],
+                    mime="text/csv" if bulk_export["format"] == "csv" else "application/octet-stream"
+                )
+        else:
+            st.warning("⚠️ Nothing to export for the selected range")
+
+with tab3:
+    daily_report_tab()
+    bulk_export_section()
 
 # Footer with instructions
 st.markdown("---")
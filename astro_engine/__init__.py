@@ -0,0 +1 @@
+"""Computation engine behind the Professional Astro Market Analyzer"""
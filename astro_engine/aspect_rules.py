@@ -0,0 +1,317 @@
+"""Aspect scoring rules compiled from a rule file into dense lookup tables"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .dynamics import PHASES, exact_phase
+
+DEFAULT_RULES_FILE = os.environ.get(
+    "ASTRO_RULES_PATH", os.path.join(os.path.dirname(__file__), "data", "aspect_rules.json")
+)
+
+# Seconds between checks of the rule file's mtime, so hot paths do not stat it on every call
+RULES_CHECK_SECONDS = float(os.environ.get("ASTRO_RULES_CHECK_SECONDS", 1.0))
+
+TENDENCIES = ["Neutral", "Bullish", "Bearish"]
+
+
+class RuleError(ValueError):
+    """A rule file that cannot be used, with every problem found in it"""
+
+    def __init__(self, path, problems):
+        self.path = path
+        self.problems = problems
+        super().__init__(f"{path}: " + "; ".join(problems))
+
+
+def _is_number(value):
+    """Whether value is a real number (bools are not)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_rules(rules, planets):
+    """Every problem in a parsed rule file; empty when the rules are usable"""
+    if not isinstance(rules, dict):
+        return ["top level must be an object"]
+    problems = []
+
+    weights = rules.get("planet_weights")
+    if not isinstance(weights, dict):
+        problems.append("planet_weights must map planet names to weights")
+        weights = {}
+    default_weight = rules.get("default_planet_weight")
+    if default_weight is not None and not _is_number(default_weight):
+        problems.append("default_planet_weight must be a number")
+    for planet in planets:
+        if not _is_number(weights.get(planet, default_weight)):
+            problems.append(f"planet_weights needs a numeric weight for {planet}")
+
+    aspects = rules.get("aspects")
+    if not isinstance(aspects, list) or not aspects:
+        problems.append("aspects must be a non-empty list")
+        aspects = []
+    names, angles = set(), set()
+    for position, aspect in enumerate(aspects):
+        if not isinstance(aspect, dict):
+            problems.append(f"aspects[{position}] must be an object")
+            continue
+        if not _is_number(aspect.get("angle")) or not 0 <= aspect["angle"] <= 180:
+            problems.append(f"aspects[{position}] angle must be between 0 and 180")
+        if not _is_number(aspect.get("orb")) or aspect["orb"] <= 0:
+            problems.append(f"aspects[{position}] orb must be positive")
+        for field in ("name", "nature", "market_effect"):
+            if not isinstance(aspect.get(field), str):
+                problems.append(f"aspects[{position}] {field} must be text")
+        if aspect.get("name") in names or aspect.get("angle") in angles:
+            problems.append(f"aspect {aspect.get('name')} at {aspect.get('angle')}° is listed twice")
+        names.add(aspect.get("name"))
+        angles.add(aspect.get("angle"))
+
+    groups = rules.get("planet_groups", {})
+    if not isinstance(groups, dict):
+        problems.append("planet_groups must map group names to planet lists")
+        groups = {}
+    for group, members in groups.items():
+        if not isinstance(members, list) or not all(isinstance(member, str) for member in members):
+            problems.append(f"planet group {group} must be a list of planet names")
+
+    cases = [rules.get("default_tendency")]
+    tendency_rules = rules.get("tendency_rules", [])
+    if not isinstance(tendency_rules, list):
+        problems.append("tendency_rules must be a list")
+        tendency_rules = []
+    for position, rule in enumerate(tendency_rules):
+        if not isinstance(rule, dict) or not isinstance(rule.get("cases"), list):
+            problems.append(f"tendency_rules[{position}] needs aspects and cases")
+            continue
+        if not isinstance(rule.get("aspects"), list) or not rule["aspects"] \
+                or not all(isinstance(name, str) for name in rule["aspects"]):
+            problems.append(f"tendency_rules[{position}] aspects must be a non-empty list of aspect names")
+            continue
+        unknown = [name for name in rule["aspects"] if name not in names]
+        if unknown:
+            problems.append(f"tendency_rules[{position}] names unknown aspects {unknown}")
+        cases.extend(rule["cases"])
+    for case in cases:
+        if not isinstance(case, dict):
+            problems.append("default_tendency and every tendency case must be an object")
+            continue
+        if case.get("tendency") not in TENDENCIES:
+            problems.append(f"tendency must be one of {TENDENCIES}, not {case.get('tendency')!r}")
+        if not _is_number(case.get("multiplier")):
+            problems.append(f"tendency case {case} needs a numeric multiplier")
+        if "when_any" in case and case["when_any"] not in groups:
+            problems.append(f"tendency case refers to unknown planet group {case['when_any']!r}")
+
+    combos = rules.get("combos", [])
+    if not isinstance(combos, list):
+        problems.append("combos must be a list")
+        combos = []
+    for position, combo in enumerate(combos):
+        pair = combo.get("planets") if isinstance(combo, dict) else None
+        if not isinstance(pair, list) or len(pair) != 2 or not all(isinstance(planet, str) for planet in pair) \
+                or pair[0] == pair[1]:
+            problems.append(f"combos[{position}] must name two different planets")
+        elif not isinstance(combo.get("effect"), str):
+            problems.append(f"combos[{position}] effect must be text")
+
+    return problems
+
+
+class AspectRules:
+    """Rules compiled into tables indexed by (planet1, planet2, aspect)
+
+    Planets that the rules cannot tell apart (same weight, same groups, no
+    combo of their own, as with most fixed stars) share one body class, and
+    the tables are indexed by class, so they stay small for large body sets.
+    Planets are numbered in the order given at compile time and aspects in
+    rule-file order, which is also the order they are matched in.
+    """
+
+    def __init__(self, rules, planets):
+        self.source = rules
+        self.fingerprint = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.planets = list(planets)
+        self.planet_index = {planet: index for index, planet in enumerate(self.planets)}
+
+        aspects = rules["aspects"]
+        self.names = [aspect["name"] for aspect in aspects]
+        self.natures = [aspect["nature"] for aspect in aspects]
+        self.market_effects = [aspect["market_effect"] for aspect in aspects]
+        self.angles = np.array([aspect["angle"] for aspect in aspects], dtype=float)
+        self.orbs = np.array([aspect["orb"] for aspect in aspects], dtype=float)
+        self.aspect_index = {aspect["angle"]: index for index, aspect in enumerate(aspects)}
+        self.name_index = {name: index for index, name in enumerate(self.names)}
+
+        # Separations at which an out-of-orb pair can start producing output
+        self.orb_edges = np.unique(np.concatenate([self.angles - self.orbs, self.angles + self.orbs]))
+
+        groups = {group: set(members) for group, members in rules.get("planet_groups", {}).items()}
+        combo_planets = {planet for combo in rules.get("combos", []) for planet in combo["planets"]}
+        default_weight = rules.get("default_planet_weight")
+        weights = [rules["planet_weights"].get(planet, default_weight) for planet in self.planets]
+
+        # Body classes: one representative planet per distinct rule signature
+        class_of_signature = {}
+        representatives = []
+        planet_class = []
+        for planet, weight in zip(self.planets, weights):
+            signature = (
+                weight,
+                frozenset(group for group, members in groups.items() if planet in members),
+                planet if planet in combo_planets else None
+            )
+            if signature not in class_of_signature:
+                class_of_signature[signature] = len(representatives)
+                representatives.append((planet, weight))
+            planet_class.append(class_of_signature[signature])
+        self.planet_class = np.array(planet_class)
+        self.class_index = {planet: self.planet_class[index] for planet, index in self.planet_index.items()}
+
+        n_classes, n_aspects = len(representatives), len(aspects)
+        self.weight = np.zeros((n_classes, n_classes, n_aspects))
+        self.tendency = np.zeros((n_classes, n_classes, n_aspects), dtype=np.int8)
+        self.combo = np.full((n_classes, n_classes), "", dtype=object)
+
+        cases_by_aspect = {}
+        for rule in rules.get("tendency_rules", []):
+            for name in rule["aspects"]:
+                cases_by_aspect.setdefault(name, rule["cases"])
+
+        for i, (p1, w1) in enumerate(representatives):
+            for j, (p2, w2) in enumerate(representatives):
+                for a, name in enumerate(self.names):
+                    case = next(
+                        (case for case in cases_by_aspect.get(name, [])
+                         if "when_any" not in case or {p1, p2} & groups[case["when_any"]]),
+                        rules["default_tendency"]
+                    )
+                    weight = (w1 + w2) / 2
+                    self.weight[i, j, a] = round(weight * case["multiplier"], 2)
+                    self.tendency[i, j, a] = TENDENCIES.index(case["tendency"])
+
+        for combo in rules.get("combos", []):
+            if not all(planet in self.class_index for planet in combo["planets"]):
+                continue
+            first, second = (self.class_index[planet] for planet in combo["planets"])
+            if not self.combo[first, second]:
+                self.combo[first, second] = self.combo[second, first] = combo["effect"]
+
+        # Pair numbering in get_aspects order: pair (i, j), i < j, starts at pair_offsets[i] + j - i - 1
+        n_planets = len(self.planets)
+        self.pair_offsets = np.array([i * (2 * n_planets - i - 1) // 2 for i in range(n_planets)])
+
+    def aspect_id(self, p1, p2, name):
+        """Compact id of an aspect between two planets, for storage"""
+        i, j = self.planet_index[p1], self.planet_index[p2]
+        pair = int(self.pair_offsets[i]) + j - i - 1
+        return pair * len(self.names) + self.name_index[name]
+
+    def aspect_key(self, aspect_id):
+        """(planet1, planet2, aspect index) of an id from aspect_id"""
+        pair, a = divmod(aspect_id, len(self.names))
+        i = int(np.searchsorted(self.pair_offsets, pair, side="right")) - 1
+        j = pair - int(self.pair_offsets[i]) + i + 1
+        return self.planets[i], self.planets[j], a
+
+    def match(self, diff):
+        """Index of the first aspect whose orb contains the separation, or -1"""
+        for a, (angle, orb) in enumerate(zip(self.angles.tolist(), self.orbs.tolist())):
+            if abs(diff - angle) <= orb:
+                return a
+        return -1
+
+    def entry(self, p1, p2, diff, a, rate=0.0):
+        """Aspect row for a planet pair whose separation diff is within orb of aspect a
+
+        rate is the separation's rate of change in degrees per day; it sets
+        the Phase and the signed hours to exact (negative once past exact).
+        """
+        i, j = self.class_index[p1], self.class_index[p2]
+        angle, orb = self.angles[a], self.orbs[a]
+        phase, days = exact_phase(diff, rate, angle)
+        return {
+            "Planet1": p1,
+            "Planet2": p2,
+            "Aspect": self.names[a],
+            "Exact_Degree": f"{diff:.2f}°",
+            "Orb": f"{abs(diff - angle):.2f}°",
+            "Weight": float(self.weight[i, j, a]),
+            "Tendency": TENDENCIES[self.tendency[i, j, a]],
+            "Strength": "Strong" if abs(diff - angle) <= orb/2 else "Moderate",
+            "Phase": PHASES[int(phase)],
+            "Hours_To_Exact": round(float(days) * 24, 1),
+            "Nature": self.natures[a],
+            "Market_Effect": self.market_effects[a],
+            "Combo_Effect": self.combo[i, j]
+        }
+
+
+def load_rules(path, planets):
+    """Parse, validate and compile a rule file; raises RuleError if it is unusable"""
+    try:
+        with open(path, encoding="utf-8") as rule_file:
+            rules = json.load(rule_file)
+    except json.JSONDecodeError as exc:
+        raise RuleError(path, [f"invalid JSON ({exc})"]) from exc
+    problems = validate_rules(rules, planets)
+    if problems:
+        raise RuleError(path, problems)
+    try:
+        return AspectRules(rules, planets)
+    except Exception as exc:  # anything validation missed still surfaces as a rejected file
+        raise RuleError(path, [f"rules do not compile ({type(exc).__name__}: {exc})"]) from exc
+
+
+# Compiled rules per (path, planets) with the file's mtime and when it was last checked,
+# and the last load error per path
+_loaded = {}
+_errors = {}
+_lock = threading.Lock()
+
+
+def current_rules(planets, path=None):
+    """Compiled rules from path, reloaded whenever the file changes on disk
+
+    The file is checked at most every RULES_CHECK_SECONDS. An edit that
+    fails validation or compilation, or a file that cannot be read or has
+    gone missing, is reported through rules_error and the previously
+    loaded rules stay in force; only a bad first load raises.
+    """
+    path = path or DEFAULT_RULES_FILE
+    key = (path, tuple(planets))
+    loaded = _loaded.get(key)
+    if loaded is not None and time.monotonic() - loaded[2] < RULES_CHECK_SECONDS:
+        return loaded[1]
+
+    with _lock:
+        loaded = _loaded.get(key)
+        now = time.monotonic()
+        if loaded is not None and now - loaded[2] < RULES_CHECK_SECONDS:
+            return loaded[1]
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if loaded is not None and loaded[0] == mtime:
+                _loaded[key] = (mtime, loaded[1], now)
+                return loaded[1]
+            rules = load_rules(path, planets)
+        except Exception as exc:  # a bad edit must never take down a running app
+            _errors[path] = str(exc)
+            if loaded is None:
+                raise
+            # Keep serving the last good rules, and stop re-reading this version
+            _loaded[key] = (loaded[0] if isinstance(exc, OSError) else mtime, loaded[1], now)
+            return loaded[1]
+        _errors.pop(path, None)
+        _loaded[key] = (mtime, rules, now)
+        return rules
+
+
+def rules_error(path=None):
+    """Why the latest edit of the rule file was rejected, or None"""
+    return _errors.get(path or DEFAULT_RULES_FILE)
@@ -0,0 +1,102 @@
+"""Sweep-line aspect finder that scales to hundreds of bodies per timestamp"""
+
+import numpy as np
+import pandas as pd
+
+from .aspect_rules import current_rules
+from .dynamics import separation_rate
+
+# Sweep windows are widened by this much and every candidate is then
+# re-checked with the exact orb test, so rounding can never drop a match
+SWEEP_SLACK = 1e-9
+
+
+def find_aspect_pairs(degrees, angles, orbs):
+    """Every pair within orb of an aspect angle, without comparing all pairs
+
+    Longitudes are sorted once around the circle. For each aspect the bodies
+    whose forward distance from a body lies inside the orb window form a
+    contiguous run of the sorted (and once-wrapped) longitudes, found by
+    binary search, so the cost is O(k·n log n + matches) rather than O(k·n²).
+
+    Returns arrays (first, second, aspect, separation) with first < second,
+    ordered like get_aspects, each pair taking the first aspect listed.
+    """
+    degrees = np.asarray(degrees, dtype=float)
+    n = len(degrees)
+    empty = np.array([], dtype=int)
+    if n < 2:
+        return empty, empty, empty, np.array([])
+
+    longitudes = np.mod(degrees, 360)
+    order = np.argsort(longitudes, kind="stable")
+    ring = longitudes[order]
+    wrapped = np.concatenate([ring, ring + 360])
+    wrapped_order = np.concatenate([order, order])
+    start = np.arange(n)
+
+    firsts, seconds, kinds = [], [], []
+    for aspect, (angle, orb) in enumerate(zip(angles, orbs)):
+        # Forward distances in [angle - orb, angle + orb] folded onto 0-180
+        low = max(angle - orb, 0.0) - SWEEP_SLACK
+        high = min(angle + orb, 180.0) + SWEEP_SLACK
+        left = np.maximum(np.searchsorted(wrapped, ring + low, side="left"), start + 1)
+        right = np.minimum(np.searchsorted(wrapped, ring + high, side="right"), start + n)
+        counts = np.maximum(right - left, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+
+        # Expand each run [left, right) into explicit partner positions
+        run_starts = np.cumsum(counts) - counts
+        partners = np.repeat(left, counts) + np.arange(total) - np.repeat(run_starts, counts)
+        body = order[np.repeat(start, counts)]
+        partner = wrapped_order[partners]
+        firsts.append(np.minimum(body, partner))
+        seconds.append(np.maximum(body, partner))
+        kinds.append(np.full(total, aspect))
+
+    if not firsts:
+        return empty, empty, empty, np.array([])
+    first, second, kind = np.concatenate(firsts), np.concatenate(seconds), np.concatenate(kinds)
+
+    # Exact separation and orb test, as get_aspects computes them
+    separation = np.abs(degrees[second] - degrees[first])
+    separation = np.where(separation > 180, 360 - separation, separation)
+    keep = np.abs(separation - np.asarray(angles, dtype=float)[kind]) <= np.asarray(orbs, dtype=float)[kind]
+    first, second, kind, separation = first[keep], second[keep], kind[keep], separation[keep]
+
+    # One aspect per pair: the earliest listed, in pair order
+    pair_code = first * n + second
+    ranked = np.lexsort((kind, pair_code))
+    _, winners = np.unique(pair_code[ranked], return_index=True)
+    chosen = ranked[winners]
+    return first[chosen], second[chosen], kind[chosen], separation[chosen]
+
+
+def sweep_aspects(positions, rules=None, include_static=False):
+    """get_aspects for any body set, scored with the rules compiled for those bodies
+
+    Aspects between two fixed stars never change, so they are left out
+    unless include_static is set.
+    """
+    if positions.empty:
+        return pd.DataFrame(), []
+    planets = positions["Planet"].tolist()
+    rules = current_rules(planets) if rules is None else rules
+
+    first, second, kind, separation = find_aspect_pairs(positions["Full_Degree"].to_numpy(), rules.angles, rules.orbs)
+    if not include_static and "Kind" in positions:
+        static = positions["Kind"].eq("Fixed Star").to_numpy()
+        moving = ~(static[first] & static[second])
+        first, second, kind, separation = first[moving], second[moving], kind[moving], separation[moving]
+    # Phase from the bodies' speeds; bodies without one are treated as fixed
+    degrees = positions["Full_Degree"].to_numpy(dtype=float)
+    speeds = positions["Speed"].fillna(0.0).to_numpy(dtype=float) if "Speed" in positions else np.zeros(len(planets))
+    rates = separation_rate(degrees[first], degrees[second], speeds[first], speeds[second])
+    aspects = [
+        rules.entry(planets[i], planets[j], diff, a, rate)
+        for i, j, a, diff, rate in zip(first.tolist(), second.tolist(), kind.tolist(), separation.tolist(),
+                                       rates.tolist())
+    ]
+    return pd.DataFrame(aspects), aspects
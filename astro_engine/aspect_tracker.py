@@ -0,0 +1,101 @@
+"""Incremental aspect detection that skips planet pairs which cannot change yet"""
+
+import numpy as np
+import pandas as pd
+
+from .core import PLANETARY_SPEEDS, RETROGRADE_SPEEDS, aspect_rules
+from .dynamics import separation_rate
+from .metrics import default_registry, timed
+from .stations import to_julian_day
+
+# Shave this many degrees off every safe distance to absorb rounding
+BOUNDARY_MARGIN = 1e-6
+
+PAIR_CHECKS = default_registry().counter(
+    "astro_aspect_tracker_pairs_total", "Planet pairs re-evaluated or skipped by aspect trackers", ("result",)
+)
+
+
+def max_planet_speed(planet):
+    """Fastest the model can move a planet in either direction (degrees/day)"""
+    return max(abs(PLANETARY_SPEEDS.get(planet, 0.0)), abs(RETROGRADE_SPEEDS.get(planet, 0.0)))
+
+
+class AspectTracker:
+    """Drop-in for get_aspects in time-ordered sweeps with identical output
+
+    Every pair that is out of orb gets a safe horizon: the distance from its
+    separation to the nearest orb edge divided by the fastest possible
+    closing speed. Until the sweep moves past that horizon the pair cannot
+    form an aspect, so it is not re-evaluated. Pairs inside an orb are always
+    re-evaluated because their Orb and Exact_Degree text changes every step.
+    """
+
+    def __init__(self):
+        self.planets = None
+        self.rules = None
+        self.evaluated = 0
+        self.skipped = 0
+
+    def _reset(self, planets, rules):
+        """Start tracking a new planet list or rule set with every pair due"""
+        self.planets = planets
+        self.rules = rules
+        first, second = np.triu_indices(len(planets), k=1)
+        self.first, self.second = first, second
+        speeds = np.array([max_planet_speed(planet) for planet in planets])
+        self.closing_speed = speeds[first] + speeds[second]
+        self.checked_at = np.zeros(len(first))
+        self.horizon = np.full(len(first), -1.0)
+        self.in_orb = np.ones(len(first), dtype=bool)
+
+    @timed("AspectTracker.get_aspects")
+    def get_aspects(self, positions, when):
+        """Same result as get_aspects(positions) for positions computed at when"""
+        if positions.empty:
+            return pd.DataFrame(), []
+
+        planets = positions["Planet"].tolist()
+        rules = aspect_rules()
+        if planets != self.planets or rules is not self.rules:
+            self._reset(planets, rules)
+        julian_day = float(to_julian_day(when))
+
+        # Pairs whose state may have changed since they were last checked
+        due = self.in_orb | (np.abs(julian_day - self.checked_at) >= self.horizon)
+        pairs = np.nonzero(due)[0]
+        self.evaluated += len(pairs)
+        self.skipped += len(due) - len(pairs)
+        PAIR_CHECKS.inc(len(pairs), result="evaluated")
+        PAIR_CHECKS.inc(len(due) - len(pairs), result="skipped")
+
+        # Separation folded to 0-180 exactly as get_aspects does it
+        degrees = positions["Full_Degree"].to_numpy(dtype=float)
+        diff = np.abs(degrees[self.second[pairs]] - degrees[self.first[pairs]])
+        diff = np.where(diff > 180, 360 - diff, diff)
+
+        # First aspect (in rule-file order) whose orb contains the separation
+        within = np.abs(diff[:, None] - rules.angles[None, :]) <= rules.orbs[None, :]
+        matched = within.any(axis=1)
+        self.in_orb[pairs] = matched
+
+        # Out-of-orb pairs are safe until they could have closed the gap to a boundary
+        free = pairs[~matched]
+        gap = np.abs(diff[~matched][:, None] - rules.orb_edges[None, :]).min(axis=1) - BOUNDARY_MARGIN
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.horizon[free] = np.maximum(gap, 0.0) / self.closing_speed[free]
+        self.checked_at[free] = julian_day
+
+        # Rate of change of each matched separation gives its phase
+        matched_pairs = pairs[matched]
+        speeds = positions["Speed"].to_numpy(dtype=float)
+        rates = separation_rate(degrees[self.first[matched_pairs]], degrees[self.second[matched_pairs]],
+                                speeds[self.first[matched_pairs]], speeds[self.second[matched_pairs]])
+
+        aspects = []
+        aspect_index = within.argmax(axis=1)
+        for pair, separation, index, rate in zip(matched_pairs, diff[matched], aspect_index[matched], rates):
+            aspects.append(rules.entry(planets[self.first[pair]], planets[self.second[pair]], float(separation), index,
+                                       float(rate)))
+
+        return pd.DataFrame(aspects), aspects
@@ -0,0 +1,224 @@
+"""Headless daily reports for every trading day and index in a date range
+
+Each day's positions are computed once, in a worker process, for every
+exchange of the requested indices that trades that day; each index's
+report follows its exchange's session and time zone and is rendered as
+Markdown, HTML and JSON under ``<output>/<SYMBOL>/<YYYY-MM-DD>.<ext>``. Every file is written to a
+temporary name in its directory and renamed into place, so a crash or a
+concurrent reader never sees a partial report. Meant for cron: a day that
+fails is reported and the rest still run, and the exit code is nonzero if
+any day failed. Run with ``python -m astro_engine.batch --help``.
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import as_completed
+from datetime import datetime
+
+from .core import ENGINE_VERSION
+from .exchanges import group_by_exchange, index_exchange
+from .jobs import process_pool
+from .timeline import (
+    INDEX_SYMBOLS,
+    REPORT_INDEX_SYMBOLS,
+    REPORT_INTERVAL_MINUTES,
+    compute_daily_report,
+    compute_exchange_report_timelines,
+    summarize_day
+)
+from .trading_calendar import is_trading_day, trading_days
+
+BATCH_FORMATS = ["md", "html", "json"]
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 56rem; margin: 2rem auto; padding: 0 1rem; line-height: 1.5; }}
+h2 {{ border-bottom: 2px solid #1f77b4; padding-bottom: .3rem; }}
+ul ul {{ margin: 0; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def report_paths(output_dir, day, symbol, formats=BATCH_FORMATS):
+    """Output file of each format for one day and index"""
+    return {fmt: os.path.join(output_dir, symbol, f"{day:%Y-%m-%d}.{fmt}") for fmt in formats}
+
+
+def write_atomic(path, text):
+    """Write text to path through a temporary file in the same directory and an atomic rename"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as temporary_file:
+            temporary_file.write(text)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _inline_html(text):
+    """Escape a line of report text and render its **bold** spans"""
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text))
+
+
+def report_html(report, title):
+    """Standalone HTML page for a report, covering the Markdown subset generate_daily_report writes"""
+    body = []
+    depth = 0
+    for line in report.strip().splitlines():
+        bullet = re.match(r"( *)- (.*)", line)
+        level = len(bullet.group(1)) // 2 + 1 if bullet else 0
+        # Open or close nested lists to match the bullet's indentation
+        while depth < level:
+            body.append("<ul>")
+            depth += 1
+        while depth > level:
+            body.append("</ul>")
+            depth -= 1
+        if bullet:
+            body.append(f"<li>{_inline_html(bullet.group(2))}</li>")
+        elif line.startswith("### "):
+            body.append(f"<h3>{_inline_html(line[4:])}</h3>")
+        elif line.startswith("## "):
+            body.append(f"<h2>{_inline_html(line[3:])}</h2>")
+        elif line.strip():
+            body.append(f"<p>{_inline_html(line)}</p>")
+    body.extend(["</ul>"] * depth)
+    return HTML_TEMPLATE.format(title=html.escape(title), body="\n".join(body))
+
+
+def trading_symbols(day, symbols):
+    """The indices whose exchange trades on day"""
+    return [symbol for symbol in symbols if is_trading_day(day, index_exchange(symbol))]
+
+
+def render_day(day, symbols, output_dir, interval_minutes=REPORT_INTERVAL_MINUTES, formats=BATCH_FORMATS):
+    """Compute one day's report timelines and write every trading index's report; returns the number of files written"""
+    symbols = trading_symbols(day, symbols)
+    timelines = compute_exchange_report_timelines(day, list(group_by_exchange(symbols)), interval_minutes)
+    written = 0
+    for symbol in symbols:
+        exchange = index_exchange(symbol)
+        timeline_df = timelines[exchange]
+        report = compute_daily_report(day, timeline_df, [symbol], exchange)
+        contents = {
+            "md": report.strip() + "\n",
+            "html": report_html(report, f"{symbol} astro trend report {day:%d %b %Y}"),
+            "json": json.dumps({
+                "date": day.strftime("%Y-%m-%d"),
+                "symbol": symbol,
+                "exchange": exchange,
+                "interval": interval_minutes,
+                "engine_version": ENGINE_VERSION,
+                "summary": summarize_day(day, timeline_df),
+                "timeline": timeline_df.to_dict("records"),
+                "report": report.strip()
+            }, ensure_ascii=False, indent=2, default=str)
+        }
+        for fmt, path in report_paths(output_dir, day, symbol, formats).items():
+            write_atomic(path, contents[fmt])
+            written += 1
+    return written
+
+
+def batch_reports(start_date, end_date, symbols, output_dir, interval_minutes=REPORT_INTERVAL_MINUTES,
+                  formats=BATCH_FORMATS, max_workers=None, skip_existing=False, progress=None):
+    """Write reports for every day in a range on which any index's exchange trades, one process per day
+
+    A failing day does not stop the others. Returns (files written, days
+    skipped, {day: error message} of the days that failed).
+    """
+    days = sorted(set().union(*(trading_days(start_date, end_date, exchange) for exchange in group_by_exchange(symbols))))
+    if skip_existing:
+        pending = [
+            day for day in days
+            if not all(os.path.exists(path) for symbol in trading_symbols(day, symbols)
+                       for path in report_paths(output_dir, day, symbol, formats).values())
+        ]
+    else:
+        pending = days
+    skipped = len(days) - len(pending)
+    written, failures, done = 0, {}, 0
+
+    def finish(day, result):
+        nonlocal written, done
+        done += 1
+        if isinstance(result, Exception):
+            failures[day] = f"{type(result).__name__}: {result}"
+        else:
+            written += result
+        if progress:
+            progress(done / len(pending), f"{day:%Y-%m-%d} ({done}/{len(pending)})")
+
+    if len(pending) == 1 or max_workers == 1:
+        for day in pending:
+            try:
+                result = render_day(day, symbols, output_dir, interval_minutes, formats)
+            except Exception as exc:  # reported per day; the remaining days still run
+                result = exc
+            finish(day, result)
+    elif pending:
+        with process_pool(max_workers) as pool:
+            futures = {
+                pool.submit(render_day, day, symbols, output_dir, interval_minutes, formats): day for day in pending
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.exception() or future.result())
+    return written, skipped, failures
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code (1 if any day failed)"""
+    parser = argparse.ArgumentParser(description="Write daily astro market reports for a range of trading days")
+    parser.add_argument("--start", required=True, type=lambda value: datetime.strptime(value, "%Y-%m-%d").date())
+    parser.add_argument("--end", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        help="last day (default: the start day)")
+    parser.add_argument("--symbol", action="append", choices=REPORT_INDEX_SYMBOLS,
+                        help="index to report on, on its own exchange's calendar and session; "
+                             "repeat for several (default: the NSE and BSE indices)")
+    parser.add_argument("--interval", type=int, default=REPORT_INTERVAL_MINUTES, help="minutes between samples")
+    parser.add_argument("--format", action="append", choices=BATCH_FORMATS,
+                        help="output format; repeat for several (default: all)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--skip-existing", action="store_true", help="leave days whose files all exist alone")
+    parser.add_argument("--output", required=True, help="directory to write <SYMBOL>/<date>.<format> files into")
+    args = parser.parse_args(argv)
+
+    end = args.end or args.start
+    if end < args.start:
+        parser.error("--end is before --start")
+    symbols = args.symbol or INDEX_SYMBOLS
+    try:
+        written, skipped, failures = batch_reports(
+            args.start, end, symbols, args.output, args.interval, args.format or BATCH_FORMATS,
+            args.workers, args.skip_existing
+        )
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"Batch failed: {exc}", file=sys.stderr)
+        return 1
+    for day, error in sorted(failures.items()):
+        print(f"{day:%Y-%m-%d} failed: {error}", file=sys.stderr)
+    print(f"Wrote {written} files to {args.output} ({skipped} days already done, {len(failures)} failed)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Outer planets, asteroids and fixed stars beyond the nine base bodies
+
+Every body here, the nine base ones included, takes its true tropical
+position from the ephemeris, so aspects across the sets never compare the
+engine's model positions with ephemeris ones.
+"""
+
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import swisseph as swe
+
+from .core import BASE_PLANETARY_DATA, convert_degree_to_dms, get_zodiac_house
+from .event_study import EVENT_BODIES
+from .houses import ascendant
+from .stations import EPHEMERIS_FLAGS, J2000_JD, to_julian_day
+
+OUTER_PLANETS = {"Uranus": swe.URANUS, "Neptune": swe.NEPTUNE, "Pluto": swe.PLUTO}
+
+# Asteroids need the Swiss Ephemeris asteroid files (seas_*.se1) on ASTRO_EPHE_PATH
+ASTEROIDS = {"Chiron": swe.CHIRON, "Ceres": swe.CERES, "Pallas": swe.PALLAS, "Juno": swe.JUNO, "Vesta": swe.VESTA}
+ASTEROID_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+STAR_FILE = os.path.join(os.path.dirname(__file__), "data", "fixed_stars.csv")
+
+# General precession in ecliptic longitude
+PRECESSION_DEGREES_PER_YEAR = 50.29 / 3600
+
+BODY_GROUPS = ["Outer Planets", "Asteroids", "Fixed Stars"]
+
+if os.environ.get("ASTRO_EPHE_PATH"):
+    swe.set_ephe_path(os.environ["ASTRO_EPHE_PATH"])
+
+
+@functools.lru_cache(maxsize=None)
+def available_asteroids():
+    """Asteroids whose ephemeris files are installed"""
+    available = []
+    for name, body in ASTEROIDS.items():
+        try:
+            swe.calc_ut(J2000_JD, body, ASTEROID_FLAGS)
+        except swe.Error:
+            continue
+        available.append(name)
+    return tuple(available)
+
+
+@functools.lru_cache(maxsize=None)
+def load_fixed_stars(path=STAR_FILE):
+    """The fixed star catalog, brightest first"""
+    stars = pd.read_csv(path, comment="#")
+    return stars.sort_values("magnitude", kind="stable").reset_index(drop=True)
+
+
+def fixed_star_longitudes(julian_day, stars=None):
+    """Tropical longitude of every catalog star, precessed from J2000"""
+    stars = load_fixed_stars() if stars is None else stars
+    years = (julian_day - J2000_JD) / 365.25
+    return (stars["longitude_j2000"].to_numpy() + PRECESSION_DEGREES_PER_YEAR * years) % 360
+
+
+def _body_rows(kind, names, longitudes, speeds, lagna_degree):
+    """Position rows for extra bodies in the layout of calculate_planetary_positions"""
+    rows = []
+    for name, longitude, speed in zip(names, longitudes, speeds):
+        sign, house = get_zodiac_house(longitude, lagna_degree)
+        rows.append({
+            "Planet": name,
+            "Kind": kind,
+            "Sign": sign,
+            "Degree": convert_degree_to_dms(longitude),
+            "Full_Degree": float(longitude),
+            "House": house,
+            "Retrograde": "Yes" if speed < 0 else "No",
+            "Speed": float(speed)
+        })
+    return rows
+
+
+def extended_positions(target_datetime, groups=BODY_GROUPS, max_stars=None):
+    """Ephemeris positions of the nine base planets plus the chosen groups of extra bodies"""
+    julian_day = float(to_julian_day(target_datetime))
+    lagna_degree = float(ascendant(target_datetime))
+
+    # Base planets in engine order; Ketu is always opposite Rahu
+    results = {name: swe.calc_ut(julian_day, body, EPHEMERIS_FLAGS)[0] for name, body in EVENT_BODIES.items()}
+    results["Ketu"] = ((results["Rahu"][0] + 180) % 360, 0, 0, results["Rahu"][3])
+    planets = list(next(iter(BASE_PLANETARY_DATA.values())))
+    rows = _body_rows("Planet", planets, [results[name][0] for name in planets],
+                      [results[name][3] for name in planets], lagna_degree)
+    if "Outer Planets" in groups:
+        results = [swe.calc_ut(julian_day, body, EPHEMERIS_FLAGS)[0] for body in OUTER_PLANETS.values()]
+        rows += _body_rows("Outer Planet", OUTER_PLANETS, [r[0] for r in results], [r[3] for r in results], lagna_degree)
+    if "Asteroids" in groups:
+        names = available_asteroids()
+        results = [swe.calc_ut(julian_day, ASTEROIDS[name], ASTEROID_FLAGS)[0] for name in names]
+        rows += _body_rows("Asteroid", names, [r[0] for r in results], [r[3] for r in results], lagna_degree)
+    if "Fixed Stars" in groups:
+        stars = load_fixed_stars()
+        if max_stars is not None:
+            stars = stars.head(max_stars)
+        rows += _body_rows(
+            "Fixed Star", stars["name"], fixed_star_longitudes(julian_day, stars),
+            np.full(len(stars), PRECESSION_DEGREES_PER_YEAR / 365.25), lagna_degree
+        )
+
+    return pd.DataFrame(rows)
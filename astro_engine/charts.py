@@ -0,0 +1,205 @@
+"""Timeline charts with WebGL traces and server-side downsampling"""
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Upper bound on points per series sent to the browser for any zoom window
+MAX_CHART_POINTS = 2000
+
+# Switch to WebGL traces once a chart has more points than this
+WEBGL_MIN_POINTS = 1000
+
+SIGNAL_COLORS = {
+    "Strong Buy": "darkgreen", "Buy": "lightgreen",
+    "Strong Sell": "darkred", "Sell": "lightcoral",
+    "Neutral": "gray"
+}
+
+
+def lttb_indices(values, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the series' shape"""
+    n = len(values)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y = np.asarray(values, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        # Average of the next bucket (the last point for the final bucket)
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], max(edges[bucket + 2], edges[bucket + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the anchor and that average
+        area = np.abs((x[anchor] - avg_x) * (y[start:end] - y[anchor]) - (x[anchor] - x[start:end]) * (avg_y - y[anchor]))
+        anchor = start + int(area.argmax())
+        selected[bucket + 1] = anchor
+
+    return selected
+
+
+def minmax_indices(values, n_buckets):
+    """Indices of the minimum and maximum of each of n_buckets equal buckets"""
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if 2 * n_buckets >= n or n_buckets < 1:
+        return np.arange(n)
+
+    # Pad to a whole number of buckets with values that never win min or max
+    size = -(-n // n_buckets)
+    padded_low = np.full(size * n_buckets, np.inf)
+    padded_high = np.full(size * n_buckets, -np.inf)
+    padded_low[:n] = y
+    padded_high[:n] = y
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + padded_low.reshape(n_buckets, size).argmin(axis=1)
+    highs = offsets + padded_high.reshape(n_buckets, size).argmax(axis=1)
+    # Trailing buckets made only of padding point past the end
+    kept = np.concatenate([lows, highs, [0, n - 1]])
+    return np.unique(kept[kept < n])
+
+
+def signal_change_indices(signals, max_changes=None):
+    """Rows where the signal differs from the previous row (plus the first row)
+
+    Beyond max_changes (if given) an evenly spaced subset of them is kept.
+    """
+    signals = np.asarray(signals)
+    if len(signals) == 0:
+        return np.arange(0)
+    changes = np.concatenate([[0], np.nonzero(signals[1:] != signals[:-1])[0] + 1])
+    if max_changes is not None and len(changes) > max_changes:
+        changes = changes[np.unique(np.linspace(0, len(changes) - 1, max(max_changes, 1)).astype(int))]
+    return changes
+
+
+def downsample_timeline(timeline_df, max_points=MAX_CHART_POINTS):
+    """Rows to plot, at most max_points: LTTB on the net score (3/8 of the
+    budget), min/max envelopes on weights and aspect counts (1/8 each) and
+    the signal changes (1/4, thinned evenly when there are more)"""
+    if len(timeline_df) <= max_points:
+        return timeline_df
+    keep = np.unique(np.concatenate([
+        lttb_indices(timeline_df["Net_Score"].to_numpy(), max_points * 3 // 8),
+        minmax_indices(timeline_df["Bullish_Weight"].to_numpy(), max_points // 16),
+        minmax_indices(timeline_df["Bearish_Weight"].to_numpy(), max_points // 16),
+        minmax_indices(timeline_df["Active_Aspects"].to_numpy(), max_points // 16),
+        signal_change_indices(timeline_df["Signal"].to_numpy(), max_points // 4)
+    ]))
+    return timeline_df.iloc[keep]
+
+
+def build_analysis_figure(timeline_df, x_column, title, max_points=MAX_CHART_POINTS):
+    """The three-panel weights / net score / activity chart for a timeline window"""
+    plotted = downsample_timeline(timeline_df, max_points)
+    downsampled = len(plotted) < len(timeline_df)
+    use_webgl = downsampled or len(plotted) > WEBGL_MIN_POINTS
+    scatter = go.Scattergl if use_webgl else go.Scatter
+    x = plotted[x_column]
+
+    # Create comprehensive charts
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=(
+            'Session-wise Bullish vs Bearish Weights',
+            'Net Score Trend with Signal Strength',
+            'Active Aspects & Market Activity'
+        ),
+        vertical_spacing=0.08,
+        specs=[[{"secondary_y": True}],
+               [{"secondary_y": True}],
+               [{"secondary_y": False}]]
+    )
+
+    # Chart 1: Bullish vs Bearish weights
+    fig.add_trace(
+        scatter(x=x, y=plotted["Bullish_Weight"],
+                name="Bullish Weight", line=dict(color="green", width=2),
+                fill='tonexty'), row=1, col=1)
+    fig.add_trace(
+        scatter(x=x, y=plotted["Bearish_Weight"],
+                name="Bearish Weight", line=dict(color="red", width=2),
+                fill='tozeroy'), row=1, col=1)
+
+    # Chart 2: Net score with signal indicators
+    if downsampled:
+        # Per-point markers only where the signal changes, within the same quarter of the point budget
+        changes = timeline_df.iloc[signal_change_indices(timeline_df["Signal"].to_numpy(), max_points // 4)]
+        fig.add_trace(
+            scatter(x=x, y=plotted["Net_Score"], name="Net Score", mode='lines',
+                    line=dict(color="blue", width=3)),
+            row=2, col=1)
+        fig.add_trace(
+            scatter(x=changes[x_column], y=changes["Net_Score"], name="Signal Changes", mode='markers',
+                    text=changes["Signal"],
+                    marker=dict(color=changes["Signal"].map(SIGNAL_COLORS).fillna("gray").tolist(), size=8,
+                                line=dict(width=1, color="white"))),
+            row=2, col=1)
+    else:
+        colors = [SIGNAL_COLORS.get(signal, "gray") for signal in plotted["Signal"]]
+        fig.add_trace(
+            scatter(x=x, y=plotted["Net_Score"],
+                    name="Net Score", mode='lines+markers',
+                    line=dict(color="blue", width=3),
+                    marker=dict(color=colors, size=10, line=dict(width=2, color="white"))),
+            row=2, col=1)
+
+    # Add zero line
+    fig.add_hline(y=0, line_dash="dash", line_color="black", row=2, col=1)
+
+    # Chart 3: Active aspects (bars do not scale, so long windows use a stepped area)
+    if use_webgl:
+        fig.add_trace(
+            scatter(x=x, y=plotted["Active_Aspects"], name="Active Aspects",
+                    line=dict(color="purple", shape="hv"), fill='tozeroy', opacity=0.7),
+            row=3, col=1)
+    else:
+        fig.add_trace(
+            go.Bar(x=x, y=plotted["Active_Aspects"],
+                   name="Active Aspects", marker_color="purple", opacity=0.7),
+            row=3, col=1)
+
+    # Update layout
+    fig.update_layout(
+        height=800,
+        title_text=title,
+        showlegend=True,
+        template="plotly_white"
+    )
+
+    # Update axes labels
+    fig.update_xaxes(title_text="Time", row=3, col=1)
+    fig.update_yaxes(title_text="Weight", row=1, col=1)
+    fig.update_yaxes(title_text="Net Score", row=2, col=1)
+    fig.update_yaxes(title_text="Count", row=3, col=1)
+
+    return fig
+
+
+def build_sector_heatmap(heatmap_df, title):
+    """Heatmap of sector exposure, sectors as rows and periods as columns"""
+    fig = go.Figure(go.Heatmap(
+        z=heatmap_df.to_numpy(),
+        x=heatmap_df.columns,
+        y=heatmap_df.index,
+        colorscale="YlOrRd",
+        colorbar=dict(title="Exposure"),
+        hovertemplate="%{y}<br>%{x|%d %b %Y}<br>Exposure %{z:.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        height=max(400, 18 * len(heatmap_df)),
+        title_text=title,
+        template="plotly_white"
+    )
+    fig.update_xaxes(title_text="Period")
+    fig.update_yaxes(autorange="reversed")
+    return fig
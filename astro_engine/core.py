@@ -0,0 +1,933 @@
+"""Planetary positions, aspects, session analysis, signals and reports"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .aspect_rules import TENDENCIES, current_rules
+from .divisional import divisional_sign_names
+from .dynamics import PHASES, exact_phase, pair_separations, separation_rate
+from .exchanges import market_hours, session_codes, session_spans, timezone_name, to_engine, to_local
+from .houses import EXCHANGE_LOCATIONS, ascendant
+from .metrics import timed
+from .muhurta import market_timings, timing_columns
+from .panchang import panchang_at, panchang_changes
+from .stations import retrograde_mask, retrograde_days, station_note, stations_between
+
+# Nakshatra data with market characteristics
+nakshatras = [
+    ("Ashwini", 0, 13+20/60, "Impulsive", "High volatility, quick moves"),
+    ("Bharani", 13+20/60, 26+40/60, "Restrictive", "Resistance levels, consolidation"),
+    ("Krittika", 26+40/60, 40, "Sharp", "Sharp moves, breakouts"),
+    ("Rohini", 40, 53+20/60, "Growth", "Steady uptrend, bull market"),
+    ("Mrigashira", 53+20/60, 66+40/60, "Searching", "Range-bound, uncertainty"),
+    ("Ardra", 66+40/60, 80, "Destructive", "High volatility, corrections"),
+    ("Punarvasu", 80, 93+20/60, "Renewal", "Recovery, bounce back"),
+    ("Pushya", 93+20/60, 106+40/60, "Nourishing", "Steady growth, accumulation"),
+    ("Ashlesha", 106+40/60, 120, "Entangling", "Sideways, manipulation"),
+    ("Magha", 120, 133+20/60, "Royal", "Leadership stocks outperform"),
+    ("Purva Phalguni", 133+20/60, 146+40/60, "Enjoyment", "Consumption stocks up"),
+    ("Uttara Phalguni", 146+40/60, 160, "Service", "Service sector strength"),
+    ("Hasta", 160, 173+20/60, "Skillful", "Technical analysis works"),
+    ("Chitra", 173+20/60, 186+40/60, "Beautiful", "Luxury goods, aesthetics"),
+    ("Swati", 186+40/60, 200, "Independent", "Individual stock moves"),
+    ("Vishakha", 200, 213+20/60, "Purposeful", "Directional moves"),
+    ("Anuradha", 213+20/60, 226+40/60, "Friendly", "Broad market participation"),
+    ("Jyeshtha", 226+40/60, 240, "Chief", "Large cap leadership"),
+    ("Mula", 240, 253+20/60, "Root", "Fundamental analysis focus"),
+    ("Purva Ashadha", 253+20/60, 266+40/60, "Invincible", "Strong trending moves"),
+    ("Uttara Ashadha", 266+40/60, 280, "Victory", "Final push, completion"),
+    ("Shravana", 280, 293+20/60, "Listening", "News-driven moves"),
+    ("Dhanishta", 293+20/60, 306+40/60, "Wealthy", "Financial sector focus"),
+    ("Shatabhisha", 306+40/60, 320, "Healing", "Recovery after correction"),
+    ("Purva Bhadrapada", 320, 333+20/60, "Dual", "Mixed signals, confusion"),
+    ("Uttara Bhadrapada", 333+20/60, 346+40/60, "Depth", "Value investing"),
+    ("Revati", 346+40/60, 360, "Wealthy", "Prosperity, bull market end")
+]
+
+# Zodiac signs and market characteristics
+zodiac_market_traits = {
+    "Aries": {"trend": "Bullish", "volatility": "High", "sectors": "Energy, Defense, Metals"},
+    "Taurus": {"trend": "Stable", "volatility": "Low", "sectors": "Banking, FMCG, Real Estate"},
+    "Gemini": {"trend": "Volatile", "volatility": "Medium", "sectors": "IT, Telecom, Media"},
+    "Cancer": {"trend": "Defensive", "volatility": "Medium", "sectors": "Healthcare, Food, Home"},
+    "Leo": {"trend": "Strong", "volatility": "Medium", "sectors": "Luxury, Entertainment, Gold"},
+    "Virgo": {"trend": "Cautious", "volatility": "Low", "sectors": "Pharma, Services, Analytics"},
+    "Libra": {"trend": "Balanced", "volatility": "Low", "sectors": "Beauty, Fashion, Harmony"},
+    "Scorpio": {"trend": "Intense", "volatility": "High", "sectors": "Mining, Chemicals, Research"},
+    "Sagittarius": {"trend": "Optimistic", "volatility": "Medium", "sectors": "Travel, Education, Export"},
+    "Capricorn": {"trend": "Conservative", "volatility": "Low", "sectors": "Infrastructure, Government"},
+    "Aquarius": {"trend": "Innovative", "volatility": "High", "sectors": "Technology, Renewables, EV"},
+    "Pisces": {"trend": "Emotional", "volatility": "High", "sectors": "Water, Oil, Spirituality"}
+}
+
+# Market sessions
+market_sessions = {
+    "Pre-Market": {"start": "09:00", "end": "09:15", "characteristics": "Gap analysis, overnight news impact"},
+    "Opening": {"start": "09:15", "end": "10:00", "characteristics": "High volatility, trend setting, institutional orders"},
+    "Morning": {"start": "10:00", "end": "11:30", "characteristics": "Primary trend development, momentum building"},
+    "Mid-Session": {"start": "11:30", "end": "13:30", "characteristics": "Institutional activity, large orders"},
+    "Afternoon": {"start": "13:30", "end": "15:00", "characteristics": "Retail participation, profit booking"},
+    "Closing": {"start": "15:00", "end": "15:30", "characteristics": "Settlement, final adjustments, closing prices"}
+}
+
+# Planetary market influences
+planetary_influences = {
+    "Sun": {
+        "positive": "Government policies favorable, PSU stocks rise, leadership emergence",
+        "negative": "Ego-driven decisions, power struggles, overconfidence in markets"
+    },
+    "Moon": {
+        "positive": "FMCG sector strength, emotional buying, consumer sentiment positive", 
+        "negative": "Emotional trading, mood swings, panic selling"
+    },
+    "Mars": {
+        "positive": "Energy sector boom, metals rally, defense stocks up, aggressive buying",
+        "negative": "War-like conditions, aggressive selling, conflict in markets"
+    },
+    "Mercury": {
+        "positive": "IT sector leadership, quick gains, communication stocks up, trading activity",
+        "negative": "Volatility, confusion, technical glitches, communication breakdown"
+    },
+    "Jupiter": {
+        "positive": "Banking sector strength, financial optimism, investment inflows, wisdom prevails",
+        "negative": "Over-expansion, excessive optimism, bubble formation"
+    },
+    "Venus": {
+        "positive": "Luxury goods up, beauty sector strong, consumption increase, aesthetic appeal",
+        "negative": "Speculation, materialism, luxury bubble, over-indulgence"
+    },
+    "Saturn": {
+        "positive": "Infrastructure development, disciplined trading, long-term investments",
+        "negative": "Restrictions, delays, bear market, regulatory hurdles"
+    },
+    "Rahu": {
+        "positive": "Innovation boom, foreign investment, technology adoption, unconventional gains",
+        "negative": "Illusion, manipulation, fake news impact, sudden reversals"
+    },
+    "Ketu": {
+        "positive": "Spiritual stocks, detachment from materialism, research-based decisions",
+        "negative": "Sudden exits, abandonment, loss of interest, unexpected events"
+    }
+}
+
+# Base planetary positions for July 30, 2025 (realistic astronomical data)
+BASE_PLANETARY_DATA = {
+    datetime(2025, 7, 30, 12, 0, 0): {
+        "Sun": {"longitude": 127.5, "retrograde": False},      # Leo
+        "Moon": {"longitude": 165.3, "retrograde": False},     # Virgo  
+        "Mars": {"longitude": 52.1, "retrograde": False},      # Taurus
+        "Mercury": {"longitude": 115.8, "retrograde": True},   # Cancer (Retrograde)
+        "Jupiter": {"longitude": 108.9, "retrograde": True},   # Cancer (Retrograde)
+        "Venus": {"longitude": 63.5, "retrograde": False},     # Gemini
+        "Saturn": {"longitude": 340.2, "retrograde": True},    # Pisces (Retrograde)
+        "Rahu": {"longitude": 325.7, "retrograde": True},      # Pisces (Always Retrograde)
+        "Ketu": {"longitude": 145.7, "retrograde": True}       # Virgo (Always Retrograde)
+    }
+}
+
+# Planetary daily movement speeds (degrees per day)
+PLANETARY_SPEEDS = {
+    "Sun": 1.0,           # ~1 degree per day
+    "Moon": 13.0,         # ~13 degrees per day (fastest)
+    "Mercury": 1.5,       # ~1-2 degrees per day (retrograde: -1.0)
+    "Venus": 1.2,         # ~1.2 degrees per day
+    "Mars": 0.6,          # ~0.5-0.7 degrees per day
+    "Jupiter": 0.08,      # ~0.08 degrees per day (retrograde: -0.05)
+    "Saturn": 0.033,      # ~0.033 degrees per day (retrograde: -0.02)
+    "Rahu": -0.05,        # Always retrograde
+    "Ketu": -0.05         # Always retrograde
+}
+
+# Mean speeds while retrograde (degrees per day), applied between stations
+RETROGRADE_SPEEDS = {
+    "Mercury": -1.0,
+    "Venus": -0.6,
+    "Mars": -0.35,
+    "Jupiter": -0.05,
+    "Saturn": -0.02,
+    "Rahu": -0.05,
+    "Ketu": -0.05
+}
+
+# Weight ratios that classify session outlooks and trading signals
+outlook_thresholds = {"strong": 0.7, "moderate": 0.55}
+signal_thresholds = {"strong": 0.65, "moderate": 0.35}
+
+# Share of an aspect's weight added for a strong applying aspect (to its own
+# side) and for a moderate separating one (to the opposite side)
+phase_bonuses = {"applying": 0.5, "separating": 0.3}
+
+# Bump whenever scoring logic changes so persisted results are invalidated
+ENGINE_VERSION = "2025.08.7"
+
+def get_nakshatra_pada(degree):
+    """Calculate Nakshatra and Pada from longitude with market characteristics"""
+    for nak_data in nakshatras:
+        nak, start, end = nak_data[0], nak_data[1], nak_data[2]
+        if start <= degree < end:
+            pada = int((degree - start) // (13+20/60 / 4)) + 1
+            return nak, pada, nak_data[3], nak_data[4]
+    return "Unknown", 0, "Neutral", "No specific influence"
+
+def get_zodiac_house(degree, ascendant_degree=0.0):
+    """Get zodiac sign and whole-sign house (counted from the ascendant sign) from longitude"""
+    sign_index = int(degree // 30) % 12
+    house_index = (sign_index - int(ascendant_degree // 30)) % 12
+    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
+             "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+    return signs[sign_index], f"House {house_index + 1}"
+
+def convert_degree_to_dms(degree):
+    """Convert decimal degree to degrees, minutes, seconds format"""
+    degree_in_sign = degree % 30
+    degree_int = int(degree_in_sign)
+    minute_int = int((degree_in_sign - degree_int) * 60)
+    second_int = int(((degree_in_sign - degree_int) * 60 - minute_int) * 60)
+    return f"{degree_int}° {minute_int}' {second_int}\""
+
+@timed("calculate_planetary_positions")
+def calculate_planetary_positions(target_datetime, station_notes=False):
+    """Calculate planetary positions for any given date/time using astronomical data
+
+    The Station commentary is only written with station_notes; timeline
+    steps never show it, so it is left empty there.
+    """
+    
+    # Find the closest base date
+    base_date = datetime(2025, 7, 30, 12, 0, 0)
+    base_data = BASE_PLANETARY_DATA[base_date]
+    
+    # Calculate time difference in days
+    time_diff = (target_datetime - base_date).total_seconds() / (24 * 3600)
+    
+    # Houses are counted from the lagna rising at the exchange
+    lagna_degree = float(ascendant(target_datetime))
+    
+    positions = []
+    
+    for planet, base_info in base_data.items():
+        base_longitude = base_info["longitude"]
+        
+        # Retrograde status comes from the station engine, not the base snapshot
+        is_retrograde = bool(retrograde_mask(planet, target_datetime))
+        direct_speed = PLANETARY_SPEEDS[planet]
+        retro_speed = RETROGRADE_SPEEDS.get(planet, direct_speed)
+        speed = retro_speed if is_retrograde else direct_speed
+        
+        # Move at retrograde speed only for the time spent between stations
+        retro_days = float(retrograde_days(planet, base_date, target_datetime))
+        new_longitude = (base_longitude + direct_speed * (time_diff - retro_days) + retro_speed * retro_days) % 360
+        
+        # Get zodiac and nakshatra info
+        sign, house = get_zodiac_house(new_longitude, lagna_degree)
+        nak, pada, nak_nature, nak_influence = get_nakshatra_pada(new_longitude)
+        
+        # Format degree
+        degree_formatted = convert_degree_to_dms(new_longitude)
+        navamsa = divisional_sign_names(new_longitude, 9)
+        dasamsa = divisional_sign_names(new_longitude, 10)
+        
+        positions.append({
+            "Planet": planet,
+            "Sign": sign,
+            "Degree": degree_formatted,
+            "Full_Degree": new_longitude,
+            "House": house,
+            "Nakshatra": nak,
+            "Pada": pada,
+            "Navamsa": navamsa,
+            "Dasamsa": dasamsa,
+            "Retrograde": "Yes" if is_retrograde else "No",
+            "Speed": speed,
+            "Station": station_note(planet, target_datetime) if station_notes else "",
+            "Date": target_datetime.strftime("%Y-%m-%d %H:%M:%S IST"),
+            "Nakshatra_Nature": nak_nature,
+            "Market_Influence": nak_influence
+        })
+    
+    return pd.DataFrame(positions)
+
+def planet_longitudes(times):
+    """Longitude of every planet at each IST time, as calculate_planetary_positions places them
+
+    Vectorized over the time array; returns a DataFrame indexed by time
+    with one column per planet.
+    """
+    base_date = datetime(2025, 7, 30, 12, 0, 0)
+    base_data = BASE_PLANETARY_DATA[base_date]
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    time_diff = (times - base_date).total_seconds().to_numpy() / (24 * 3600)
+
+    longitudes = {}
+    for planet, base_info in base_data.items():
+        direct_speed = PLANETARY_SPEEDS[planet]
+        retro_speed = RETROGRADE_SPEEDS.get(planet, direct_speed)
+        retro_days = np.asarray(retrograde_days(planet, base_date, times.to_numpy()), dtype=float)
+        longitudes[planet] = (base_info["longitude"] + direct_speed * (time_diff - retro_days) + retro_speed * retro_days) % 360
+    return pd.DataFrame(longitudes, index=times)
+
+def planet_speeds(times):
+    """Speed (degrees per day) of every planet at each IST time, direct or retrograde as the stations say"""
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    speeds = {}
+    for planet in next(iter(BASE_PLANETARY_DATA.values())):
+        direct_speed = PLANETARY_SPEEDS[planet]
+        retro_speed = RETROGRADE_SPEEDS.get(planet, direct_speed)
+        retrograde = np.asarray(retrograde_mask(planet, times.to_numpy()), dtype=bool)
+        speeds[planet] = np.where(retrograde, retro_speed, direct_speed)
+    return pd.DataFrame(speeds, index=times)
+
+@timed("aspect_dynamics")
+def aspect_dynamics(times):
+    """Every in-orb aspect of every planet pair at each IST time, with its phase and hours to exact
+
+    Vectorized over times and pairs: separations and their rates come from
+    planet_longitudes and planet_speeds, so applying and separating need no
+    neighbouring samples. Returns one row per (time, pair) in orb with
+    DateTime, Planet1, Planet2, Aspect, Separation, Weight, Tendency,
+    Strong, Phase and Hours_To_Exact, pairs and aspects matched as
+    get_aspects matches them.
+    """
+    rules = aspect_rules()
+    longitudes = planet_longitudes(times)
+    speeds = planet_speeds(longitudes.index).to_numpy()
+    first, second = np.triu_indices(len(rules.planets), 1)
+    separation, rate = pair_separations(longitudes.to_numpy(), speeds, first, second)
+
+    # First aspect (in rule-file order) whose orb contains each separation
+    within = np.abs(separation[..., None] - rules.angles) <= rules.orbs
+    step, pair = np.nonzero(within.any(axis=2))
+    aspect = within[step, pair].argmax(axis=1)
+    separation, rate = separation[step, pair], rate[step, pair]
+    phase, days = exact_phase(separation, rate, rules.angles[aspect])
+
+    i, j = rules.planet_class[first[pair]], rules.planet_class[second[pair]]
+    planets = np.array(rules.planets, dtype=object)
+    return pd.DataFrame({
+        "DateTime": longitudes.index[step],
+        "Planet1": planets[first[pair]],
+        "Planet2": planets[second[pair]],
+        "Aspect": np.array(rules.names, dtype=object)[aspect],
+        "Separation": separation,
+        "Weight": rules.weight[i, j, aspect],
+        "Tendency": np.array(TENDENCIES, dtype=object)[rules.tendency[i, j, aspect]],
+        "Strong": np.abs(separation - rules.angles[aspect]) <= rules.orbs[aspect] / 2,
+        "Phase": np.array(PHASES, dtype=object)[phase],
+        "Hours_To_Exact": np.round(days * 24, 1)
+    })
+
+def aspect_rules():
+    """Aspect scoring rules for the engine's planets, hot-reloaded from the rule file"""
+    return current_rules(list(next(iter(BASE_PLANETARY_DATA.values()))))
+
+def build_aspect_entry(p1, p2, diff, angle):
+    """Aspect row for a planet pair whose separation diff is within orb of angle"""
+    rules = aspect_rules()
+    return rules.entry(p1, p2, diff, rules.aspect_index[angle])
+
+@timed("get_aspects")
+def get_aspects(positions):
+    """Calculate aspects between planets with market context"""
+    if positions.empty:
+        return pd.DataFrame(), []
+    
+    aspects = []
+    rules = aspect_rules()
+    planets = positions["Planet"].tolist()
+    full_degrees = positions["Full_Degree"].tolist()
+    speeds = positions["Speed"].tolist() if "Speed" in positions else [0.0] * len(planets)
+    
+    for i, p1 in enumerate(planets):
+        for j, p2 in enumerate(planets[i+1:], start=i+1):
+            deg1 = full_degrees[i]
+            deg2 = full_degrees[j]
+            diff = abs(deg2 - deg1)
+            if diff > 180:
+                diff = 360 - diff
+            
+            aspect = rules.match(diff)
+            if aspect >= 0:
+                rate = float(separation_rate(deg1, deg2, speeds[i], speeds[j]))
+                aspects.append(rules.entry(p1, p2, diff, aspect, rate))
+    
+    return pd.DataFrame(aspects), aspects
+
+def analyze_market_session(time_str, aspects_df, positions_df):
+    """Analyze market characteristics for specific session with enhanced logic"""
+    hour = int(time_str.split(':')[0])
+    minute = int(time_str.split(':')[1])
+    time_decimal = hour + minute/60
+    
+    # Determine session
+    if 9.0 <= time_decimal < 9.25:
+        session = "Pre-Market"
+        session_emoji = "🌅"
+    elif 9.25 <= time_decimal < 10.0:
+        session = "Opening" 
+        session_emoji = "🔔"
+    elif 10.0 <= time_decimal < 11.5:
+        session = "Morning"
+        session_emoji = "🌄"
+    elif 11.5 <= time_decimal < 13.5:
+        session = "Mid-Session"
+        session_emoji = "🌇"
+    elif 13.5 <= time_decimal < 15.0:
+        session = "Afternoon"
+        session_emoji = "🌆"
+    elif 15.0 <= time_decimal <= 15.5:
+        session = "Closing"
+        session_emoji = "🌃"
+    else:
+        session = "After-Hours"
+        session_emoji = "🌙"
+    
+    # Calculate session characteristics
+    bullish_count = len(aspects_df[aspects_df["Tendency"] == "Bullish"])
+    bearish_count = len(aspects_df[aspects_df["Tendency"] == "Bearish"])
+    total_weight = aspects_df["Weight"].sum()
+    bullish_weight = aspects_df[aspects_df["Tendency"] == "Bullish"]["Weight"].sum()
+    bearish_weight = aspects_df[aspects_df["Tendency"] == "Bearish"]["Weight"].sum()
+    
+    # Enhanced outlook calculation
+    if total_weight > 0:
+        bullish_ratio = bullish_weight / total_weight
+        bearish_ratio = bearish_weight / total_weight
+        
+        if bullish_ratio > outlook_thresholds["strong"]:
+            outlook = "Strong Bullish"
+            emoji = "🚀"
+        elif bullish_ratio > outlook_thresholds["moderate"]:
+            outlook = "Bullish"
+            emoji = "📈"
+        elif bearish_ratio > outlook_thresholds["strong"]:
+            outlook = "Strong Bearish"
+            emoji = "💥"
+        elif bearish_ratio > outlook_thresholds["moderate"]:
+            outlook = "Bearish"
+            emoji = "📉"
+        else:
+            outlook = "Neutral"
+            emoji = "➡️"
+    else:
+        outlook = "Neutral"
+        emoji = "➡️"
+    
+    # Session-specific adjustments
+    if session == "Opening" and bullish_count > bearish_count:
+        outlook += " (Gap Up Likely)"
+    elif session == "Opening" and bearish_count > bullish_count:
+        outlook += " (Gap Down Likely)"
+    elif session == "Closing":
+        if bullish_count > bearish_count:
+            outlook += " (Positive Close)"
+        elif bearish_count > bullish_count:
+            outlook += " (Negative Close)"
+    
+    return {
+        "session": session,
+        "session_emoji": session_emoji,
+        "outlook": outlook,
+        "emoji": emoji,
+        "bullish_aspects": bullish_count,
+        "bearish_aspects": bearish_count,
+        "bullish_weight": round(bullish_weight, 2),
+        "bearish_weight": round(bearish_weight, 2),
+        "strength": "High" if total_weight > 10 else "Medium" if total_weight > 5 else "Low"
+    }
+
+def generate_market_insights(positions_df, aspects_df):
+    """Generate detailed market insights with sector focus"""
+    insights = []
+    
+    # Planetary influence analysis
+    key_influences = []
+    sector_focus = []
+    
+    for _, pos in positions_df.iterrows():
+        planet = pos["Planet"]
+        sign = pos["Sign"]
+        retrograde = pos["Retrograde"]
+        nakshatra = pos["Nakshatra"]
+        
+        trait = zodiac_market_traits.get(sign, {})
+        planet_info = planetary_influences.get(planet, {})
+        
+        # Key planets for market analysis
+        if planet in ["Sun", "Moon", "Mercury", "Jupiter", "Mars"]:
+            retro_text = " (Retrograde)" if retrograde == "Yes" else ""
+            
+            influence_text = f"**{planet} in {sign}{retro_text}** → {trait.get('trend', 'Neutral')} sentiment"
+            
+            if retrograde == "Yes":
+                if planet == "Mercury":
+                    influence_text += " → Communication delays, tech volatility, review financial decisions"
+                elif planet == "Jupiter": 
+                    influence_text += " → Banking sector caution, review expansion plans"
+                elif planet == "Mars":
+                    influence_text += " → Energy sector consolidation, delayed projects"
+            
+            # Stations mark trend reversals in the planet's sectors
+            if pos["Station"]:
+                influence_text += f" → {planet} {pos['Station']}, expect reversals in its sectors"
+            
+            # Add sector focus
+            sectors = trait.get('sectors', '')
+            if sectors:
+                influence_text += f" | **Sectors**: {sectors}"
+            
+            key_influences.append(influence_text)
+            
+            # Nakshatra-specific influence
+            if pos["Market_Influence"] and pos["Market_Influence"] != "No specific influence":
+                sector_focus.append(f"{planet} in {nakshatra}: {pos['Market_Influence']}")
+    
+    # Critical aspects analysis
+    critical_aspects = []
+    for _, aspect in aspects_df.iterrows():
+        if aspect["Strength"] == "Strong" and aspect["Weight"] > 2.0:
+            effect_text = f"**{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']}** → {aspect['Market_Effect']}"
+            
+            if aspect["Combo_Effect"]:
+                effect_text += f" | {aspect['Combo_Effect']}"
+            
+            critical_aspects.append(effect_text)
+    
+    return {
+        "key_influences": key_influences,
+        "sector_focus": sector_focus,
+        "critical_aspects": critical_aspects
+    }
+
+def detect_planetary_transits(current_positions, previous_positions=None):
+    """Detect detailed planetary transits with market impact"""
+    if previous_positions is None or previous_positions.empty:
+        return []
+    
+    transits = []
+    # Rows as dicts, previous ones looked up by planet (the first row of each)
+    previous_rows = {}
+    for row in previous_positions.to_dict("records"):
+        previous_rows.setdefault(row["Planet"], row)
+    for current_row in current_positions.to_dict("records"):
+        planet = current_row["Planet"]
+        prev_row = previous_rows.get(planet)
+        
+        if prev_row is not None:
+            
+            # Sign change (major transit)
+            if current_row["Sign"] != prev_row["Sign"]:
+                old_trait = zodiac_market_traits.get(prev_row["Sign"], {})
+                new_trait = zodiac_market_traits.get(current_row["Sign"], {})
+                impact = f"Market shift: {old_trait.get('trend', 'Neutral')} → {new_trait.get('trend', 'Neutral')}"
+                transits.append({
+                    "type": "Sign Change",
+                    "planet": planet,
+                    "change": f"{prev_row['Sign']} → {current_row['Sign']}",
+                    "impact": impact,
+                    "sectors": new_trait.get('sectors', 'General'),
+                    "strength": "High"
+                })
+            
+            # Nakshatra change (moderate transit)
+            elif current_row["Nakshatra"] != prev_row["Nakshatra"]:
+                transits.append({
+                    "type": "Nakshatra Change", 
+                    "planet": planet,
+                    "change": f"{prev_row['Nakshatra']} → {current_row['Nakshatra']}",
+                    "impact": current_row["Market_Influence"],
+                    "sectors": "Sector-specific",
+                    "strength": "Medium"
+                })
+            
+            # Navamsa change (the D9 sign turns over every 3°20')
+            elif "Navamsa" in current_row and current_row["Navamsa"] != prev_row["Navamsa"]:
+                transits.append({
+                    "type": "Navamsa Change",
+                    "planet": planet,
+                    "change": f"D9 {prev_row['Navamsa']} → {current_row['Navamsa']}",
+                    "impact": f"Navamsa tone: {zodiac_market_traits.get(current_row['Navamsa'], {}).get('trend', 'Neutral')}",
+                    "sectors": zodiac_market_traits.get(current_row["Navamsa"], {}).get("sectors", "General"),
+                    "strength": "Medium"
+                })
+            
+            # Significant degree movement
+            else:
+                deg_diff = abs(current_row["Full_Degree"] - prev_row["Full_Degree"])
+                if deg_diff > 0.5:  # More than 30 minutes of movement
+                    transits.append({
+                        "type": "Degree Movement",
+                        "planet": planet, 
+                        "change": f"{deg_diff:.1f}° movement",
+                        "impact": "Gradual influence change",
+                        "sectors": "Intraday impact",
+                        "strength": "Low"
+                    })
+    
+    return transits
+
+def transit_direction(transit):
+    """+1 if a transit adds to the bullish score, -1 if to the bearish score, else 0"""
+    if transit["strength"] != "High":
+        return 0
+    if "Bullish" in transit["impact"] or "growth" in transit["impact"].lower():
+        return 1
+    if "Bearish" in transit["impact"] or "caution" in transit["impact"].lower():
+        return -1
+    return 0
+
+def calculate_enhanced_trading_signal(aspects_df, session_info, transits=None):
+    """Calculate enhanced trading signal with comprehensive analysis"""
+    if aspects_df.empty:
+        return "Neutral", "gray", 0, 0, "No planetary aspects active", []
+    
+    # Base score calculation with aspect strength
+    bullish_score = 0
+    bearish_score = 0
+    signal_reasons = []
+    
+    for _, aspect in aspects_df.iterrows():
+        weight = aspect["Weight"]
+        strength_multiplier = 1.5 if aspect["Strength"] == "Strong" else 1.0
+        
+        if aspect["Tendency"] == "Bullish":
+            bullish_score += weight * strength_multiplier
+        elif aspect["Tendency"] == "Bearish":
+            bearish_score += weight * strength_multiplier
+        
+        # Strong applying aspects are still building toward exact
+        name = f"{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']}"
+        if aspect["Phase"] == "Applying" and aspect["Strength"] == "Strong":
+            bonus = weight * phase_bonuses["applying"]
+            if aspect["Tendency"] == "Bullish":
+                bullish_score += bonus
+                signal_reasons.append(f"{name} applying, exact in {aspect['Hours_To_Exact']:.1f}h (+{bonus:.1f})")
+            elif aspect["Tendency"] == "Bearish":
+                bearish_score += bonus
+                signal_reasons.append(f"{name} applying, exact in {aspect['Hours_To_Exact']:.1f}h (-{bonus:.1f})")
+        
+        # Moderate separating aspects are fading out of orb
+        elif aspect["Phase"] == "Separating" and aspect["Strength"] != "Strong":
+            bonus = weight * phase_bonuses["separating"]
+            if aspect["Tendency"] == "Bullish":
+                bearish_score += bonus  # Fading bullish aspect = bearish
+                signal_reasons.append(f"{name} separating (-{bonus:.1f})")
+            elif aspect["Tendency"] == "Bearish":
+                bullish_score += bonus  # Fading bearish aspect = bullish
+                signal_reasons.append(f"{name} separating (+{bonus:.1f})")
+    
+    # Transit impact
+    if transits:
+        for transit in transits:
+            direction = transit_direction(transit)
+            if direction > 0:
+                bullish_score += 1.0
+                signal_reasons.append(f"{transit['planet']} {transit['change']} (+1.0)")
+            elif direction < 0:
+                bearish_score += 1.0
+                signal_reasons.append(f"{transit['planet']} {transit['change']} (-1.0)")
+    
+    # Session-based adjustments
+    session = session_info["session"]
+    if session == "Opening":
+        bullish_score *= 1.2
+        bearish_score *= 1.2
+        signal_reasons.append("Opening volatility amplification")
+    elif session == "Closing":
+        bullish_score *= 0.9
+        bearish_score *= 0.9
+        signal_reasons.append("Closing moderation effect")
+    
+    # Calculate net score and determine signal
+    net_score = bullish_score - bearish_score
+    total_score = bullish_score + bearish_score
+    
+    if total_score == 0:
+        signal = "Neutral"
+        color = "gray"
+    else:
+        signal_ratio = abs(net_score) / total_score
+        
+        if signal_ratio > signal_thresholds["strong"]:  # Strong signal threshold
+            if net_score > 0:
+                signal = "Strong Buy"
+                color = "darkgreen"
+            else:
+                signal = "Strong Sell" 
+                color = "darkred"
+        elif signal_ratio > signal_thresholds["moderate"]:  # Moderate signal
+            if net_score > 0:
+                signal = "Buy"
+                color = "lightgreen" 
+            else:
+                signal = "Sell"
+                color = "lightcoral"
+        else:
+            signal = "Neutral"
+            color = "gray"
+    
+    # Generate detailed signal explanation
+    signal_details = f"Score: {bullish_score:.1f}B - {bearish_score:.1f}B = {net_score:.1f}"
+    
+    return signal, color, round(bullish_score, 2), round(bearish_score, 2), signal_details, signal_reasons
+
+def _clock_text(clock):
+    """9:15 AM style time of day"""
+    return clock.strftime("%I:%M %p").lstrip("0")
+
+
+def _clock_range(start, end):
+    """9:15-11:30 AM style span, naming AM/PM once when both ends share it"""
+    if start.strftime("%p") == end.strftime("%p"):
+        return f"{_clock_text(start)[:-3]}-{_clock_text(end)}"
+    return f"{_clock_text(start)}-{_clock_text(end)}"
+
+
+def generate_daily_report(date, positions_df, timeline_df, symbols=("NIFTY", "BANKNIFTY"), exchange="NSE"):
+    """Generate comprehensive daily report like DeepSeek
+
+    Times are shown in the exchange's local time; timeline_df is labelled
+    in it too, as compute_report_timeline returns it.
+    """
+    date_str = date.strftime("%d-%b-%Y").upper()
+    opening, closing = market_hours(exchange)
+    zone = timezone_name(date, exchange)
+    
+    # Header
+    report = f"""
+## 📈📉 {" & ".join(symbols or ("NIFTY", "BANKNIFTY"))} ASTRO TREND REPORT | {date_str}
+**(Market Hours: {_clock_text(opening)} - {_clock_text(closing)} {zone})**
+
+### 🌕 KEY PLANETARY INFLUENCES"""
+    
+    # Add key planetary influences
+    for _, pos in positions_df.iterrows():
+        if pos["Planet"] in ["Sun", "Moon", "Mercury", "Jupiter", "Mars", "Saturn"]:
+            sign = pos["Sign"]
+            retro = " (Retrograde)" if pos["Retrograde"] == "Yes" else ""
+            trait = zodiac_market_traits.get(sign, {})
+            
+            report += f"\n- **{pos['Planet']} in {sign}{retro}** → {trait.get('trend', 'Neutral')} sentiment"
+            
+            if pos["Retrograde"] == "Yes":
+                if pos["Planet"] == "Mercury":
+                    report += " → Volatility in banking/financials, communication delays"
+                elif pos["Planet"] == "Jupiter":
+                    report += " → Banking sector review, cautious expansion"
+                elif pos["Planet"] == "Saturn":
+                    report += " → Infrastructure delays, regulatory reviews"
+                elif pos["Planet"] == "Mars":
+                    report += " → Energy sector consolidation, delayed projects"
+            
+            if pos["Station"]:
+                report += f" → {pos['Station']} (trend reversal window)"
+            
+            # Add sector focus
+            sectors = trait.get('sectors', '')
+            if sectors:
+                report += f" | Focus: {sectors}"
+    
+    # Retrograde stations around the report date
+    day_start = datetime.combine(date, datetime.min.time())
+    nearby_stations = stations_between(day_start - timedelta(days=15), day_start + timedelta(days=15))
+    if not nearby_stations.empty:
+        report += "\n\n### 🔄 RETROGRADE STATIONS (±15 DAYS)"
+        for _, station in nearby_stations.iterrows():
+            station_time = to_local(pd.Timestamp(station["DateTime"]).to_pydatetime(), exchange)
+            report += f"\n- **{station['Planet']}** {station['Station']} → {station_time.strftime('%d-%b-%Y %H:%M')} {timezone_name(station_time.date(), exchange)}"
+    
+    # Sunrise-based timings over market hours, computed in engine time and shown in local time
+    market_open = to_engine(datetime.combine(date, opening), exchange)
+    market_close = to_engine(datetime.combine(date, closing), exchange)
+
+    def local_clock(moment):
+        return to_local(moment, exchange).strftime("%H:%M")
+
+    timings = market_timings(date, market_open, market_close, exchange)
+    rahu_start, rahu_end = timings["rahu_kaal"]
+    report += f"\n\n### 🕉️ MUHURTA TIMINGS ({EXCHANGE_LOCATIONS[exchange]['city'].upper()})"
+    report += f"\n- **Sunrise** {local_clock(timings['sunrise'])} | **Sunset** {local_clock(timings['sunset'])}"
+    report += f"\n- **Rahu Kaal**: {local_clock(rahu_start)}-{local_clock(rahu_end)} → avoid fresh entries"
+    favourable = timings["choghadiyas"][timings["choghadiyas"]["Nature"] == "Good"]
+    if not favourable.empty:
+        windows = [f"{row.Choghadiya} {local_clock(row.Start)}-{local_clock(row.End)}" for row in favourable.itertuples()]
+        report += f"\n- **Favourable Choghadiya**: {', '.join(windows)}"
+    horas = [f"{local_clock(row.Start)} {row.Hora}" for row in timings["horas"].itertuples()]
+    report += f"\n- **Market Horas**: {' → '.join(horas)}"
+    
+    # Panchang at the open and any element changing during market hours
+    panchang = panchang_at([market_open]).iloc[0]
+    report += "\n\n### 🌙 PANCHANG AT THE OPEN"
+    report += f"\n- **Tithi**: {panchang['Tithi']} | **Nakshatra**: {panchang['Nakshatra']} | **Yoga**: {panchang['Yoga']} | **Karana**: {panchang['Karana']}"
+    for change in panchang_changes(market_open, market_close).itertuples():
+        report += f"\n- ⚡ **{change.Element} changes** {change.From} → {change.To} at {local_clock(change.DateTime)} {zone}"
+    
+    # Session analysis
+    report += "\n\n### ⏰ INTRADAY TREND TIMELINE"
+    
+    # Group timeline by sessions with enhanced analysis
+    session_data = {
+        "morning": [],
+        "mid": [],
+        "afternoon": []
+    }
+    
+    local_times = pd.to_datetime(timeline_df["DateTime"])
+    row_timings = timing_columns(to_engine(local_times, exchange), exchange).reset_index(drop=True)
+    row_sessions = session_codes(local_times, exchange)
+    for (_, row), (_, timing), session in zip(timeline_df.iterrows(), row_timings.iterrows(), row_sessions):
+        time_str = row["DateTime"].split(" ")[1]
+        
+        signal_emoji = "🚀" if row["Signal"] == "Strong Buy" else "📈" if "Buy" in row["Signal"] else "💥" if row["Signal"] == "Strong Sell" else "📉" if "Sell" in row["Signal"] else "➡️"
+        rahu_note = ", Rahu Kaal" if timing["Rahu_Kaal"] else ""
+        time_signal = f"{time_str} → {signal_emoji} {row['Signal']} ({timing['Hora']} Hora, {timing['Choghadiya']}{rahu_note})"
+        
+        # Pre-Market to Morning, Mid-Session, then Afternoon to the close
+        if session <= 2:
+            session_data["morning"].append(time_signal)
+        elif session == 3:
+            session_data["mid"].append(time_signal)
+        else:
+            session_data["afternoon"].append(time_signal)
+    spans = session_spans(exchange)
+    
+    # Morning Session
+    if session_data["morning"]:
+        report += f"\n\n**🌅 Morning Session ({_clock_range(opening, spans['Morning'][1])})**"
+        morning_signals = [s.split(" → ")[1] for s in session_data["morning"]]
+        buy_count = sum(1 for s in morning_signals if "Buy" in s)
+        sell_count = sum(1 for s in morning_signals if "Sell" in s)
+        
+        if buy_count > sell_count:
+            report += "\n- 📈 **Bullish Bias** - Early strength expected, buy on dips"
+        elif sell_count > buy_count:
+            report += "\n- 📉 **Bearish Pressure** - Early weakness likely, avoid longs"
+        else:
+            report += "\n- ➡️ **Sideways Movement** - Range-bound trading expected"
+        
+        for signal in session_data["morning"][:2]:
+            report += f"\n  - {signal}"
+    
+    # Mid Session
+    if session_data["mid"]:
+        report += f"\n\n**🌇 Mid-Session ({_clock_range(*spans['Mid-Session'])})**"
+        mid_signals = [s.split(" → ")[1] for s in session_data["mid"]]
+        buy_count = sum(1 for s in mid_signals if "Buy" in s)
+        sell_count = sum(1 for s in mid_signals if "Sell" in s)
+        
+        if buy_count > sell_count:
+            report += "\n- 📈 **Institutional Buying** - Strong momentum continuation"
+        elif sell_count > buy_count:
+            report += "\n- 📉 **Profit Booking** - Correction phase, institutional selling"
+        else:
+            report += "\n- ➡️ **Consolidation** - Institutional activity balanced"
+        
+        for signal in session_data["mid"][:2]:
+            report += f"\n  - {signal}"
+    
+    # Afternoon Session  
+    if session_data["afternoon"]:
+        report += f"\n\n**🌆 Afternoon Session ({_clock_range(spans['Afternoon'][0], closing)})**"
+        afternoon_signals = [s.split(" → ")[1] for s in session_data["afternoon"]]
+        buy_count = sum(1 for s in afternoon_signals if "Buy" in s)
+        sell_count = sum(1 for s in afternoon_signals if "Sell" in s)
+        
+        if buy_count > sell_count:
+            report += "\n- 📈 **Recovery Mode** - Late session bounce, positive close likely"
+        elif sell_count > buy_count:
+            report += "\n- 📉 **Weakness Continues** - Selling pressure persists"
+        else:
+            report += "\n- ➡️ **Settlement Phase** - Balanced closing expected"
+        
+        for signal in session_data["afternoon"][:2]:
+            report += f"\n  - {signal}"
+    
+    # Overall analysis
+    total_buy_signals = len([row for _, row in timeline_df.iterrows() if "Buy" in row["Signal"]])
+    total_sell_signals = len([row for _, row in timeline_df.iterrows() if "Sell" in row["Signal"]])
+    strong_buy_signals = len([row for _, row in timeline_df.iterrows() if row["Signal"] == "Strong Buy"])
+    strong_sell_signals = len([row for _, row in timeline_df.iterrows() if row["Signal"] == "Strong Sell"])
+    
+    # Critical timing analysis
+    max_activity_times = timeline_df.nlargest(3, "Active_Aspects")["DateTime"].str.split(" ").str[1].tolist()
+    
+    # Final outlook
+    if strong_buy_signals > strong_sell_signals and total_buy_signals > total_sell_signals:
+        overall_outlook = "🟢 **Strong Bullish** (High probability gains)"
+        strategy = "**Buy on dips, hold positions, target higher levels**"
+    elif total_buy_signals > total_sell_signals:
+        overall_outlook = "🟢 **Bullish** (Favorable for long positions)"
+        strategy = "**Selective buying, book partial profits at resistance**"
+    elif strong_sell_signals > strong_buy_signals and total_sell_signals > total_buy_signals:
+        overall_outlook = "🔴 **Strong Bearish** (High caution advised)"
+        strategy = "**Avoid longs, consider shorts, strict stop losses**"
+    elif total_sell_signals > total_buy_signals:
+        overall_outlook = "🔴 **Bearish** (Selling pressure likely)"
+        strategy = "**Book profits, reduce positions, wait for reversal**"
+    else:
+        overall_outlook = "🟡 **Neutral** (Range-bound movement)"
+        strategy = "**Range trading, buy support, sell resistance**"
+    
+    report += f"""
+
+### 🎯 FINAL OUTLOOK
+- **Overall Trend**: {overall_outlook}
+- **Key Strategy**: {strategy}
+- **Critical Times**: {", ".join(max_activity_times[:2])} (High activity periods)
+- **Risk Level**: {"High" if strong_sell_signals > 2 else "Medium" if total_sell_signals > total_buy_signals else "Low"}
+
+### 📊 Signal Summary
+- 🚀 Strong Buy: {strong_buy_signals} | 📈 Buy: {total_buy_signals - strong_buy_signals} | 📉 Sell: {total_sell_signals - strong_sell_signals} | 💥 Strong Sell: {strong_sell_signals}
+"""
+    
+    return report
+
+def get_trading_advice(signal, session):
+    """Generate specific trading advice based on signal and session"""
+    advice_map = {
+        ("Strong Buy", "Opening"): "Aggressive long entry on gap down, expect strong rally",
+        ("Strong Buy", "Morning"): "Build long positions, momentum likely to continue",
+        ("Strong Buy", "Mid-Session"): "Institutional buying, add to longs on dips",
+        ("Strong Buy", "Afternoon"): "Late rally expected, short covering likely",
+        ("Strong Buy", "Closing"): "Positive close expected, hold overnight longs",
+        
+        ("Buy", "Opening"): "Selective long entry, watch for confirmation",
+        ("Buy", "Morning"): "Moderate buying opportunity, use stops",
+        ("Buy", "Mid-Session"): "Gradual accumulation, dollar-cost average",
+        ("Buy", "Afternoon"): "Recovery possible, light long positions",
+        ("Buy", "Closing"): "Mild positive bias, conservative approach",
+        
+        ("Strong Sell", "Opening"): "Aggressive short entry on gap up, expect sharp fall",
+        ("Strong Sell", "Morning"): "Build short positions, weakness to continue",
+        ("Strong Sell", "Mid-Session"): "Heavy institutional selling, avoid longs",
+        ("Strong Sell", "Afternoon"): "Exit all longs, sharp correction possible",
+        ("Strong Sell", "Closing"): "Negative close likely, exit before close",
+        
+        ("Sell", "Opening"): "Book profits, avoid fresh longs",
+        ("Sell", "Morning"): "Selling pressure building, lighten positions",
+        ("Sell", "Mid-Session"): "Profit booking phase, be defensive",
+        ("Sell", "Afternoon"): "Weakness emerging, book some profits",
+        ("Sell", "Closing"): "End day flat, avoid overnight risk",
+        
+        ("Neutral", "Opening"): "Wait for direction, no rush to trade",
+        ("Neutral", "Morning"): "Range-bound trading, buy support sell resistance",
+        ("Neutral", "Mid-Session"): "Consolidation phase, scalping opportunities",
+        ("Neutral", "Afternoon"): "Sideways movement, theta decay for options",
+        ("Neutral", "Closing"): "Flat close expected, square off positions"
+    }
+    
+    return advice_map.get((signal, session), "Monitor price action closely")
+
+def engine_parameters():
+    """Every tunable that affects computed timelines and reports"""
+    return {
+        "engine_version": ENGINE_VERSION,
+        "aspect_rules": aspect_rules().source,
+        "outlook_thresholds": outlook_thresholds,
+        "signal_thresholds": signal_thresholds,
+        "phase_bonuses": phase_bonuses,
+        "planetary_speeds": PLANETARY_SPEEDS,
+        "retrograde_speeds": RETROGRADE_SPEEDS,
+        "base_positions": {planet: info["longitude"] for planet, info in next(iter(BASE_PLANETARY_DATA.values())).items()}
+    }
@@ -0,0 +1,123 @@
+"""Divisional charts (D2-D60) computed over whole arrays of longitudes
+
+Each chart splits every sign into equal parts (D30 uses the classical
+unequal Trimsamsa parts) and maps each part to a sign. The mapping is
+compiled once per chart into a (sign, part) lookup table, so placing any
+number of bodies at any number of timestamps is a few array operations.
+Feed it longitudes from planet_longitudes(times).
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+DIVISIONAL_CHARTS = {
+    1: "Rasi", 2: "Hora", 3: "Drekkana", 4: "Chaturthamsa", 7: "Saptamsa", 9: "Navamsa",
+    10: "Dasamsa", 12: "Dwadasamsa", 16: "Shodasamsa", 20: "Vimsamsa", 24: "Chaturvimsamsa",
+    27: "Bhamsa", 30: "Trimsamsa", 40: "Khavedamsa", 45: "Akshavedamsa", 60: "Shashtiamsa"
+}
+
+# Trimsamsa part boundaries (degrees into the sign) and their signs, for odd and even signs
+TRIMSAMSA_EDGES = {True: [5, 10, 18, 25], False: [5, 12, 20, 25]}
+TRIMSAMSA_SIGNS = {True: [0, 10, 8, 2, 6], False: [1, 5, 11, 9, 7]}
+
+
+def _first_part_sign(division, sign):
+    """Sign of the first part of a sign in an equal-part chart, and the step between parts"""
+    odd = sign % 2 == 0
+    modality = sign % 3  # 0 movable, 1 fixed, 2 dual
+    element = sign % 4   # 0 fire, 1 earth, 2 air, 3 water
+    rules = {
+        1: (sign, 1),
+        2: (4 if odd else 3, -1 if odd else 1),
+        3: (sign, 4),
+        4: (sign, 3),
+        7: (sign if odd else sign + 6, 1),
+        9: (sign + (0, 8, 4)[modality], 1),
+        10: (sign if odd else sign + 8, 1),
+        12: (sign, 1),
+        16: ((0, 4, 8)[modality], 1),
+        20: ((0, 8, 4)[modality], 1),
+        24: (4 if odd else 3, 1),
+        27: ((0, 3, 6, 9)[element], 1),
+        40: (0 if odd else 6, 1),
+        45: ((0, 4, 8)[modality], 1),
+        60: (sign, 1)
+    }
+    return rules[division]
+
+
+@functools.lru_cache(maxsize=None)
+def division_table(division):
+    """(12, parts) array: the sign of each part of each sign in a divisional chart"""
+    if division not in DIVISIONAL_CHARTS:
+        raise ValueError(f"Unsupported divisional chart D{division}; expected one of {sorted(DIVISIONAL_CHARTS)}")
+    if division == 30:
+        return np.array([TRIMSAMSA_SIGNS[sign % 2 == 0] for sign in range(12)])
+    table = np.empty((12, division), dtype=int)
+    for sign in range(12):
+        first, step = _first_part_sign(division, sign)
+        table[sign] = (first + step * np.arange(division)) % 12
+    return table
+
+
+def divisional_signs(longitudes, division):
+    """Sign index (0 = Aries) of each longitude in a divisional chart; any array shape"""
+    longitudes = np.mod(np.asarray(longitudes, dtype=float), 360)
+    sign = np.minimum((longitudes // 30).astype(int), 11)
+    within = longitudes - sign * 30
+    if division == 30:
+        odd = sign % 2 == 0
+        part = np.where(
+            odd,
+            np.searchsorted(TRIMSAMSA_EDGES[True], within, side="right"),
+            np.searchsorted(TRIMSAMSA_EDGES[False], within, side="right")
+        )
+    else:
+        part = np.minimum((within * division // 30).astype(int), division - 1)
+    return division_table(division)[sign, part]
+
+
+def divisional_sign_names(longitudes, division):
+    """Sign names instead of indices, as divisional_signs"""
+    return np.array(SIGNS, dtype=object)[divisional_signs(longitudes, division)]
+
+
+def divisional_chart(longitudes, divisions=(9,)):
+    """Long-format placements of every body at every timestamp
+
+    longitudes is a DataFrame indexed by time with one column per body.
+    Returns DateTime, Planet, Longitude and one sign column per chart.
+    """
+    values = longitudes.to_numpy(dtype=float)
+    chart = pd.DataFrame({
+        "DateTime": np.repeat(longitudes.index.to_numpy(), longitudes.shape[1]),
+        "Planet": np.tile(longitudes.columns.to_numpy(), len(longitudes)),
+        "Longitude": values.ravel()
+    })
+    for division in divisions:
+        chart[f"D{division}"] = divisional_sign_names(values.ravel(), division)
+    return chart
+
+
+def divisional_ingresses(longitudes, division=9):
+    """Every change of divisional sign between consecutive timestamps
+
+    The ingress is stamped at the first timestamp showing the new sign, so
+    the calendar is as fine as the sampling of longitudes.
+    """
+    signs = divisional_signs(longitudes.to_numpy(dtype=float), division)
+    changed = np.nonzero(signs[1:] != signs[:-1])
+    rows, columns = changed[0] + 1, changed[1]
+    ingresses = pd.DataFrame({
+        "DateTime": longitudes.index.to_numpy()[rows],
+        "Planet": longitudes.columns.to_numpy()[columns],
+        "Chart": f"D{division} {DIVISIONAL_CHARTS[division]}",
+        "From": np.array(SIGNS, dtype=object)[signs[rows - 1, columns]],
+        "To": np.array(SIGNS, dtype=object)[signs[rows, columns]]
+    })
+    return ingresses.sort_values(["DateTime", "Planet"], kind="stable", ignore_index=True)
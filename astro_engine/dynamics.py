@@ -0,0 +1,39 @@
+"""Applying and separating aspects from relative angular velocities
+
+An aspect is applying while the separation of its pair moves toward the
+exact angle and separating once it moves away. Both follow from positions
+and speeds at a single instant, so no previous sample is needed, and every
+function broadcasts over leading (time) axes.
+"""
+
+import numpy as np
+
+PHASES = ["Applying", "Separating", "Static"]
+
+
+def separation_rate(degree1, degree2, speed1, speed2):
+    """Rate of change (degrees/day) of the folded 0-180° separation between two bodies"""
+    signed = np.mod(np.asarray(degree2, dtype=float) - degree1 + 180, 360) - 180
+    return np.sign(signed) * (np.asarray(speed2, dtype=float) - speed1)
+
+
+def pair_separations(longitudes, speeds, first, second):
+    """Folded separation of every (first, second) body pair and its rate of change
+
+    longitudes and speeds are (..., bodies); results are (..., pairs).
+    """
+    longitudes, speeds = np.asarray(longitudes, dtype=float), np.asarray(speeds, dtype=float)
+    separation = np.abs(longitudes[..., second] - longitudes[..., first])
+    separation = np.where(separation > 180, 360 - separation, separation)
+    rate = separation_rate(longitudes[..., first], longitudes[..., second], speeds[..., first], speeds[..., second])
+    return separation, rate
+
+
+def exact_phase(separation, rate, angle):
+    """Phase index into PHASES and signed days to exact (negative: days since exact)"""
+    offset = np.asarray(separation, dtype=float) - angle
+    rate = np.asarray(rate, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(rate != 0, -offset / rate, np.nan)
+    phase = np.where(rate == 0, 2, np.where(offset * rate < 0, 0, 1))
+    return phase, days
@@ -0,0 +1,134 @@
+"""Exchange session tables and the conversion between engine time and exchange-local time
+
+The engine works on naive IST timestamps, a fixed offset from UT, so a
+position or aspect computed for one instant serves every exchange.
+Exchange-local times (with daylight saving where the exchange has it) only
+come in when a session is laid out or a result is labelled.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+ENGINE_TIMEZONE = "Asia/Kolkata"
+
+# Session boundaries in exchange-local time. Every exchange has the same
+# six sessions as the NSE table (core.market_sessions); Closing runs up to
+# and including the close, and anything outside is After-Hours.
+SESSION_NAMES = ["Pre-Market", "Opening", "Morning", "Mid-Session", "Afternoon", "Closing", "After-Hours"]
+EXCHANGES = {
+    "NSE": {
+        "timezone": "Asia/Kolkata", "close": "15:30", "indices": ["NIFTY", "BANKNIFTY", "FINNIFTY"],
+        "sessions": {"Pre-Market": "09:00", "Opening": "09:15", "Morning": "10:00", "Mid-Session": "11:30",
+                     "Afternoon": "13:30", "Closing": "15:00"}
+    },
+    "BSE": {
+        "timezone": "Asia/Kolkata", "close": "15:30", "indices": ["SENSEX"],
+        "sessions": {"Pre-Market": "09:00", "Opening": "09:15", "Morning": "10:00", "Mid-Session": "11:30",
+                     "Afternoon": "13:30", "Closing": "15:00"}
+    },
+    "NYSE": {
+        "timezone": "America/New_York", "close": "16:00", "indices": ["DJIA", "S&P 500"],
+        "sessions": {"Pre-Market": "09:00", "Opening": "09:30", "Morning": "10:15", "Mid-Session": "11:45",
+                     "Afternoon": "13:45", "Closing": "15:30"}
+    },
+    "LSE": {
+        "timezone": "Europe/London", "close": "16:30", "indices": ["FTSE 100"],
+        "sessions": {"Pre-Market": "07:50", "Opening": "08:00", "Morning": "08:45", "Mid-Session": "11:00",
+                     "Afternoon": "13:30", "Closing": "16:00"}
+    }
+}
+
+
+def exchange_info(exchange):
+    """Session table entry of an exchange"""
+    if exchange not in EXCHANGES:
+        raise ValueError(f"Unknown exchange {exchange!r}; expected one of {sorted(EXCHANGES)}")
+    return EXCHANGES[exchange]
+
+
+def index_exchange(symbol):
+    """Exchange an index is traded on"""
+    for exchange, info in EXCHANGES.items():
+        if symbol in info["indices"]:
+            return exchange
+    raise ValueError(f"Unknown index {symbol!r}")
+
+
+def group_by_exchange(symbols):
+    """{exchange: its indices among symbols}, exchanges in EXCHANGES order"""
+    grouped = {}
+    for symbol in symbols:
+        grouped.setdefault(index_exchange(symbol), []).append(symbol)
+    return {exchange: grouped[exchange] for exchange in EXCHANGES if exchange in grouped}
+
+
+def _clock(text):
+    return datetime.strptime(text, "%H:%M").time()
+
+
+def _minutes(clock):
+    return clock.hour * 60 + clock.minute
+
+
+def market_hours(exchange):
+    """Local opening and closing time of an exchange"""
+    info = exchange_info(exchange)
+    return _clock(info["sessions"]["Opening"]), _clock(info["close"])
+
+
+def engine_now():
+    """Current time as a naive engine (IST) timestamp, whatever the server's own time zone"""
+    return datetime.now(ZoneInfo(ENGINE_TIMEZONE)).replace(tzinfo=None)
+
+
+def to_local(times, exchange):
+    """Naive engine times (scalar or array) as naive exchange-local times"""
+    timezone = exchange_info(exchange)["timezone"]
+    if isinstance(times, datetime):
+        return times.replace(tzinfo=ZoneInfo(ENGINE_TIMEZONE)).astimezone(ZoneInfo(timezone)).replace(tzinfo=None)
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    return times.tz_localize(ENGINE_TIMEZONE).tz_convert(timezone).tz_localize(None)
+
+
+def to_engine(times, exchange):
+    """Naive exchange-local times (scalar or array) as naive engine times"""
+    timezone = exchange_info(exchange)["timezone"]
+    if isinstance(times, datetime):
+        return times.replace(tzinfo=ZoneInfo(timezone)).astimezone(ZoneInfo(ENGINE_TIMEZONE)).replace(tzinfo=None)
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    return times.tz_localize(timezone).tz_convert(ENGINE_TIMEZONE).tz_localize(None)
+
+
+def timezone_name(day, exchange):
+    """Abbreviation of the exchange's time zone on a day (IST, EDT, GMT, ...)"""
+    opening, _ = market_hours(exchange)
+    return datetime.combine(day, opening, ZoneInfo(exchange_info(exchange)["timezone"])).tzname()
+
+
+def session_times(day, exchange, interval_minutes, start_time=None, end_time=None):
+    """Engine times of every sample of an exchange's session on its local date day, both ends included"""
+    opening, closing = market_hours(exchange)
+    local = pd.date_range(datetime.combine(day, start_time or opening), datetime.combine(day, end_time or closing),
+                          freq=f"{interval_minutes}min")
+    return to_engine(local, exchange)
+
+
+def session_codes(local_times, exchange):
+    """Index into SESSION_NAMES of the session each exchange-local time falls in"""
+    info = exchange_info(exchange)
+    edges = np.array([_minutes(_clock(info["sessions"][name])) for name in SESSION_NAMES[:-1]])
+    close = _minutes(_clock(info["close"]))
+    local_times = pd.DatetimeIndex(local_times)
+    minutes = (local_times.hour * 60 + local_times.minute + local_times.second / 60).to_numpy()
+    codes = np.searchsorted(edges, minutes, side="right") - 1
+    return np.where((codes < 0) | (minutes > close), len(SESSION_NAMES) - 1, codes)
+
+
+def session_spans(exchange):
+    """Local (start, end) of each session from Opening to Closing"""
+    info = exchange_info(exchange)
+    starts = [_clock(info["sessions"][name]) for name in SESSION_NAMES[1:-1]]
+    return dict(zip(SESSION_NAMES[1:-1], zip(starts, starts[1:] + [_clock(info["close"])])))
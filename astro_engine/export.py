@@ -0,0 +1,233 @@
+"""Streaming, chunked export of timelines, aspects and reports
+
+Rows are produced one trading day at a time and written in fixed-size
+chunks, so memory stays flat however long the date range is. Run headless
+with ``python -m astro_engine.export --help``.
+"""
+
+import argparse
+import collections
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+from .aspect_tracker import AspectTracker
+from .core import ENGINE_VERSION, aspect_rules, calculate_planetary_positions
+from .exchanges import EXCHANGES, exchange_info, index_exchange, session_times, to_local
+from .jobs import process_pool
+from .timeline import (
+    DEFAULT_REPORT_SYMBOLS,
+    compute_daily_report,
+    compute_exchange_aspects,
+    explain_timeline_rows,
+    score_timeline
+)
+from .trading_calendar import trading_days
+
+EXPORT_KINDS = ["timeline", "aspects", "reports"]
+EXPORT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def day_timeline_rows(day, start_time, end_time, interval_minutes, min_aspect_weight=1.0, show_transits=True,
+                      exchange="NSE"):
+    """One day's intraday timeline of an exchange's session, in its local time, with a Date column
+
+    start_time and end_time are local to the exchange; None means its opening and close.
+    Aspect ids only mean something under the rules that produced them, so
+    rows also carry their explanations and the rules hash and engine version.
+    """
+    steps, aspects = compute_exchange_aspects(day, [exchange], interval_minutes,
+                                              start_time=start_time, end_time=end_time)[exchange]
+    timeline_df = score_timeline(steps, aspects, min_aspect_weight, show_transits)
+    if timeline_df.empty:
+        return timeline_df
+    timeline_df = timeline_df.join(
+        explain_timeline_rows(timeline_df, timeline_df.index, show_transits, exchange=exchange)
+    )
+    timeline_df["Rules_Hash"] = aspect_rules().fingerprint
+    timeline_df["Engine_Version"] = ENGINE_VERSION
+    timeline_df.insert(0, "Date", day.strftime("%Y-%m-%d"))
+    return timeline_df
+
+
+def day_aspect_rows(day, start_time, end_time, interval_minutes, min_aspect_weight=1.0, exchange="NSE"):
+    """Every active aspect at every interval of an exchange's session, in long format and local time"""
+    aspect_tracker = AspectTracker()
+    frames = []
+    for current_time in session_times(day, exchange, interval_minutes, start_time, end_time).to_pydatetime():
+        aspects_df, _ = aspect_tracker.get_aspects(calculate_planetary_positions(current_time), current_time)
+        if not aspects_df.empty:
+            aspects_df = aspects_df[aspects_df["Weight"] >= min_aspect_weight].copy()
+            aspects_df.insert(0, "DateTime", to_local(current_time, exchange).strftime("%Y-%m-%d %H:%M"))
+            frames.append(aspects_df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def day_report_rows(day, exchange="NSE"):
+    """The rendered daily report of one exchange's day as a single row
+
+    Covers the default report indices traded there, or else all of the exchange's indices.
+    """
+    symbols = [symbol for symbol in DEFAULT_REPORT_SYMBOLS if index_exchange(symbol) == exchange]
+    report = compute_daily_report(day, symbols=symbols or exchange_info(exchange)["indices"], exchange=exchange)
+    return pd.DataFrame([{"Date": day.strftime("%Y-%m-%d"), "Exchange": exchange, "Report": report}])
+
+
+def _day_rows(kind, day, start_time, end_time, interval_minutes, min_aspect_weight, exchange):
+    """Rows of one export kind for one day (module-level so workers can pickle it)"""
+    if kind == "timeline":
+        return day_timeline_rows(day, start_time, end_time, interval_minutes, min_aspect_weight, exchange=exchange)
+    if kind == "aspects":
+        return day_aspect_rows(day, start_time, end_time, interval_minutes, min_aspect_weight, exchange)
+    return day_report_rows(day, exchange)
+
+
+def iter_day_frames(kind, start_date, end_date, start_time=None, end_time=None,
+                    interval_minutes=15, min_aspect_weight=1.0, exchange="NSE", workers=1, progress=None):
+    """Per-day frames in date order; at most `workers` days are in flight at once
+
+    Days are the exchange's trading days and samples its session in local
+    time (start_time and end_time, by default its opening and close).
+    progress, if given, is called as each day's frame is handed over.
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind {kind!r}; expected one of {EXPORT_KINDS}")
+    days = trading_days(start_date, end_date, exchange)
+    args = [(kind, day, start_time, end_time, interval_minutes, min_aspect_weight, exchange) for day in days]
+
+    def handed_over(count):
+        if progress:
+            progress(count / len(days), f"📦 Exported {days[count - 1].strftime('%d %b %Y')} ({count}/{len(days)})")
+
+    if workers <= 1:
+        for count, day_args in enumerate(args, 1):
+            yield _day_rows(*day_args)
+            handed_over(count)
+        return
+
+    with process_pool(workers) as pool:
+        in_flight = collections.deque()
+        count = 0
+        for day_args in args:
+            in_flight.append(pool.submit(_day_rows, *day_args))
+            if len(in_flight) >= workers:
+                yield in_flight.popleft().result()
+                count += 1
+                handed_over(count)
+        while in_flight:
+            yield in_flight.popleft().result()
+            count += 1
+            handed_over(count)
+
+
+def rechunk(frames, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Regroup a stream of frames into frames of exactly chunk_rows (the last may be shorter)"""
+    pending = []
+    pending_rows = 0
+    for frame in frames:
+        if frame.empty:
+            continue
+        pending.append(frame)
+        pending_rows += len(frame)
+        while pending_rows >= chunk_rows:
+            merged = pd.concat(pending, ignore_index=True)
+            yield merged.iloc[:chunk_rows]
+            pending = [merged.iloc[chunk_rows:]]
+            pending_rows = len(pending[0])
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def _require_pyarrow():
+    """Import pyarrow, which Parquet and Arrow output need"""
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError("Parquet and Arrow export need pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def write_chunks(chunks, destination, fmt):
+    """Write DataFrame chunks to a path or binary file object; returns the row count"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+    rows = 0
+
+    if fmt == "csv":
+        sink = open(destination, "wb") if isinstance(destination, str) else destination
+        try:
+            for index, chunk in enumerate(chunks):
+                sink.write(chunk.to_csv(index=False, header=index == 0).encode("utf-8"))
+                rows += len(chunk)
+        finally:
+            if isinstance(destination, str):
+                sink.close()
+        return rows
+
+    pyarrow = _require_pyarrow()
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if fmt == "parquet":
+                    writer = pyarrow.parquet.ParquetWriter(destination, schema)
+                else:
+                    writer = pyarrow.ipc.new_file(destination, schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_range(kind, start_date, end_date, destination, fmt="csv", start_time=None, end_time=None,
+                 interval_minutes=15, min_aspect_weight=1.0, exchange="NSE", chunk_rows=DEFAULT_CHUNK_ROWS, workers=1,
+                 progress=None):
+    """Stream one export kind for a date range to destination; returns the row count"""
+    frames = iter_day_frames(kind, start_date, end_date, start_time, end_time,
+                             interval_minutes, min_aspect_weight, exchange, workers, progress)
+    return write_chunks(rechunk(frames, chunk_rows), destination, fmt)
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Export astro market timelines, aspects or reports")
+    parser.add_argument("--kind", choices=EXPORT_KINDS, default="timeline")
+    parser.add_argument("--start", required=True, type=lambda value: datetime.strptime(value, "%Y-%m-%d").date())
+    parser.add_argument("--end", required=True, type=lambda value: datetime.strptime(value, "%Y-%m-%d").date())
+    parser.add_argument("--interval", type=int, default=15, help="minutes between samples")
+    parser.add_argument("--min-aspect-weight", type=float, default=1.0)
+    parser.add_argument("--session-start", type=lambda value: datetime.strptime(value, "%H:%M").time(), default=None,
+                        help="local time on the exchange (default: its opening)")
+    parser.add_argument("--session-end", type=lambda value: datetime.strptime(value, "%H:%M").time(), default=None,
+                        help="local time on the exchange (default: its close)")
+    parser.add_argument("--exchange", choices=list(EXCHANGES), default="NSE")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        rows = export_range(
+            args.kind, args.start, args.end, args.output, args.format, args.session_start, args.session_end,
+            args.interval, args.min_aspect_weight, args.exchange, args.chunk_rows, args.workers
+        )
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"Export failed: {exc}", file=sys.stderr)
+        return 1
+    print(f"Exported {rows} {args.kind} rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Local sidereal time, ascendant and house cusps at an exchange location
+
+Everything here is vectorized over arrays of naive IST timestamps, so a
+multi-year index at one-minute resolution is a handful of numpy passes.
+Longitudes are tropical, like the planet positions of the engine. Mean
+sidereal time and mean obliquity are used; the ascendant agrees with the
+Swiss Ephemeris to within about a hundredth of a degree.
+"""
+
+import numpy as np
+import pandas as pd
+import swisseph as swe
+
+from .divisional import SIGNS
+from .stations import J2000_JD, from_julian_day, to_julian_day
+
+# Geographic coordinates of each exchange (degrees, north and east positive)
+EXCHANGE_LOCATIONS = {
+    "NSE": {"city": "Mumbai", "latitude": 19.0607, "longitude": 72.8633},
+    "BSE": {"city": "Mumbai", "latitude": 18.9292, "longitude": 72.8333},
+    "NYSE": {"city": "New York", "latitude": 40.7069, "longitude": -74.0113},
+    "LSE": {"city": "London", "latitude": 51.5149, "longitude": -0.0988},
+}
+
+HOUSE_SYSTEMS = ["Whole Sign", "Equal", "Porphyry", "Placidus"]
+
+# Mean sidereal time advances this many degrees per day of UT
+SIDEREAL_DEGREES_PER_DAY = 360.98564736629
+
+
+def exchange_location(exchange="NSE"):
+    """Latitude and longitude of an exchange"""
+    if exchange not in EXCHANGE_LOCATIONS:
+        raise ValueError(f"Unknown exchange {exchange!r}; expected one of {sorted(EXCHANGE_LOCATIONS)}")
+    location = EXCHANGE_LOCATIONS[exchange]
+    return location["latitude"], location["longitude"]
+
+
+def _sidereal_degrees(julian_days, longitude):
+    """Local mean sidereal time in degrees (the ARMC) at UT Julian days"""
+    days = np.asarray(julian_days, dtype=float) - J2000_JD
+    centuries = days / 36525
+    gmst = 280.46061837 + SIDEREAL_DEGREES_PER_DAY * days + 0.000387933 * centuries ** 2 - centuries ** 3 / 38710000
+    return np.mod(gmst + longitude, 360)
+
+
+def _obliquity(julian_days):
+    """Mean obliquity of the ecliptic in degrees"""
+    centuries = (np.asarray(julian_days, dtype=float) - J2000_JD) / 36525
+    return 23.439291 - 0.0130042 * centuries - 1.64e-7 * centuries ** 2 + 5.04e-7 * centuries ** 3
+
+
+def _ascendant(armc, latitude, obliquity):
+    """Ecliptic longitude rising on the eastern horizon"""
+    ramc, eps, lat = np.radians(armc), np.radians(obliquity), np.radians(latitude)
+    rising = np.arctan2(np.cos(ramc), -(np.sin(ramc) * np.cos(eps) + np.tan(lat) * np.sin(eps)))
+    return np.mod(np.degrees(rising), 360)
+
+
+def _midheaven(armc, obliquity):
+    """Ecliptic longitude culminating on the meridian"""
+    ramc, eps = np.radians(armc), np.radians(obliquity)
+    return np.mod(np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))), 360)
+
+
+def local_sidereal_time(times, exchange="NSE"):
+    """Local mean sidereal time in hours at the exchange for IST times"""
+    _, longitude = exchange_location(exchange)
+    return _sidereal_degrees(to_julian_day(times), longitude) / 15
+
+
+def ascendant(times, exchange="NSE"):
+    """Ascendant longitude at the exchange for IST times (scalar or array)"""
+    latitude, longitude = exchange_location(exchange)
+    julian_days = to_julian_day(times)
+    return _ascendant(_sidereal_degrees(julian_days, longitude), latitude, _obliquity(julian_days))
+
+
+def exchange_angles(times, exchange="NSE"):
+    """Sidereal time, ascendant, midheaven and lagna sign for each IST time"""
+    latitude, longitude = exchange_location(exchange)
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    julian_days = to_julian_day(times.to_numpy())
+    armc = _sidereal_degrees(julian_days, longitude)
+    obliquity = _obliquity(julian_days)
+    rising = _ascendant(armc, latitude, obliquity)
+    return pd.DataFrame({
+        "Sidereal_Time": armc / 15,
+        "Ascendant": rising,
+        "Midheaven": _midheaven(armc, obliquity),
+        "Lagna": np.array(SIGNS, dtype=object)[(rising // 30).astype(int) % 12]
+    }, index=times)
+
+
+def house_cusps(times, exchange="NSE", system="Whole Sign"):
+    """Longitude of the twelve house cusps for each IST time
+
+    Whole Sign, Equal and Porphyry are computed in closed form over the whole
+    array; Placidus has no closed form and is delegated to the Swiss
+    Ephemeris one timestamp at a time.
+    """
+    if system not in HOUSE_SYSTEMS:
+        raise ValueError(f"Unknown house system {system!r}; expected one of {HOUSE_SYSTEMS}")
+    latitude, longitude = exchange_location(exchange)
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    julian_days = to_julian_day(times.to_numpy())
+    armc = _sidereal_degrees(julian_days, longitude)
+    obliquity = _obliquity(julian_days)
+    rising = _ascendant(armc, latitude, obliquity)[:, None]
+    houses = np.arange(12)
+
+    if system == "Whole Sign":
+        cusps = (rising // 30) * 30 + houses * 30
+    elif system == "Equal":
+        cusps = rising + houses * 30
+    elif system == "Porphyry":
+        # Each quadrant between the angles is trisected
+        midheaven = _midheaven(armc, obliquity)[:, None]
+        above = np.mod(rising - midheaven, 360) / 3
+        below = 60 - above
+        steps = np.concatenate([np.repeat(below, 3, axis=1), np.repeat(above, 3, axis=1)] * 2, axis=1)
+        cusps = rising + np.concatenate([np.zeros((len(times), 1)), np.cumsum(steps[:, :11], axis=1)], axis=1)
+    else:
+        cusps = np.array([
+            swe.houses_armc(ramc, latitude, eps, b"P")[0][:12]
+            for ramc, eps in zip(armc.tolist(), obliquity.tolist())
+        ]).reshape(len(times), 12)
+
+    return pd.DataFrame(np.mod(cusps, 360), index=times, columns=[f"House {h + 1}" for h in houses])
+
+
+def house_positions(longitudes, cusps):
+    """House number (1-12) of each longitude given the cusps at the same times
+
+    longitudes is (times, bodies) and cusps is (times, 12), as returned by
+    planet_longitudes and house_cusps for the same time index.
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    cusps = np.asarray(cusps, dtype=float)
+    from_first = np.mod(cusps - cusps[:, :1], 360)
+    offsets = np.mod(longitudes - cusps[:, :1], 360)
+    return (offsets[:, :, None] >= from_first[:, None, :]).sum(axis=2)
+
+
+def _rising_sidereal_degrees(boundary, latitude, obliquity):
+    """ARMC at which the ecliptic longitude boundary sits on the ascendant"""
+    lam, eps, lat = np.radians(boundary), np.radians(obliquity), np.radians(latitude)
+    right_ascension = np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam))
+    declination = np.arcsin(np.sin(eps) * np.sin(lam))
+    # Hour angle at rising; clipped so circumpolar latitudes cannot produce NaN
+    semi_arc = np.arccos(np.clip(-np.tan(lat) * np.tan(declination), -1, 1))
+    return np.mod(np.degrees(right_ascension - semi_arc), 360)
+
+
+def lagna_changes(start, end, exchange="NSE"):
+    """Exact IST times at which the ascendant enters a new sign between start and end
+
+    Each sign boundary rises at a fixed sidereal time, so the crossings are
+    solved directly instead of being searched for in sampled ascendants:
+    one per boundary per sidereal day, refined to well under a second.
+    """
+    latitude, longitude = exchange_location(exchange)
+    start_jd, end_jd = (float(to_julian_day(pd.Timestamp(t).to_datetime64())) for t in (start, end))
+    sidereal_day = 360 / SIDEREAL_DEGREES_PER_DAY
+    boundaries = np.arange(12) * 30.0
+
+    # First crossing of each boundary after start, then one per sidereal day
+    target = _rising_sidereal_degrees(boundaries, latitude, _obliquity(start_jd))
+    first = start_jd + np.mod(target - _sidereal_degrees(start_jd, longitude), 360) / SIDEREAL_DEGREES_PER_DAY
+    repeats = int(np.ceil((end_jd - start_jd) / sidereal_day)) + 1
+    crossings = first[:, None] + np.arange(repeats) * sidereal_day
+    signs = np.repeat(np.arange(12), repeats)
+    crossings = crossings.ravel()
+
+    # Newton steps absorb the slow drift of the obliquity
+    for _ in range(2):
+        target = _rising_sidereal_degrees(boundaries[signs], latitude, _obliquity(crossings))
+        error = np.mod(_sidereal_degrees(crossings, longitude) - target + 180, 360) - 180
+        crossings = crossings - error / SIDEREAL_DEGREES_PER_DAY
+
+    inside = (crossings >= start_jd) & (crossings < end_jd)
+    crossings, signs = crossings[inside], signs[inside]
+    order = np.argsort(crossings, kind="stable")
+    crossings, signs = crossings[order], signs[order]
+    names = np.array(SIGNS, dtype=object)
+    return pd.DataFrame({
+        "DateTime": pd.to_datetime(from_julian_day(crossings)),
+        "From": names[(signs - 1) % 12],
+        "To": names[signs]
+    })
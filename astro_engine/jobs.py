@@ -0,0 +1,177 @@
+"""Background job queue for long analyses, with progress, cancellation and retained results
+
+Jobs run on a small shared thread pool, so at most JOB_WORKERS analyses
+run at once however many sessions queue them; the rest wait in order.
+Each job receives a progress callback. Calling it records progress and
+raises JobCancelled once cancellation has been requested, which is how a
+running job stops at its next progress report. Finished jobs keep their
+result for JOB_RETENTION_SECONDS.
+"""
+
+import functools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .metrics import default_registry
+from .stations import warm_station_cache
+
+# Analyses running at once, and the worker processes each may fan out to
+JOB_WORKERS = int(os.environ.get("ASTRO_JOB_WORKERS", 2))
+JOB_PROCESS_WORKERS = max(1, (os.cpu_count() or 1) // JOB_WORKERS)
+
+# Worker processes come from a fork server rather than being forked from this
+# multithreaded process, so they never inherit a lock (metrics, rule reloads,
+# caches) that another thread happened to hold at fork time
+PROCESS_START_METHOD = "forkserver"
+
+# Finished jobs are kept this long, and at most this many of them
+JOB_RETENTION_SECONDS = 3600
+JOB_RETENTION_COUNT = 100
+
+JOB_STATES = ["queued", "running", "done", "failed", "cancelled"]
+FINISHED_STATES = {"done", "failed", "cancelled"}
+
+JOB_SECONDS = default_registry().histogram(
+    "astro_job_seconds", "Run time of background jobs by how they ended", ("state",)
+)
+
+
+def process_pool(max_workers=None):
+    """Process pool for fanning work out over days or cases; each worker computes the station tables once"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+                               initializer=warm_station_cache)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by its progress callback once it has been cancelled"""
+
+
+class Job:
+    """One submitted analysis and everything known about it so far"""
+
+    def __init__(self, label, owner=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.owner = owner
+        self.state = "queued"
+        self.progress = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._cancel_requested = threading.Event()
+        self._future = None
+
+    def report(self, fraction, message):
+        """Progress callback handed to the job function"""
+        if self._cancel_requested.is_set():
+            raise JobCancelled(self.id)
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        self.message = message
+
+    def elapsed(self):
+        """Seconds spent running so far, or in total once finished"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobQueue:
+    """Thread pool of analysis jobs addressed by job id"""
+
+    def __init__(self, workers=JOB_WORKERS, retention_seconds=JOB_RETENTION_SECONDS,
+                 retention_count=JOB_RETENTION_COUNT):
+        self.retention_seconds = retention_seconds
+        self.retention_count = retention_count
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="astro-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, label="Analysis", owner=None, **kwargs):
+        """Queue function(*args, progress=..., **kwargs) and return its job id"""
+        job = Job(label, owner)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            job._future = self._pool.submit(self._run, job, function, args, kwargs)
+        return job.id
+
+    def _run(self, job, function, args, kwargs):
+        """Worker body: run the job and record how it ended"""
+        if job._cancel_requested.is_set():
+            job.state, job.message, job.finished = "cancelled", "Cancelled", time.time()
+            return
+        job.state, job.started, job.message = "running", time.time(), "Starting"
+        try:
+            job.result = function(*args, progress=job.report, **kwargs)
+        except JobCancelled:
+            job.state, job.message = "cancelled", "Cancelled"
+        except Exception as exc:  # a failed job is reported to its owner, never to the pool
+            job.state, job.error, job.message = "failed", str(exc), "Failed"
+        else:
+            job.state, job.progress, job.message = "done", 1.0, "Complete"
+        finally:
+            job.finished = time.time()
+            JOB_SECONDS.observe(job.elapsed(), state=job.state)
+
+    def get(self, job_id):
+        """The job with this id, or None once it has expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs never start, running ones stop at their next progress report"""
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED_STATES:
+            return False
+        job._cancel_requested.set()
+        if job._future is not None and job._future.cancel():
+            job.state, job.message, job.finished = "cancelled", "Cancelled", time.time()
+        return True
+
+    def jobs(self, owner=None):
+        """Retained jobs, oldest first, optionally only one owner's"""
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def counts(self):
+        """Number of retained jobs in each state"""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        for job in self.jobs():
+            counts[job.state] += 1
+        return counts
+
+    def state_metrics(self):
+        """Metrics collector: retained jobs in each state"""
+        return [("astro_jobs", "Retained background jobs by state", "gauge", ("state",),
+                 [((state,), count) for state, count in self.counts().items()])]
+
+    def _prune(self):
+        """Forget finished jobs past the retention time or beyond the retention count"""
+        finished = sorted((job for job in self._jobs.values() if job.state in FINISHED_STATES),
+                          key=lambda job: job.finished or job.submitted)
+        cutoff = time.time() - self.retention_seconds
+        excess = len(finished) - self.retention_count
+        for position, job in enumerate(finished):
+            if position < excess or (job.finished or job.submitted) < cutoff:
+                del self._jobs[job.id]
+
+    def shutdown(self):
+        """Cancel everything and stop the workers"""
+        for job in self.jobs():
+            self.cancel(job.id)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@functools.lru_cache(maxsize=None)
+def default_queue():
+    """Process-wide job queue shared by every session"""
+    queue = JobQueue()
+    default_registry().add_collector(queue.state_metrics)
+    return queue
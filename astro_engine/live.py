@@ -0,0 +1,99 @@
+"""The live tab's bundle: positions, aspects, signal, movement and aspect outlook at one minute"""
+
+import functools
+from datetime import timedelta
+
+import pandas as pd
+
+from .core import (
+    analyze_market_session,
+    calculate_enhanced_trading_signal,
+    calculate_planetary_positions,
+    generate_market_insights,
+    get_aspects
+)
+from .metrics import timed, watch_lru_cache
+
+# Hours ahead at which the outlook looks for newly forming aspects, and how many it lists
+FORECAST_HOURS = (1, 3, 6, 12, 24)
+FORECAST_ROWS = 8
+
+# Minutes kept: the current one, the one the warmer prepares and a few stragglers
+LIVE_BUNDLE_ENTRIES = 4
+
+
+def _movement(positions):
+    """Speed, direction and time to the next sign change of every planet"""
+    movement_data = []
+    for _, pos in positions.iterrows():
+        planet = pos["Planet"]
+        speed = pos["Speed"]
+        daily_movement = abs(speed)
+
+        # Calculate when planet will change nakshatra/sign
+        current_deg = pos["Full_Degree"] % 30
+        if speed > 0:
+            deg_to_next = 30 - current_deg
+            hours_to_sign_change = deg_to_next / (daily_movement / 24) if daily_movement > 0 else 999
+        else:
+            hours_to_sign_change = current_deg / (daily_movement / 24) if daily_movement > 0 else 999
+
+        movement_data.append({
+            "Planet": planet,
+            "Current_Position": f"{pos['Sign']} {pos['Degree']}",
+            "Daily_Speed": f"{daily_movement:.2f}°/day",
+            "Next_Sign_Change": f"~{hours_to_sign_change:.1f} hours" if hours_to_sign_change < 48 else ">2 days",
+            "Movement_Direction": "Forward" if speed > 0 else "Retrograde",
+            "Market_Impact": pos["Market_Influence"]
+        })
+    return pd.DataFrame(movement_data)
+
+
+def _forecast(analysis_time, aspects_df):
+    """Strongest aspects not active now that are in orb at one of the FORECAST_HOURS"""
+    upcoming_aspects = []
+    current_keys = set((row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in aspects_df.iterrows())
+    for future_time in [analysis_time + timedelta(hours=h) for h in FORECAST_HOURS]:
+        future_aspects_df, _ = get_aspects(calculate_planetary_positions(future_time))
+
+        # Find new aspects that will form
+        for _, aspect in future_aspects_df.iterrows():
+            if (aspect["Planet1"], aspect["Planet2"], aspect["Aspect"]) not in current_keys:
+                hours_ahead = (future_time - analysis_time).total_seconds() / 3600
+                upcoming_aspects.append({
+                    "Time_Ahead": f"{hours_ahead:.0f}h",
+                    "Aspect": f"{aspect['Planet1']}-{aspect['Planet2']} {aspect['Aspect']}",
+                    "Tendency": aspect["Tendency"],
+                    "Weight": aspect["Weight"],
+                    "Market_Effect": aspect["Market_Effect"],
+                    "Formation_Time": future_time.strftime("%H:%M")
+                })
+    upcoming_df = pd.DataFrame(upcoming_aspects)
+    if not upcoming_df.empty:
+        upcoming_df = upcoming_df.sort_values("Weight", ascending=False).head(FORECAST_ROWS)
+    return upcoming_df
+
+
+@watch_lru_cache("live_bundle")
+@functools.lru_cache(maxsize=LIVE_BUNDLE_ENTRIES)
+@timed("live_bundle")
+def live_bundle(analysis_time, params_hash=None):
+    """Positions, aspects, session, signal, movement and 24-hour aspect outlook at one moment
+
+    Shared by every session, so callers must not modify it. params_hash
+    only keys the cache, so an aspect rule edit is picked up for the next
+    call that passes the new hash.
+    """
+    positions = calculate_planetary_positions(analysis_time, station_notes=True)
+    aspects_df, _ = get_aspects(positions)
+    bundle = {"positions": positions, "aspects_df": aspects_df}
+    if aspects_df.empty:
+        return bundle
+
+    session_info = analyze_market_session(analysis_time.strftime("%H:%M"), aspects_df, positions)
+    bundle["session_info"] = session_info
+    bundle["signal"] = calculate_enhanced_trading_signal(aspects_df, session_info)
+    bundle["movement_df"] = _movement(positions)
+    bundle["upcoming_df"] = _forecast(analysis_time, aspects_df)
+    bundle["insights"] = generate_market_insights(positions, aspects_df)
+    return bundle
@@ -0,0 +1,314 @@
+"""In-process runtime metrics: counters, stage latency histograms and cache statistics
+
+Hot paths only take one small lock and a few additions per observation.
+Everything is rendered in the Prometheus text exposition format, served
+over HTTP when ASTRO_METRICS_PORT is set or written to ASTRO_METRICS_FILE
+(for a node_exporter textfile collector). Metrics are process-local: work
+done inside process-pool workers shows up only in the stage that waits
+for it in this process. A forked child gets fresh locks, so it never
+waits on one that a thread of its parent held at fork time.
+"""
+
+import bisect
+import functools
+import math
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+                   300.0)
+
+# Set ASTRO_METRICS_PORT to serve /metrics on localhost, ASTRO_METRICS_FILE to write it periodically
+METRICS_PORT = int(os.environ.get("ASTRO_METRICS_PORT", 0))
+METRICS_FILE = os.environ.get("ASTRO_METRICS_FILE")
+METRICS_WRITE_SECONDS = 15
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    """Label value escaped as the exposition format requires"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values):
+    """Prometheus label block for one series, empty without labels"""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {} if self.labels else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        """{label values: count}"""
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self):
+        """(suffix, label names, label values, value) of every exported series"""
+        return [("", self.labels, key, value) for key, value in sorted(self.values().items())]
+
+
+class Histogram:
+    """Bucketed observations per label set, with their count and sum"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            series[0][position] += 1
+            series[1] += 1
+            series[2] += value
+
+    def series(self):
+        """{label values: (per-bucket counts with a final +Inf bucket, count, sum)}"""
+        with self._lock:
+            return {key: (list(counts), count, total) for key, (counts, count, total) in self._series.items()}
+
+    def quantile(self, q, counts):
+        """Quantile estimated from per-bucket counts by interpolating inside the bucket"""
+        total = sum(counts)
+        if not total:
+            return math.nan
+        rank = q * total
+        cumulative = 0
+        for position, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[position - 1] if position else 0.0
+                if position == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[position] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def samples(self):
+        samples = []
+        for key, (counts, count, total) in sorted(self.series().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", self.labels + ("le",), key + ("+Inf" if bound == math.inf else repr(bound),),
+                                cumulative))
+            samples.append(("_count", self.labels, key, count))
+            samples.append(("_sum", self.labels, key, total))
+        return samples
+
+
+class Registry:
+    """Named metrics plus collectors that report gauges read at export time"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, help_text, labels, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help_text, labels, **options)
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def add_collector(self, collector):
+        """collector() returns (name, help, type, label names, [(label values, value)]) tuples"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def reset_locks(self):
+        """Give the registry and every metric fresh locks, for a forked child whose parent threads held them"""
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric._lock = threading.Lock()
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in sorted(self.metrics(), key=lambda metric: metric.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, values, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_label_text(names, values)} {value}")
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            for name, help_text, kind, names, series in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for values, value in series:
+                    lines.append(f"{name}{_label_text(names, values)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# functools.lru_cache functions whose hit rates are exported, by name
+_LRU_CACHES = {}
+
+
+def watch_lru_cache(name):
+    """Decorator exporting an lru_cache-wrapped function's hits, misses and size under name"""
+    def decorator(function):
+        _LRU_CACHES[name] = function
+        return function
+    return decorator
+
+
+def _lru_cache_metrics():
+    infos = {name: function.cache_info() for name, function in sorted(_LRU_CACHES.items())}
+    return [
+        ("astro_lru_cache_hits_total", "Hits of in-process memoized tables", "counter", ("cache",),
+         [((name,), info.hits) for name, info in infos.items()]),
+        ("astro_lru_cache_misses_total", "Misses of in-process memoized tables", "counter", ("cache",),
+         [((name,), info.misses) for name, info in infos.items()]),
+        ("astro_lru_cache_entries", "Entries held by in-process memoized tables", "gauge", ("cache",),
+         [((name,), info.currsize) for name, info in infos.items()])
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def default_registry():
+    """Process-wide registry every module records into"""
+    registry = Registry()
+    registry.add_collector(_lru_cache_metrics)
+    # A child forked while another thread was recording would otherwise inherit that lock held forever
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=registry.reset_locks)
+    return registry
+
+
+STAGE_SECONDS = default_registry().histogram(
+    "astro_stage_seconds", "Wall time of each pipeline stage", ("stage",)
+)
+STAGE_ERRORS = default_registry().counter(
+    "astro_stage_errors_total", "Pipeline stage calls that raised", ("stage",)
+)
+
+
+def timed(stage):
+    """Decorator recording every call's wall time in astro_stage_seconds under stage"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                STAGE_ERRORS.inc(stage=stage)
+                raise
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage)
+        return wrapper
+    return decorator
+
+
+def stage_summary(registry=None):
+    """Calls, mean and estimated median and 95th percentile (seconds) of every timed stage"""
+    registry = default_registry() if registry is None else registry
+    histogram = registry.histogram("astro_stage_seconds", "Wall time of each pipeline stage", ("stage",))
+    errors = registry.counter("astro_stage_errors_total", "Pipeline stage calls that raised", ("stage",)).values()
+    return [
+        {
+            "Stage": key[0],
+            "Calls": count,
+            "Errors": errors.get(key, 0),
+            "Mean_s": total / count if count else math.nan,
+            "P50_s": histogram.quantile(0.5, counts),
+            "P95_s": histogram.quantile(0.95, counts)
+        }
+        for key, (counts, count, total) in sorted(histogram.series().items())
+    ]
+
+
+def write_metrics(path, registry=None):
+    """Write the exposition text to path atomically, so a collector never reads half a file"""
+    registry = default_registry() if registry is None else registry
+    directory = os.path.dirname(path) or "."
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as temporary_file:
+            temporary_file.write(registry.render())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics returns the default registry"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = default_registry().render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="astro-metrics", daemon=True).start()
+    return server
+
+
+def start_metrics_file_writer(path=METRICS_FILE, seconds=METRICS_WRITE_SECONDS):
+    """Rewrite the metrics file every few seconds from a daemon thread; returns the thread"""
+    def run():
+        while True:
+            try:
+                write_metrics(path)
+            except OSError:
+                pass  # an unwritable file must not take the app down; the next pass retries
+            time.sleep(seconds)
+
+    thread = threading.Thread(target=run, name="astro-metrics-file", daemon=True)
+    thread.start()
+    return thread
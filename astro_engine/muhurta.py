@@ -0,0 +1,193 @@
+"""Sunrise-based timing tables: Hora, Choghadiya and Rahu Kaal
+
+All three divide the day (sunrise to sunset) and the night (sunset to the
+next sunrise) into equal parts, so they only need local sunrise and sunset.
+Those are solved for a whole year at a time and cached; labelling any
+array of timestamps is then a binary search and a few array operations.
+"""
+
+import functools
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .houses import _sidereal_degrees, exchange_location
+from .metrics import watch_lru_cache
+from .stations import J2000_JD, from_julian_day, to_julian_day
+
+# Planets in the order their Horas follow each other, which is also the
+# order of the seven Choghadiyas they rule
+HORA_LORDS = ["Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars"]
+CHOGHADIYAS = ["Udveg", "Chal", "Labh", "Amrit", "Kaal", "Shubh", "Rog"]
+CHOGHADIYA_NATURE = {
+    "Amrit": "Good", "Shubh": "Good", "Labh": "Good", "Chal": "Neutral",
+    "Udveg": "Bad", "Kaal": "Bad", "Rog": "Bad"
+}
+
+# Lord of each weekday, Monday first; it rules the first Hora and Choghadiya after sunrise
+WEEKDAY_LORDS = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+
+# Which eighth of daytime is Rahu Kaal, Monday first
+RAHU_KAAL_PART = [1, 6, 4, 5, 3, 2, 7]
+
+# Sunrise and sunset are when the Sun's upper limb touches the refracted horizon
+SUN_HORIZON_ALTITUDE = -0.833
+
+# The Sun's hour angle advances 360 degrees per solar day
+SOLAR_DEGREES_PER_DAY = 360.0
+
+
+def _sun_equatorial(julian_days):
+    """Low-precision right ascension and declination of the Sun in degrees"""
+    days = np.asarray(julian_days, dtype=float) - J2000_JD
+    anomaly = np.radians(357.529 + 0.98560028 * days)
+    longitude = np.radians(280.459 + 0.98564736 * days + 1.915 * np.sin(anomaly) + 0.020 * np.sin(2 * anomaly))
+    obliquity = np.radians(23.439 - 0.00000036 * days)
+    right_ascension = np.degrees(np.arctan2(np.cos(obliquity) * np.sin(longitude), np.cos(longitude)))
+    declination = np.degrees(np.arcsin(np.sin(obliquity) * np.sin(longitude)))
+    return right_ascension, declination
+
+
+def _horizon_crossings(guess, latitude, longitude, direction):
+    """Refine Julian day guesses to sunrise (direction -1) or sunset (+1)"""
+    julian_days = guess
+    for _ in range(3):
+        right_ascension, declination = _sun_equatorial(julian_days)
+        lat, dec = np.radians(latitude), np.radians(declination)
+        cos_hour = (np.sin(np.radians(SUN_HORIZON_ALTITUDE)) - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+        target = right_ascension + direction * np.degrees(np.arccos(np.clip(cos_hour, -1, 1)))
+        error = np.mod(_sidereal_degrees(julian_days, longitude) - target + 180, 360) - 180
+        julian_days = julian_days - error / SOLAR_DEGREES_PER_DAY
+    return julian_days
+
+
+@watch_lru_cache("sun_times")
+@functools.lru_cache(maxsize=None)
+def sun_times(year, exchange="NSE"):
+    """Sunrise and sunset (naive IST) at the exchange for every day of a year
+
+    The table runs to 1 January of the next year so the last night of the
+    year has its closing sunrise.
+    """
+    latitude, longitude = exchange_location(exchange)
+    days = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="D")
+    # Local apparent noon is close to 12:00 local mean time
+    noon = to_julian_day(days.to_numpy()) + (12 + 5.5 - longitude / 15) / 24
+    return pd.DataFrame({
+        "Sunrise": from_julian_day(_horizon_crossings(noon - 0.25, latitude, longitude, -1)),
+        "Sunset": from_julian_day(_horizon_crossings(noon + 0.25, latitude, longitude, 1))
+    }, index=days)
+
+
+def sun_table(first_day, last_day, exchange="NSE"):
+    """Sunrise and sunset for every day from first_day to last_day inclusive"""
+    years = range(pd.Timestamp(first_day).year, pd.Timestamp(last_day).year + 1)
+    table = pd.concat([sun_times(year, exchange) for year in years])
+    table = table[~table.index.duplicated()]
+    return table.loc[pd.Timestamp(first_day).normalize():pd.Timestamp(last_day).normalize()]
+
+
+def timing_columns(times, exchange="NSE"):
+    """Hora lord, Choghadiya and Rahu Kaal flag of each IST time
+
+    A time before sunrise belongs to the night of the previous day, as in
+    the traditional reckoning.
+    """
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    if times.empty:
+        return pd.DataFrame({
+            "Hora": pd.Categorical([], categories=HORA_LORDS),
+            "Choghadiya": pd.Categorical([], categories=CHOGHADIYAS),
+            "Rahu_Kaal": np.array([], dtype=bool)
+        }, index=times)
+    moments = times.to_numpy().astype("datetime64[s]")
+    table = sun_table(times.min() - timedelta(days=1), times.max() + timedelta(days=1), exchange)
+    sunrises = table["Sunrise"].to_numpy()
+    sunsets = table["Sunset"].to_numpy()
+
+    day = np.searchsorted(sunrises, moments, side="right") - 1
+    sunrise, sunset, next_sunrise = sunrises[day], sunsets[day], sunrises[day + 1]
+    daytime = moments < sunset
+    fraction = np.where(
+        daytime,
+        (moments - sunrise) / (sunset - sunrise),
+        (moments - sunset) / (next_sunrise - sunset)
+    )
+
+    weekday = table.index.weekday.to_numpy()[day]
+    first = np.array([HORA_LORDS.index(lord) for lord in WEEKDAY_LORDS])[weekday]
+    hora = first + np.minimum((fraction * 12).astype(int), 11) + np.where(daytime, 0, 12)
+    part = np.minimum((fraction * 8).astype(int), 7)
+    # Night Choghadiyas start five places on and step back two at a time
+    choghadiya = np.where(daytime, first + part, first + 5 - 2 * part) % 7
+    return pd.DataFrame({
+        "Hora": pd.Categorical.from_codes(hora % 7, categories=HORA_LORDS),
+        "Choghadiya": pd.Categorical.from_codes(choghadiya, categories=CHOGHADIYAS),
+        "Rahu_Kaal": daytime & (part == np.array(RAHU_KAAL_PART)[weekday])
+    }, index=times)
+
+
+def _segments(day, parts, exchange):
+    """Start and end of each of the equal day parts and night parts after sunrise on day"""
+    table = sun_table(day, day + timedelta(days=1), exchange)
+    sunrise, sunset, next_sunrise = table["Sunrise"].iloc[0], table["Sunset"].iloc[0], table["Sunrise"].iloc[1]
+    edges = np.concatenate([
+        sunrise + (sunset - sunrise) * np.arange(parts) / parts,
+        sunset + (next_sunrise - sunset) * np.arange(parts + 1) / parts
+    ])
+    periods = ["Day"] * parts + ["Night"] * parts
+    return pd.to_datetime(edges[:-1]), pd.to_datetime(edges[1:]), periods
+
+
+def hora_table(day, exchange="NSE"):
+    """The 24 Horas from sunrise on day to the next sunrise"""
+    starts, ends, periods = _segments(day, 12, exchange)
+    labels = timing_columns(starts + (ends - starts) / 2, exchange)
+    return pd.DataFrame({"Start": starts, "End": ends, "Period": periods, "Hora": labels["Hora"].to_numpy()})
+
+
+def choghadiya_table(day, exchange="NSE"):
+    """The 16 Choghadiyas from sunrise on day to the next sunrise"""
+    starts, ends, periods = _segments(day, 8, exchange)
+    labels = timing_columns(starts + (ends - starts) / 2, exchange)
+    choghadiyas = labels["Choghadiya"].astype(str).to_numpy()
+    return pd.DataFrame({
+        "Start": starts, "End": ends, "Period": periods, "Choghadiya": choghadiyas,
+        "Nature": [CHOGHADIYA_NATURE[name] for name in choghadiyas],
+        "Rahu_Kaal": labels["Rahu_Kaal"].to_numpy()
+    })
+
+
+def rahu_kaal(day, exchange="NSE"):
+    """Start and end of Rahu Kaal on day"""
+    starts, ends, _ = _segments(day, 8, exchange)
+    part = RAHU_KAAL_PART[day.weekday()]
+    return starts[part].to_pydatetime(), ends[part].to_pydatetime()
+
+
+def market_timings(day, market_open="09:15", market_close="15:30", exchange="NSE"):
+    """Sunrise, sunset, Rahu Kaal and the Horas and Choghadiyas overlapping market hours
+
+    market_open and market_close are IST "HH:MM" times on day or IST
+    datetimes, for an exchange whose session crosses IST midnight.
+    """
+    opening, closing = (
+        moment if isinstance(moment, datetime) else datetime.combine(day, datetime.strptime(moment, "%H:%M").time())
+        for moment in (market_open, market_close)
+    )
+    sun = sun_table(day, day, exchange).iloc[0]
+
+    def clipped(table):
+        table = table[(table["End"] > opening) & (table["Start"] < closing)].copy()
+        table["Start"] = table["Start"].clip(lower=opening)
+        table["End"] = table["End"].clip(upper=closing)
+        return table.reset_index(drop=True)
+
+    return {
+        "sunrise": sun["Sunrise"].to_pydatetime(),
+        "sunset": sun["Sunset"].to_pydatetime(),
+        "rahu_kaal": rahu_kaal(day, exchange),
+        "horas": clipped(hora_table(day, exchange)),
+        "choghadiyas": clipped(choghadiya_table(day, exchange))
+    }
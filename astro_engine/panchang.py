@@ -0,0 +1,163 @@
+"""Panchang elements (tithi, karana, yoga, Moon nakshatra) and their exact change times
+
+Every element is an equal division of a Sun/Moon longitude combination:
+tithi and karana of the Moon's elongation from the Sun, yoga of the sum
+of their sidereal longitudes, and nakshatra of the Moon alone. Each
+combination only ever increases, so its boundary crossings are bracketed
+on a coarse grid and then polished with batched Newton steps using the
+ephemeris speeds. Sidereal longitudes use the Lahiri ayanamsa.
+"""
+
+import functools
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import swisseph as swe
+
+from .metrics import watch_lru_cache
+from .stations import EPHEMERIS_FLAGS, from_julian_day, to_julian_day
+
+# Sidereal mode is global Swiss Ephemeris state, so it is set on every call rather than at import
+SIDEREAL_MODE = swe.SIDM_LAHIRI
+SIDEREAL_FLAGS = EPHEMERIS_FLAGS | swe.FLG_SIDEREAL
+
+TITHI_NAMES = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami",
+    "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi"
+]
+TITHIS = [f"Shukla {name}" for name in TITHI_NAMES] + ["Purnima"] + \
+         [f"Krishna {name}" for name in TITHI_NAMES] + ["Amavasya"]
+
+# Karana 1 is fixed, 2-57 cycle through the seven movable karanas, 58-60 are fixed
+MOVABLE_KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti"]
+FIXED_KARANAS = ["Kimstughna", "Shakuni", "Chatushpada", "Naga"]
+KARANAS = MOVABLE_KARANAS + FIXED_KARANAS
+KARANA_SEQUENCE = ["Kimstughna"] + [MOVABLE_KARANAS[k % 7] for k in range(56)] + ["Shakuni", "Chatushpada", "Naga"]
+
+YOGAS = [
+    "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma", "Dhriti", "Shula",
+    "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyana",
+    "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti"
+]
+
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+    "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
+    "Uttara Bhadrapada", "Revati"
+]
+
+# Each element: (Sun coefficient, Moon coefficient) of the longitude combination and the name of each part
+PANCHANG_ELEMENTS = {
+    "Tithi": ((-1, 1), TITHIS),
+    "Karana": ((-1, 1), KARANA_SEQUENCE),
+    "Yoga": ((1, 1), YOGAS),
+    "Nakshatra": ((0, 1), NAKSHATRAS)
+}
+
+# Categories of each element's labels, for compact categorical columns
+PANCHANG_CATEGORIES = {"Tithi": TITHIS, "Karana": KARANAS, "Yoga": YOGAS, "Nakshatra": NAKSHATRAS}
+
+# Grid step in days; shorter than the shortest karana (about 9.5 hours) so
+# no sample interval can hold two changes of any element
+PANCHANG_STEP_DAYS = 0.25
+
+# Newton steps after linear interpolation; two bring every change within a second
+PANCHANG_NEWTON_STEPS = 2
+
+
+def _sun_moon(julian_days):
+    """Sidereal longitude and speed of the Sun and the Moon at each Julian day"""
+    swe.set_sid_mode(SIDEREAL_MODE)
+    sun = np.array([swe.calc_ut(jd, swe.SUN, SIDEREAL_FLAGS)[0] for jd in julian_days.tolist()]).reshape(-1, 6)
+    moon = np.array([swe.calc_ut(jd, swe.MOON, SIDEREAL_FLAGS)[0] for jd in julian_days.tolist()]).reshape(-1, 6)
+    return sun[:, 0], sun[:, 3], moon[:, 0], moon[:, 3]
+
+
+def _combination(coefficients, sun, moon):
+    """A Sun/Moon longitude (or speed) combination"""
+    sun_coefficient, moon_coefficient = coefficients
+    return sun_coefficient * sun + moon_coefficient * moon
+
+
+def panchang_changes(start, end):
+    """Every change of tithi, karana, yoga and Moon nakshatra between two IST times
+
+    Returns DateTime, Element, From and To sorted by time.
+    """
+    start_jd, end_jd = (float(to_julian_day(pd.Timestamp(t).to_datetime64())) for t in (start, end))
+    grid = np.arange(start_jd, end_jd + PANCHANG_STEP_DAYS, PANCHANG_STEP_DAYS)
+    sun, sun_speed, moon, moon_speed = _sun_moon(grid)
+
+    # Bracket every boundary crossing on the grid
+    elements, targets, guesses, before, after = [], [], [], [], []
+    for element, (coefficients, names) in PANCHANG_ELEMENTS.items():
+        width = 360 / len(names)
+        phase = np.mod(_combination(coefficients, sun, moon), 360)
+        part = (phase // width).astype(int) % len(names)
+        crossed = np.nonzero(part[1:] != part[:-1])[0]
+        rate = _combination(coefficients, sun_speed, moon_speed)[crossed]
+        target = part[crossed + 1] * width
+        elements += [element] * len(crossed)
+        targets.append(target)
+        guesses.append(grid[crossed] + np.mod(target - phase[crossed], 360) / rate)
+        before.append(np.array(names, dtype=object)[part[crossed]])
+        after.append(np.array(names, dtype=object)[part[crossed + 1]])
+
+    elements = np.array(elements, dtype=object)
+    targets, crossings = np.concatenate(targets), np.concatenate(guesses)
+    coefficients = np.array([PANCHANG_ELEMENTS[element][0] for element in elements]).reshape(-1, 2)
+
+    # Newton steps on all crossings together
+    for _ in range(PANCHANG_NEWTON_STEPS):
+        sun, sun_speed, moon, moon_speed = _sun_moon(crossings)
+        phase = coefficients[:, 0] * sun + coefficients[:, 1] * moon
+        rate = coefficients[:, 0] * sun_speed + coefficients[:, 1] * moon_speed
+        crossings = crossings - (np.mod(phase - targets + 180, 360) - 180) / rate
+
+    changes = pd.DataFrame({
+        "DateTime": pd.to_datetime(from_julian_day(crossings)),
+        "Element": elements,
+        "From": np.concatenate(before),
+        "To": np.concatenate(after)
+    })
+    inside = (crossings >= start_jd) & (crossings < end_jd)
+    return changes[inside].sort_values(["DateTime", "Element"], kind="stable", ignore_index=True)
+
+
+@watch_lru_cache("panchang_year")
+@functools.lru_cache(maxsize=None)
+def panchang_year(year):
+    """Panchang changes from a few days before 1 January to the end of the year"""
+    start = pd.Timestamp(f"{year}-01-01") - timedelta(days=3)
+    return panchang_changes(start, pd.Timestamp(f"{year + 1}-01-01"))
+
+
+def panchang_at(times):
+    """Tithi, karana, yoga and Moon nakshatra in force at each IST time
+
+    Looked up in the cached yearly change tables, so labelling any number
+    of timestamps costs one binary search per element.
+    """
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    if times.empty:
+        return pd.DataFrame({
+            element: pd.Categorical([], categories=categories) for element, categories in PANCHANG_CATEGORIES.items()
+        }, index=times)
+    # Each year after the first contributes only its own changes, not its lead-in
+    first_year, last_year = times.min().year, times.max().year
+    changes = [panchang_year(first_year)]
+    for year in range(first_year + 1, last_year + 1):
+        year_changes = panchang_year(year)
+        changes.append(year_changes[year_changes["DateTime"] >= pd.Timestamp(f"{year}-01-01")])
+    changes = pd.concat(changes, ignore_index=True)
+    moments = times.to_numpy()
+
+    labels = {}
+    for element, categories in PANCHANG_CATEGORIES.items():
+        element_changes = changes[changes["Element"] == element]
+        change_times = element_changes["DateTime"].to_numpy()
+        names = np.concatenate([element_changes["From"].to_numpy()[:1], element_changes["To"].to_numpy()])
+        labels[element] = pd.Categorical(names[np.searchsorted(change_times, moments, side="right")], categories=categories)
+    return pd.DataFrame(labels, index=times)
@@ -0,0 +1,197 @@
+"""Background warming of the result cache for today and the coming trading days
+
+The warmer fills the shared result cache with exactly the entries the app
+looks up: the unfiltered aspects of the commonly used intervals (which every
+index and filter setting shares), and the report timeline and rendered
+daily report. Every session
+and every process using the same cache file then gets lookups instead of
+computations. It re-checks periodically, so a day rollover or an aspect
+rule edit is picked up without a restart. LiveWarmer prepares the live
+tab's bundle for each coming minute in the app process. Run one pass
+headless with ``python -m astro_engine.prewarm --help``.
+"""
+
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime, time, timedelta
+
+from .exchanges import engine_now, group_by_exchange
+from .live import live_bundle
+from .muhurta import sun_times
+from .panchang import panchang_year
+from .result_cache import default_cache, engine_params_hash
+from .stations import warm_station_cache
+from .timeline import (
+    DEFAULT_REPORT_SYMBOLS,
+    INTERVAL_MINUTES,
+    compute_exchange_reports,
+    compute_range_aspects,
+    day_aspects_cache_fields,
+    report_cache_fields
+)
+from .trading_calendar import is_trading_day, next_trading_days
+
+# Trading days after today to warm; 0 warms today only
+PREWARM_TRADING_DAYS = int(os.environ.get("ASTRO_PREWARM_DAYS", 2))
+
+# Intervals (minutes) warmed; the fine ones cost the most and are asked for the least
+PREWARM_INTERVALS = [int(minutes) for minutes in os.environ.get("ASTRO_PREWARM_INTERVALS", "15,30").split(",")]
+
+# Set ASTRO_PREWARM=0 to keep the app from starting the background warmers
+PREWARM_ENABLED = os.environ.get("ASTRO_PREWARM", "1") != "0"
+
+# Seconds between passes; a pass over an already warm cache is only lookups
+PREWARM_CHECK_SECONDS = 900
+
+# The intraday tab's default session, which the cache keys include
+PREWARM_SESSION = (time(9, 15), time(15, 30))
+
+# Seconds before each minute starts that its live bundle is prepared
+LIVE_LEAD_SECONDS = 10
+
+
+def prewarm_days(today=None, trading_days_ahead=PREWARM_TRADING_DAYS, exchange="NSE"):
+    """Today (if it trades) and the following trading days"""
+    today = engine_now().date() if today is None else today
+    return next_trading_days(today, trading_days_ahead + 1, exchange)
+
+
+def prewarm(days, cache=None, intervals=None, report_symbols=DEFAULT_REPORT_SYMBOLS,
+            exchange="NSE", max_workers=None, progress=None):
+    """Fill the result cache for the given trading days; returns the number of entries written"""
+    cache = default_cache() if cache is None else cache
+    intervals = PREWARM_INTERVALS if intervals is None else intervals
+    if not days:
+        return 0
+    start_time, end_time = PREWARM_SESSION
+    written = 0
+
+    # Process-local tables every computation below relies on
+    warm_station_cache()
+    for year in sorted({day.year for day in days}):
+        for report_exchange in sorted({exchange, *group_by_exchange(report_symbols)}):
+            sun_times(year, report_exchange)
+        panchang_year(year)
+
+    for position, interval in enumerate(intervals):
+        if progress:
+            progress(position / (len(intervals) + 1), f"Warming {interval}-minute aspects")
+
+        missing = [
+            day for day in days
+            if not cache.contains(**day_aspects_cache_fields(day, start_time, end_time, interval))
+        ]
+        if not missing:
+            continue
+        # Computed in worker processes; days already cached in between are only looked up
+        compute_range_aspects(missing[0], missing[-1], start_time, end_time, interval,
+                              exchange=exchange, max_workers=max_workers, cache=cache)
+        written += len(missing)
+
+    if progress:
+        progress(len(intervals) / (len(intervals) + 1), "Warming daily reports")
+    for day in days:
+        # Every exchange of the report indices, each under its own key, as the app looks them up
+        missing = [
+            report_exchange for report_exchange, symbols in group_by_exchange(report_symbols).items()
+            if is_trading_day(day, report_exchange)
+            and not cache.contains(kind="daily_report", **report_cache_fields(day, symbols, report_exchange))
+        ]
+        if missing:
+            compute_exchange_reports(day, report_symbols, cache)
+            written += 2 * len(missing)
+    return written
+
+
+class Prewarmer(threading.Thread):
+    """Daemon thread that keeps today's and the coming days' results in the cache"""
+
+    def __init__(self, cache=None, trading_days_ahead=PREWARM_TRADING_DAYS, exchange="NSE", max_workers=None,
+                 check_seconds=PREWARM_CHECK_SECONDS):
+        super().__init__(name="astro-prewarmer", daemon=True)
+        self.cache = default_cache() if cache is None else cache
+        self.trading_days_ahead = trading_days_ahead
+        self.exchange = exchange
+        self.max_workers = max_workers
+        self.check_seconds = check_seconds
+        self.status = {"state": "starting", "days": [], "written": 0, "last_run": None, "error": None}
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                days = prewarm_days(trading_days_ahead=self.trading_days_ahead, exchange=self.exchange)
+                self.status.update(state="warming", days=days)
+                written = prewarm(days, self.cache, exchange=self.exchange, max_workers=self.max_workers)
+            except Exception as exc:  # the warmer must outlive a failed pass; the next one retries
+                self.status.update(state="failed", error=str(exc))
+            else:
+                self.status.update(state="idle", written=self.status["written"] + written,
+                                   last_run=engine_now(), error=None)
+            self._stopped.wait(self._seconds_to_next_pass())
+
+    def _seconds_to_next_pass(self):
+        """Until the next periodic check, or just past midnight (IST) if that comes first"""
+        now = engine_now()
+        rollover = datetime.combine(now.date() + timedelta(days=1), time(0, 0, 5))
+        return min(self.check_seconds, (rollover - now).total_seconds())
+
+    def stop(self):
+        """Finish the current pass and exit"""
+        self._stopped.set()
+
+
+class LiveWarmer(threading.Thread):
+    """Daemon thread that computes each coming minute's live bundle shortly before the minute starts"""
+
+    def __init__(self, lead_seconds=LIVE_LEAD_SECONDS):
+        super().__init__(name="astro-live-warmer", daemon=True)
+        self.lead_seconds = lead_seconds
+        self._stopped = threading.Event()
+
+    def run(self):
+        minute = engine_now().replace(second=0, microsecond=0)
+        while not self._stopped.is_set():
+            try:
+                live_bundle(minute, engine_params_hash())
+            except Exception:  # the live tab computes a missing bundle itself; the next minute retries
+                pass
+            minute += timedelta(minutes=1)
+            now = engine_now()
+            if minute <= now:
+                # Fell behind (e.g. a suspended host): catch up with the current minute
+                minute = now.replace(second=0, microsecond=0)
+            self._stopped.wait(max((minute - now).total_seconds() - self.lead_seconds, 0))
+
+    def stop(self):
+        """Exit after the current minute"""
+        self._stopped.set()
+
+
+def main(argv=None):
+    """Command-line entry point: one warming pass; returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Warm the result cache for today and the coming trading days")
+    parser.add_argument("--days", type=int, default=PREWARM_TRADING_DAYS, help="trading days after today")
+    parser.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(), default=None,
+                        help="warm from this date instead of today")
+    parser.add_argument("--interval", type=int, action="append", choices=sorted(INTERVAL_MINUTES.values()),
+                        help="minutes between samples; repeat for several "
+                             f"(default: {', '.join(map(str, PREWARM_INTERVALS))})")
+    parser.add_argument("--exchange", default="NSE")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    days = prewarm_days(args.start, args.days, args.exchange)
+    try:
+        written = prewarm(days, intervals=args.interval, exchange=args.exchange, max_workers=args.workers)
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"Prewarm failed: {exc}", file=sys.stderr)
+        return 1
+    print(f"Warmed {len(days)} trading days from {days[0]:%Y-%m-%d}: {written} cache entries written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
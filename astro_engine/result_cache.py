@@ -0,0 +1,186 @@
+"""Persistent SQLite cache for finished timelines and rendered reports"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+
+from .core import engine_parameters
+from .metrics import default_registry
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "ASTRO_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".astro_cache", "results.sqlite3")
+)
+
+CACHE_REQUESTS = default_registry().counter(
+    "astro_result_cache_requests_total", "Result cache lookups by result kind and outcome", ("kind", "result")
+)
+CACHE_EVICTIONS = default_registry().counter(
+    "astro_result_cache_evictions_total", "Result cache entries evicted to stay under the size limit"
+)
+
+# Evict least recently used entries once payloads exceed this many bytes
+DEFAULT_MAX_BYTES = int(os.environ.get("ASTRO_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Eviction trims down to this share of the limit so it does not run on every write
+EVICTION_TARGET = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    day TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+
+def engine_params_hash(parameters=None):
+    """Stable hash of the engine parameters; changes whenever any of them does"""
+    parameters = engine_parameters() if parameters is None else parameters
+    encoded = json.dumps(parameters, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ResultCache:
+    """Thread- and process-safe result store in a local SQLite file (WAL mode)"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._purge_stale_parameters()
+
+    @property
+    def params_hash(self):
+        """Hash of the parameters in force now; the rule file can change while running"""
+        return engine_params_hash()
+
+    def _connection(self):
+        """One connection per thread and process; forked children reconnect"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _purge_stale_parameters(self):
+        """Drop every entry computed under different engine parameters"""
+        with self._write_lock:
+            self._connection().execute("DELETE FROM results WHERE params_hash != ?", (self.params_hash,))
+
+    def make_key(self, kind, day, interval, min_aspect_weight, symbol, **extra):
+        """Cache key for one result; extra holds any other input that changes the output"""
+        fields = {
+            "kind": kind,
+            "day": str(day),
+            "interval": interval,
+            "min_aspect_weight": min_aspect_weight,
+            "symbol": symbol,
+            "params": self.params_hash
+        }
+        fields.update({name: str(value) for name, value in extra.items()})
+        return json.dumps(fields, sort_keys=True)
+
+    def get(self, kind, day, interval, min_aspect_weight, symbol, **extra):
+        """Cached value, or None on a miss"""
+        key = self.make_key(kind, day, interval, min_aspect_weight, symbol, **extra)
+        connection = self._connection()
+        row = connection.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            CACHE_REQUESTS.inc(kind=kind, result="miss")
+            return None
+        CACHE_REQUESTS.inc(kind=kind, result="hit")
+        connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def contains(self, kind, day, interval, min_aspect_weight, symbol, **extra):
+        """Whether a value is cached, without loading it"""
+        key = self.make_key(kind, day, interval, min_aspect_weight, symbol, **extra)
+        return self._connection().execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def put(self, value, kind, day, interval, min_aspect_weight, symbol, **extra):
+        """Store a value and evict old entries if the size limit is exceeded"""
+        key = self.make_key(kind, day, interval, min_aspect_weight, symbol, **extra)
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, kind, day, params_hash, payload, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, str(day), self.params_hash, payload, len(payload), now, now)
+            )
+            self._evict(connection)
+
+    def get_or_compute(self, compute, kind, day, interval, min_aspect_weight, symbol, **extra):
+        """Cached value, computing and storing it on a miss"""
+        value = self.get(kind, day, interval, min_aspect_weight, symbol, **extra)
+        if value is None:
+            value = compute()
+            self.put(value, kind, day, interval, min_aspect_weight, symbol, **extra)
+        return value
+
+    def _evict(self, connection):
+        """Remove least recently used entries until the total size is under the target"""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICTION_TARGET)
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        CACHE_EVICTIONS.inc(len(victims))
+
+    def stats(self):
+        """Entry count and payload bytes per result kind"""
+        rows = self._connection().execute(
+            "SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM results GROUP BY kind"
+        ).fetchall()
+        return {kind: {"entries": count, "bytes": size} for kind, count, size in rows}
+
+    def size_metrics(self):
+        """Metrics collector: entries and payload bytes per result kind"""
+        stats = self.stats()
+        return [
+            ("astro_result_cache_entries", "Result cache entries per result kind", "gauge", ("kind",),
+             [((kind,), values["entries"]) for kind, values in sorted(stats.items())]),
+            ("astro_result_cache_bytes", "Result cache payload bytes per result kind", "gauge", ("kind",),
+             [((kind,), values["bytes"]) for kind, values in sorted(stats.items())])
+        ]
+
+    def clear(self):
+        """Delete every cached entry"""
+        with self._write_lock:
+            self._connection().execute("DELETE FROM results")
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache():
+    """Process-wide cache at DEFAULT_CACHE_PATH"""
+    cache = ResultCache()
+    default_registry().add_collector(cache.size_metrics)
+    return cache
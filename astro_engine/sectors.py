@@ -0,0 +1,57 @@
+"""Sector exposure from sign placements, per timestamp and aggregated over long horizons
+
+Every body lends its rule-file weight to each sector of the sign it
+occupies (zodiac_market_traits). Scores come straight off the batch
+position array: sign indices select rows of a sign-by-sector matrix, so
+years of samples are a single gather and sum.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .core import aspect_rules, planet_longitudes, zodiac_market_traits
+from .divisional import SIGNS
+
+# Sectors in order of first appearance, sign by sign
+SECTORS = list(dict.fromkeys(
+    sector.strip() for sign in SIGNS for sector in zodiac_market_traits[sign]["sectors"].split(",")
+))
+
+# 1 where a sign governs a sector
+SIGN_SECTORS = np.array([
+    [sector in [s.strip() for s in zodiac_market_traits[sign]["sectors"].split(",")] for sector in SECTORS]
+    for sign in SIGNS
+], dtype=float)
+
+# Positions are sampled this often before aggregating to days or weeks
+SECTOR_SAMPLE_HOURS = 6
+
+SECTOR_PERIODS = {"Daily": "D", "Weekly": "W-MON"}
+
+
+def planet_weights(planets):
+    """Rule-file weight of each planet, in the order given"""
+    source = aspect_rules().source
+    return np.array([source["planet_weights"].get(planet, source.get("default_planet_weight", 1.0))
+                     for planet in planets], dtype=float)
+
+
+def sector_scores(times):
+    """Weighted sector exposure at each IST time, one column per sector"""
+    longitudes = planet_longitudes(times)
+    signs = np.minimum((longitudes.to_numpy() // 30).astype(int), 11)
+    weights = planet_weights(longitudes.columns)
+    scores = np.einsum("tps,p->ts", SIGN_SECTORS[signs], weights)
+    return pd.DataFrame(scores, index=longitudes.index, columns=SECTORS)
+
+
+def sector_heatmap(start, end, period="Daily"):
+    """Average sector exposure per day or week between two dates, sectors as rows
+
+    Sorted so the sectors with the most exposure over the horizon come first.
+    """
+    times = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize() + pd.Timedelta(days=1),
+                          freq=f"{SECTOR_SAMPLE_HOURS}h", inclusive="left")
+    scores = sector_scores(times)
+    heatmap = scores.resample(SECTOR_PERIODS[period], label="left", closed="left").mean().T
+    return heatmap.loc[heatmap.mean(axis=1).sort_values(ascending=False, kind="stable").index].round(3)
@@ -0,0 +1,242 @@
+"""Retrograde station detection from zero-crossings of planetary speed"""
+
+import functools
+import numpy as np
+import pandas as pd
+import swisseph as swe
+
+from .metrics import watch_lru_cache
+
+# All app timestamps are naive IST; the ephemeris works in UT Julian days
+IST_OFFSET_DAYS = 5.5 / 24
+J2000_JD = 2451545.0
+J2000_IST = np.datetime64("2000-01-01T12:00:00") + np.timedelta64(330, "m")
+
+# Bodies that actually station, with a sampling step (days) shorter than
+# their shortest retrograde or direct run so no crossing can be skipped
+STATION_BODIES = {
+    "Mercury": (swe.MERCURY, 3.0),
+    "Venus": (swe.VENUS, 5.0),
+    "Mars": (swe.MARS, 5.0),
+    "Jupiter": (swe.JUPITER, 10.0),
+    "Saturn": (swe.SATURN, 10.0),
+}
+
+# Mean lunar nodes move backwards permanently; Sun and Moon never station
+ALWAYS_RETROGRADE = {"Rahu", "Ketu"}
+
+# Default scan window, wide enough for multi-decade historical studies
+STATION_START_YEAR = 1990
+STATION_END_YEAR = 2060
+
+# Half-widths (days) of the successive parabola fits that refine each station,
+# after the first one at half a sampling step; the last fit is good to seconds
+STATION_REFINE_DAYS = (0.5, 1 / 24)
+
+# Stations this close to the analysed moment get called out in commentary
+STATION_WINDOW_DAYS = 3.0
+
+EPHEMERIS_FLAGS = swe.FLG_MOSEPH | swe.FLG_SPEED
+LONGITUDE_FLAGS = swe.FLG_MOSEPH
+
+
+def to_julian_day(times):
+    """Convert naive IST datetimes (scalar or array) to UT Julian days"""
+    times = np.asarray(times, dtype="datetime64[s]")
+    return J2000_JD + (times - J2000_IST) / np.timedelta64(1, "D")
+
+
+def from_julian_day(julian_days):
+    """Convert UT Julian days back to naive IST datetime64 values"""
+    seconds = np.round((np.asarray(julian_days, dtype=float) - J2000_JD) * 86400)
+    return J2000_IST + seconds.astype("int64").astype("timedelta64[s]")
+
+
+def _longitudes(body, julian_days):
+    """Ephemeris longitude (degrees) for every Julian day given
+
+    Swiss Ephemeris has no array interface, so this is the one per-sample
+    call; everything derived from the samples is computed on whole arrays.
+    """
+    return np.array([swe.calc_ut(jd, body, LONGITUDE_FLAGS)[0][0] for jd in np.ravel(julian_days)])
+
+
+def _offsets(longitudes, reference):
+    """Signed angular distance (degrees) of longitudes from reference, in [-180, 180)"""
+    return (longitudes - reference + 180) % 360 - 180
+
+
+def _refine_stations(body, estimates, half_widths):
+    """Stations (longitude extrema) near the estimates, by successive parabola fits
+
+    Every station is refined together: each fit samples the longitude at
+    t - h, t and t + h and moves t to the parabola's vertex.
+    """
+    station_jd = np.asarray(estimates, dtype=float)
+    for half_width in half_widths:
+        centre = _longitudes(body, station_jd)
+        before = _offsets(_longitudes(body, station_jd - half_width), centre)
+        after = _offsets(_longitudes(body, station_jd + half_width), centre)
+        curvature = before + after
+        shift = np.divide(half_width * (before - after), 2 * curvature,
+                          out=np.zeros_like(curvature), where=curvature != 0)
+        station_jd = station_jd + np.clip(shift, -half_width, half_width)
+    return station_jd
+
+
+@watch_lru_cache("planet_stations")
+@functools.lru_cache(maxsize=None)
+def _planet_stations(planet, start_year, end_year):
+    """Station times and cumulative retrograde time for one planet"""
+    body, step = STATION_BODIES[planet]
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year + 1, 1, 1, 0.0)
+
+    # Sample the longitude once per step across the whole window (one step
+    # beyond each end) and derive the speed by central differences
+    grid = np.arange(start_jd - step, end_jd + 2 * step, step)
+    unwrapped = np.unwrap(_longitudes(body, grid), period=360)
+    speeds = (unwrapped[2:] - unwrapped[:-2]) / (2 * step)
+    grid = grid[1:-1]
+
+    # A sign flip between neighbouring samples brackets exactly one station
+    retro = np.signbit(speeds)
+    crossings = np.nonzero(retro[1:] != retro[:-1])[0]
+    lo, hi = grid[crossings], grid[crossings + 1]
+    speed_lo, speed_hi = speeds[crossings], speeds[crossings + 1]
+
+    # Interpolate the speed's zero, then home in on the longitude extremum
+    estimates = lo + (hi - lo) * speed_lo / (speed_lo - speed_hi)
+    station_jd = _refine_stations(body, estimates, (step / 2,) + STATION_REFINE_DAYS)
+    retro_after = retro[crossings + 1]
+    initially_retro = bool(retro[0])
+
+    # Retrograde days accumulated from the window start up to each station
+    states = np.concatenate([[initially_retro], retro_after[:-1]])
+    segment_days = np.diff(np.concatenate([[start_jd], station_jd]))
+    cumulative_retro = np.cumsum(segment_days * states)
+
+    return start_jd, station_jd, retro_after, initially_retro, cumulative_retro
+
+
+def _longitude_speeds(body, julian_days):
+    """Ephemeris longitude speed (degrees/day) for every Julian day given"""
+    return np.array([swe.calc_ut(jd, body, EPHEMERIS_FLAGS)[0][3] for jd in np.ravel(julian_days)])
+
+
+def _scan_years(*julian_days):
+    """The default scan window, widened to whole years covering every Julian day given"""
+    julian_days = np.concatenate([np.ravel(days) for days in julian_days])
+    if not len(julian_days):
+        return STATION_START_YEAR, STATION_END_YEAR
+    first, last = swe.revjul(float(julian_days.min()))[0], swe.revjul(float(julian_days.max()))[0]
+    return min(first, STATION_START_YEAR), max(last, STATION_END_YEAR)
+
+
+def _station_state(planet, julian_days, years=(STATION_START_YEAR, STATION_END_YEAR)):
+    """Index of the last station before each Julian day plus the planet's station data"""
+    data = _planet_stations(planet, *years)
+    return np.searchsorted(data[1], julian_days, side="right"), data
+
+
+def retrograde_mask(planet, times):
+    """Whether the planet is retrograde at each of the given IST times
+
+    Inside the scan window this comes from the cached stations; outside it
+    the ephemeris speed is evaluated directly.
+    """
+    julian_days = to_julian_day(times)
+    if planet in ALWAYS_RETROGRADE:
+        return np.ones(julian_days.shape, dtype=bool)
+    if planet not in STATION_BODIES:
+        return np.zeros(julian_days.shape, dtype=bool)
+
+    idx, (_, _, retro_after, initially_retro, _) = _station_state(planet, julian_days)
+    if not len(retro_after):
+        retro = np.full(julian_days.shape, initially_retro)
+    else:
+        retro = np.where(idx == 0, initially_retro, retro_after[np.maximum(idx - 1, 0)])
+
+    # Outside the scan window the stations say nothing; read the speed's sign directly
+    window_start = swe.julday(STATION_START_YEAR, 1, 1, 0.0)
+    window_end = swe.julday(STATION_END_YEAR + 1, 1, 1, 0.0)
+    outside = (julian_days < window_start) | (julian_days >= window_end)
+    if np.any(outside):
+        retro = np.array(retro)
+        retro[outside] = _longitude_speeds(STATION_BODIES[planet][0], julian_days[outside]) < 0
+    return retro
+
+
+def _retrograde_days_since_start(planet, julian_days, years):
+    """Retrograde days accumulated from the scan window start to each Julian day"""
+    idx, (start_jd, station_jd, retro_after, initially_retro, cumulative_retro) = \
+        _station_state(planet, julian_days, years)
+    if not len(station_jd):
+        return (julian_days - start_jd) * initially_retro
+    last = np.maximum(idx - 1, 0)
+    since_station = (julian_days - station_jd[last]) * retro_after[last]
+    return np.where(idx == 0, (julian_days - start_jd) * initially_retro, cumulative_retro[last] + since_station)
+
+
+def retrograde_days(planet, start, end):
+    """Days the planet spends retrograde between two IST times (negative if end < start)
+
+    Times outside the default window scan a wider one (computed once and cached).
+    """
+    start_jd, end_jd = to_julian_day(start), to_julian_day(end)
+    if planet in ALWAYS_RETROGRADE:
+        return end_jd - start_jd
+    if planet not in STATION_BODIES:
+        return np.zeros(np.broadcast(start_jd, end_jd).shape)
+    years = _scan_years(start_jd, end_jd)
+    return _retrograde_days_since_start(planet, end_jd, years) - _retrograde_days_since_start(planet, start_jd, years)
+
+
+@watch_lru_cache("station_table")
+@functools.lru_cache(maxsize=8)
+def _station_table(start_year, end_year):
+    """All stations of all stationing bodies within the given years"""
+    frames = []
+    for planet in STATION_BODIES:
+        _, station_jd, retro_after, _, _ = _planet_stations(planet, start_year, end_year)
+        frames.append(pd.DataFrame({
+            "Planet": planet,
+            "Station": np.where(retro_after, "Stationary Retrograde", "Stationary Direct"),
+            "DateTime": from_julian_day(station_jd),
+            "Julian_Day": station_jd
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values("Julian_Day", ignore_index=True)
+
+
+def station_table(start_year=STATION_START_YEAR, end_year=STATION_END_YEAR):
+    """Retrograde and direct stations of Mercury through Saturn as a DataFrame"""
+    return _station_table(start_year, end_year).copy()
+
+
+def stations_between(start, end):
+    """Stations falling between two IST times, in chronological order"""
+    start_jd, end_jd = float(to_julian_day(start)), float(to_julian_day(end))
+    table = _station_table(STATION_START_YEAR, STATION_END_YEAR)
+    mask = (table["Julian_Day"] >= start_jd) & (table["Julian_Day"] <= end_jd)
+    return table[mask].reset_index(drop=True)
+
+
+def station_note(planet, when, window_days=STATION_WINDOW_DAYS):
+    """Short commentary if the planet stations within window_days of the given time"""
+    if planet not in STATION_BODIES:
+        return ""
+    _, station_jd, retro_after, _, _ = _planet_stations(planet, STATION_START_YEAR, STATION_END_YEAR)
+    # First station from the start of the window on, found by binary search
+    julian_day = float(to_julian_day(when))
+    first = int(np.searchsorted(station_jd, julian_day - window_days, side="left"))
+    if first == len(station_jd) or station_jd[first] > julian_day + window_days:
+        return ""
+    station_time = pd.Timestamp(from_julian_day(station_jd[first])).to_pydatetime()
+    verb = "stations" if station_time >= when else "stationed"
+    return f"{verb} {'retrograde' if retro_after[first] else 'direct'} on {station_time.strftime('%d-%b %H:%M')}"
+
+
+def warm_station_cache():
+    """Compute every planet's stations up front (e.g. in each worker process)"""
+    for planet in STATION_BODIES:
+        _planet_stations(planet, STATION_START_YEAR, STATION_END_YEAR)
@@ -0,0 +1,68 @@
+"""Row style classes and paging for large result tables"""
+
+import numpy as np
+import pandas as pd
+
+# Row CSS per style class; computed once per table instead of once per cell
+SIGNAL_ROW_CSS = {
+    "strong-buy": 'background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); color: white; font-weight: bold;',
+    "buy": 'background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%); color: #2c5aa0;',
+    "strong-sell": 'background: linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%); color: white; font-weight: bold;',
+    "sell": 'background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%); color: #8b4513;',
+    "neutral": ''
+}
+
+TENDENCY_ROW_CSS = {
+    "bullish": 'background-color: #e8f5e8; color: #2e7d32;',
+    "bearish": 'background-color: #ffebee; color: #c62828;',
+    "neutral": ''
+}
+
+CRITICALITY_ROW_CSS = {
+    "critical-high": 'background-color: #ff6b6b; color: white; font-weight: bold;',
+    "critical-medium": 'background-color: #ffa726; color: white;',
+    "critical-low": 'background-color: #66bb6a; color: white;'
+}
+
+SIGNAL_ROW_CLASSES = {
+    "Strong Buy": "strong-buy",
+    "Buy": "buy",
+    "Strong Sell": "strong-sell",
+    "Sell": "sell"
+}
+
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def signal_row_classes(signals):
+    """Style class for each row from its Signal"""
+    return pd.Series(signals).map(SIGNAL_ROW_CLASSES).fillna("neutral").to_numpy()
+
+
+def tendency_row_classes(tendencies):
+    """Style class for each row from its Tendency"""
+    return pd.Series(tendencies).str.lower().where(lambda t: t.isin(["bullish", "bearish"]), "neutral").to_numpy()
+
+
+def criticality_row_classes(scores):
+    """Style class for each row from its numeric criticality score"""
+    scores = np.asarray(scores, dtype=float)
+    return np.select([scores > 8, scores > 5], ["critical-high", "critical-medium"], "critical-low")
+
+
+def page_count(n_rows, page_size):
+    """Number of pages needed for n_rows (at least one)"""
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(n_rows, page, page_size):
+    """Row positions shown on a 1-based page"""
+    start = (min(max(page, 1), page_count(n_rows, page_size)) - 1) * page_size
+    return slice(start, min(start + page_size, n_rows))
+
+
+def style_rows(df, row_classes, css_by_class):
+    """Styler for df whose whole rows take the CSS of their precomputed class"""
+    css = pd.Series(row_classes).map(css_by_class).fillna("").to_numpy(dtype=object)
+    styles = pd.DataFrame(np.repeat(css[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+    return df.style.apply(lambda _: styles, axis=None)
@@ -0,0 +1,673 @@
+"""Intraday timelines for single days and for trading-day ranges"""
+
+import calendar
+import functools
+from concurrent.futures import as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .core import (
+    analyze_market_session,
+    aspect_rules,
+    calculate_enhanced_trading_signal,
+    calculate_planetary_positions,
+    detect_planetary_transits,
+    generate_daily_report,
+    outlook_thresholds,
+    phase_bonuses,
+    signal_thresholds,
+    transit_direction
+)
+from .aspect_rules import TENDENCIES
+from .aspect_tracker import AspectTracker
+from .dynamics import separation_rate
+from .exchanges import EXCHANGES, group_by_exchange, market_hours, session_codes, session_times, to_engine, to_local
+from .jobs import process_pool
+from .metrics import timed, watch_lru_cache
+from .muhurta import CHOGHADIYAS, HORA_LORDS, timing_columns
+from .panchang import KARANAS, NAKSHATRAS, TITHIS, YOGAS, panchang_at
+from .result_cache import engine_params_hash
+from .trading_calendar import is_trading_day, trading_days
+
+# Analysis intervals offered in the UI, in minutes
+INTERVAL_MINUTES = {
+    "1 minute": 1,
+    "5 minutes": 5,
+    "15 minutes": 15,
+    "30 minutes": 30,
+    "1 hour": 60
+}
+
+SIGNAL_CLASSES = ["Strong Buy", "Buy", "Neutral", "Sell", "Strong Sell"]
+
+# Indices offered in the UI; the daily report selects the first two by default
+INDEX_SYMBOLS = ["NIFTY", "BANKNIFTY", "SENSEX", "FINNIFTY"]
+DEFAULT_REPORT_SYMBOLS = ["NIFTY", "BANKNIFTY"]
+
+# Indices the daily report covers, on every supported exchange
+REPORT_INDEX_SYMBOLS = [symbol for info in EXCHANGES.values() for symbol in info["indices"]]
+
+# Interval of the report timeline, in minutes
+REPORT_INTERVAL_MINUTES = 30
+
+# Timeline rows whose explanations (and positions) stay memoized, about twenty pages of the default size
+EXPLANATION_CACHE_ROWS = 2048
+
+# Fixed categories so timelines of different days concatenate without losing their dtypes
+SESSION_LABELS = [
+    "🌅 Pre-Market", "🔔 Opening", "🌄 Morning", "🌇 Mid-Session", "🌆 Afternoon", "🌃 Closing", "🌙 After-Hours"
+]
+OUTLOOK_LABELS = [
+    f"{emoji} {outlook}{suffix}"
+    for emoji, outlook in [("🚀", "Strong Bullish"), ("📈", "Bullish"), ("➡️", "Neutral"),
+                           ("📉", "Bearish"), ("💥", "Strong Bearish")]
+    for suffix in ["", " (Gap Up Likely)", " (Gap Down Likely)", " (Positive Close)", " (Negative Close)"]
+]
+STRENGTH_LEVELS = ["Low", "Medium", "High"]
+
+TIMELINE_DTYPES = {
+    "Day": pd.CategoricalDtype(list(calendar.day_name)),
+    "Session": pd.CategoricalDtype(SESSION_LABELS, ordered=True),
+    "Signal": pd.CategoricalDtype(SIGNAL_CLASSES),
+    "Session_Outlook": pd.CategoricalDtype(OUTLOOK_LABELS),
+    "Strength": pd.CategoricalDtype(STRENGTH_LEVELS, ordered=True),
+    "Hora": pd.CategoricalDtype(HORA_LORDS),
+    "Choghadiya": pd.CategoricalDtype(CHOGHADIYAS),
+    "Tithi": pd.CategoricalDtype(TITHIS),
+    "Karana": pd.CategoricalDtype(KARANAS),
+    "Yoga": pd.CategoricalDtype(YOGAS),
+    "Panchang_Nakshatra": pd.CategoricalDtype(NAKSHATRAS),
+    "Active_Aspects": "int16",
+    "New_Aspects": "int16",
+    "Dissolved_Aspects": "int16"
+}
+
+# Free-text columns rebuilt on demand by explain_timeline_rows
+EXPLANATION_COLUMNS = ["Transits", "Aspect_Changes", "Combo_Effects", "Signal_Details", "Signal_Reasons"]
+
+# One row per active aspect per step, as compute_day_aspects stores them
+STEP_ASPECT_DTYPES = {
+    "Step": "int32", "Aspect_Id": "int32", "Weight": "float64", "Tendency": "int8", "Strong": "bool", "Applying": "bool"
+}
+
+ASPECT_COLUMNS = [
+    "Planet1", "Planet2", "Aspect", "Exact_Degree", "Orb", "Weight", "Tendency", "Strength",
+    "Phase", "Hours_To_Exact", "Nature", "Market_Effect", "Combo_Effect"
+]
+
+
+def encode_aspect_ids(aspects):
+    """Space-separated ids of aspect rows (numbered by the aspect rules), in their original order"""
+    rules = aspect_rules()
+    return " ".join(str(rules.aspect_id(a["Planet1"], a["Planet2"], a["Aspect"])) for a in aspects)
+
+
+def decode_aspect_ids(encoded):
+    """Aspect ids stored by encode_aspect_ids"""
+    return [int(aspect_id) for aspect_id in encoded.split()]
+
+
+def aspects_from_ids(aspect_ids, positions):
+    """Full aspect rows for stored ids, measured from positions"""
+    rules = aspect_rules()
+    degrees = dict(zip(positions["Planet"], positions["Full_Degree"]))
+    speeds = dict(zip(positions["Planet"], positions["Speed"]))
+    aspects = []
+    for aspect_id in aspect_ids:
+        p1, p2, aspect = rules.aspect_key(aspect_id)
+        diff = abs(degrees[p2] - degrees[p1])
+        if diff > 180:
+            diff = 360 - diff
+        rate = float(separation_rate(degrees[p1], degrees[p2], speeds[p1], speeds[p2]))
+        aspects.append(rules.entry(p1, p2, diff, aspect, rate))
+    return aspects
+
+
+def _sample_aspects(times, progress=None):
+    """Positions and aspect rows (Aspect_Id, Weight, Tendency, Strong, Applying) at every engine time, in order"""
+    rules = aspect_rules()
+    aspect_tracker = AspectTracker()
+    samples = []
+    for count, current_time in enumerate(times):
+        if progress:
+            progress(count / max(len(times) - 1, 1),
+                     f"🔮 Analyzing: {current_time.strftime('%H:%M')} ({count + 1}/{len(times)})")
+
+        # Calculate positions and aspects (slow pairs are only re-checked when they can change)
+        positions = calculate_planetary_positions(current_time)
+        aspects_df, _ = aspect_tracker.get_aspects(positions, current_time)
+        samples.append((positions, [
+            (
+                rules.aspect_id(aspect["Planet1"], aspect["Planet2"], aspect["Aspect"]),
+                aspect["Weight"],
+                TENDENCIES.index(aspect["Tendency"]),
+                aspect["Strength"] == "Strong",
+                aspect["Phase"] == "Applying"
+            )
+            for aspect in aspects_df.to_dict("records")
+        ]))
+    return samples
+
+
+def _label_steps(times, samples, exchange="NSE"):
+    """(steps, aspects) of an exchange's samples, labelled in its local time"""
+    aspects = pd.DataFrame(
+        [(step,) + row for step, (_, rows) in enumerate(samples) for row in rows], columns=list(STEP_ASPECT_DTYPES)
+    ).astype(STEP_ASPECT_DTYPES)
+    if not samples:
+        return pd.DataFrame(), aspects
+
+    # Transits only score their direction, whatever the aspect filter
+    transit_bullish, transit_bearish, previous_positions = [], [], None
+    for positions, _ in samples:
+        transits = detect_planetary_transits(positions, previous_positions) if previous_positions is not None else []
+        directions = [transit_direction(transit) for transit in transits]
+        transit_bullish.append(directions.count(1))
+        transit_bearish.append(directions.count(-1))
+        previous_positions = positions
+
+    local = to_local(times, exchange)
+    steps_df = pd.DataFrame({
+        "DateTime": local.strftime("%Y-%m-%d %H:%M"),
+        "Time": local.strftime("%H:%M"),
+        "Day": local.strftime("%A"),
+        "Session": np.array(SESSION_LABELS)[session_codes(local, exchange)],
+        "Transit_Bullish": transit_bullish,
+        "Transit_Bearish": transit_bearish
+    })
+    # Sunrise-based timings and the Panchang are labelled for the whole day in one pass, in engine time
+    engine_times = pd.DatetimeIndex(times)
+    timings = timing_columns(engine_times, exchange).reset_index(drop=True)
+    panchang = panchang_at(engine_times).rename(columns={"Nakshatra": "Panchang_Nakshatra"}).reset_index(drop=True)
+    steps_df = pd.concat([steps_df, timings, panchang], axis=1)
+    return steps_df.astype({column: dtype for column, dtype in TIMELINE_DTYPES.items() if column in steps_df}), aspects
+
+
+@timed("compute_day_aspects")
+def compute_day_aspects(start_datetime, end_datetime, interval_minutes, progress=None):
+    """Unfiltered aspects and transits of every step between two datetimes
+
+    Nothing here depends on the minimum aspect weight or the display
+    options; score_timeline applies those afterwards, so changing them never
+    recomputes positions. Returns (steps, aspects): one row per timestamp
+    with its session, transit scores, timings and Panchang, and one row per
+    active aspect with its Step, Aspect_Id, Weight, Tendency and its Strong
+    and Applying flags, in get_aspects order.
+    """
+    times = pd.date_range(start_datetime, end_datetime, freq=f"{interval_minutes}min").to_pydatetime().tolist()
+    return _label_steps(times, _sample_aspects(times, progress))
+
+
+@timed("compute_exchange_aspects")
+def compute_exchange_aspects(day, exchanges, interval_minutes, progress=None, start_time=None, end_time=None):
+    """Unfiltered aspects of each exchange's session on its local date day
+
+    Positions and aspects are computed once for the union of the sessions'
+    engine times and projected onto each exchange's own samples, so
+    exchanges sharing instants (NSE and BSE) cost no more than one. Returns
+    {exchange: (steps, aspects)} as compute_day_aspects does, with times in
+    exchange-local time. start_time and end_time (local) narrow every
+    session.
+    """
+    grids = {exchange: session_times(day, exchange, interval_minutes, start_time, end_time).to_pydatetime().tolist()
+             for exchange in exchanges}
+    union = sorted(set().union(*grids.values()))
+    samples = dict(zip(union, _sample_aspects(union, progress)))
+    return {exchange: _label_steps(times, [samples[moment] for moment in times], exchange)
+            for exchange, times in grids.items()}
+
+
+@timed("score_timeline")
+def score_timeline(steps, aspects, min_aspect_weight=1.0, show_transits=True):
+    """Timeline rows from compute_day_aspects output, filtered and scored in whole-array passes
+
+    Gives the same rows as scoring every step with get_aspects and
+    calculate_enhanced_trading_signal, and a step with no aspects left is
+    Neutral with zero scores. Formations and dissolutions are only counted
+    for display, against the previous step of the same day after
+    filtering; scoring uses each aspect's own phase. steps may
+    hold several days (the range timeline concatenates them).
+    """
+    if steps.empty:
+        return pd.DataFrame()
+    n_steps = len(steps)
+    kept = aspects[aspects["Weight"].to_numpy() >= min_aspect_weight]
+    step = kept["Step"].to_numpy()
+    aspect_ids = kept["Aspect_Id"].to_numpy().astype("int64")
+    weight = kept["Weight"].to_numpy()
+    strong = kept["Strong"].to_numpy()
+    applying = kept["Applying"].to_numpy()
+    bullish = kept["Tendency"].to_numpy() == TENDENCIES.index("Bullish")
+    bearish = kept["Tendency"].to_numpy() == TENDENCIES.index("Bearish")
+
+    def per_step(values, at=step):
+        return np.bincount(at, weights=values, minlength=n_steps)
+
+    active = np.bincount(step, minlength=n_steps)
+
+    # Formations and dissolutions count only against a previous step of the same day with aspects
+    dates = steps["DateTime"].to_numpy().astype("U10")
+    continues = np.zeros(n_steps, dtype=bool)
+    continues[1:] = (dates[1:] == dates[:-1]) & (active[:-1] > 0)
+    stride = int(aspect_ids.max()) + 1 if len(aspect_ids) else 1
+    keys = np.sort(step * stride + aspect_ids)
+
+    def present(candidates):
+        found = np.minimum(np.searchsorted(keys, candidates), max(len(keys) - 1, 0))
+        return keys[found] == candidates if len(keys) else np.zeros(len(candidates), dtype=bool)
+
+    is_new = continues[step] & ~present((step - 1) * stride + aspect_ids)
+    next_step = np.minimum(step + 1, n_steps - 1)
+    is_dissolved = (step + 1 < n_steps) & continues[next_step] & ~present((step + 1) * stride + aspect_ids)
+    new_count = per_step(is_new)
+    dissolved_count = per_step(is_dissolved, next_step)
+
+    # Aspect scores, bonuses for strong applying aspects and reversals for moderate separating ones
+    multiplier = np.where(strong, 1.5, 1.0)
+    multiplier += np.where(applying & strong, phase_bonuses["applying"], 0.0)
+    reversal = np.where(~applying & ~strong, phase_bonuses["separating"], 0.0)
+    bull = per_step(weight * (multiplier * bullish + reversal * bearish))
+    bear = per_step(weight * (multiplier * bearish + reversal * bullish))
+    if show_transits:
+        bull += steps["Transit_Bullish"].to_numpy()
+        bear += steps["Transit_Bearish"].to_numpy()
+
+    session = pd.Categorical(steps["Session"], dtype=TIMELINE_DTYPES["Session"]).codes
+    opening, closing = session == SESSION_LABELS.index("🔔 Opening"), session == SESSION_LABELS.index("🌃 Closing")
+    scale = np.select([opening, closing], [1.2, 0.9], 1.0)
+    bull = np.where(active > 0, bull * scale, 0.0)
+    bear = np.where(active > 0, bear * scale, 0.0)
+
+    net = bull - bear
+    total = bull + bear
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(total > 0, np.abs(net) / total, 0.0)
+    signal = np.select(
+        [(ratio > signal_thresholds["strong"]) & (net > 0), ratio > signal_thresholds["strong"],
+         (ratio > signal_thresholds["moderate"]) & (net > 0), ratio > signal_thresholds["moderate"]],
+        [SIGNAL_CLASSES.index(label) for label in ["Strong Buy", "Strong Sell", "Buy", "Sell"]],
+        SIGNAL_CLASSES.index("Neutral")
+    )
+
+    # Session outlook from the unscaled weights, as analyze_market_session does it;
+    # OUTLOOK_LABELS holds five suffixes for each of the five outlooks
+    total_weight = per_step(weight)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bullish_ratio = np.where(total_weight > 0, per_step(weight * bullish) / total_weight, 0.0)
+        bearish_ratio = np.where(total_weight > 0, per_step(weight * bearish) / total_weight, 0.0)
+    outlook = np.select(
+        [bullish_ratio > outlook_thresholds["strong"], bullish_ratio > outlook_thresholds["moderate"],
+         bearish_ratio > outlook_thresholds["strong"], bearish_ratio > outlook_thresholds["moderate"]],
+        [0, 1, 4, 3], 2
+    )
+    more_bullish, more_bearish = per_step(bullish) > per_step(bearish), per_step(bearish) > per_step(bullish)
+    suffix = np.select(
+        [opening & more_bullish, opening & more_bearish, closing & more_bullish, closing & more_bearish],
+        [1, 2, 3, 4], 0
+    )
+
+    # Ids of the remaining aspects, step by step in their original order
+    id_text = kept["Aspect_Id"].astype(str).tolist()
+    bounds = np.concatenate([[0], np.cumsum(active)]).tolist()
+    encoded = [" ".join(id_text[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    # Python's correctly rounded round(), not np.round, so scores match the per-step path exactly
+    bull, bear = (np.array([round(value, 2) for value in scores.tolist()]) for scores in (bull, bear))
+    timeline_df = pd.DataFrame({
+        "DateTime": steps["DateTime"].to_numpy(),
+        "Time": steps["Time"].to_numpy(),
+        "Day": steps["Day"].to_numpy(),
+        "Session": steps["Session"].to_numpy(),
+        "Signal": pd.Categorical.from_codes(signal, dtype=TIMELINE_DTYPES["Signal"]),
+        "Net_Score": [round(value, 2) for value in (bull - bear).tolist()],
+        "Bullish_Weight": bull,
+        "Bearish_Weight": bear,
+        "Active_Aspects": active,
+        "Session_Outlook": pd.Categorical.from_codes(outlook * 5 + suffix, dtype=TIMELINE_DTYPES["Session_Outlook"]),
+        "Strength": pd.Categorical.from_codes(np.select([total_weight > 10, total_weight > 5], [2, 1], 0),
+                                              dtype=TIMELINE_DTYPES["Strength"]),
+        "New_Aspects": new_count.astype(int),
+        "Dissolved_Aspects": dissolved_count.astype(int),
+        "Aspect_Ids": encoded
+    })
+    extra = [column for column in steps.columns if column not in timeline_df and not column.startswith("Transit_")]
+    timeline_df = pd.concat([timeline_df, steps[extra].reset_index(drop=True)], axis=1)
+    return timeline_df.astype({column: dtype for column, dtype in TIMELINE_DTYPES.items() if column in timeline_df})
+
+
+def compute_day_timeline(start_datetime, end_datetime, interval_minutes, min_aspect_weight=1.0,
+                         show_transits=True, progress=None):
+    """Build the enhanced intraday timeline between two datetimes
+
+    Rows hold categorical and numeric columns plus the ids of the active
+    aspects; the free-text explanations, aspect combinations included, are
+    left to explain_timeline_rows.
+    """
+    steps, aspects = compute_day_aspects(start_datetime, end_datetime, interval_minutes, progress)
+    return score_timeline(steps, aspects, min_aspect_weight, show_transits)
+
+
+def _aspect_key(aspect):
+    """Identity of an aspect row across steps"""
+    return aspect["Planet1"], aspect["Planet2"], aspect["Aspect"]
+
+
+def aspect_changes(aspects, previous_aspects):
+    """Aspects newly formed and dissolved since the previous step"""
+    if not previous_aspects:
+        return [], []
+    previous_keys = set(map(_aspect_key, previous_aspects))
+    current_keys = set(map(_aspect_key, aspects))
+    new_aspects = [a for a in aspects if _aspect_key(a) not in previous_keys]
+    dissolved_aspects = [a for a in previous_aspects if _aspect_key(a) not in current_keys]
+    return new_aspects, dissolved_aspects
+
+
+@watch_lru_cache("row_positions")
+@functools.lru_cache(maxsize=EXPLANATION_CACHE_ROWS)
+def _row_positions(timestamp, params_hash):
+    """Positions at a timeline row's "%Y-%m-%d %H:%M" time; adjacent rows share them as current and previous"""
+    return calculate_planetary_positions(datetime.strptime(timestamp, "%Y-%m-%d %H:%M"))
+
+
+@watch_lru_cache("row_explanations")
+@functools.lru_cache(maxsize=EXPLANATION_CACHE_ROWS)
+def _explain_row(timestamp, session_time, aspect_ids, previous_timestamp, previous_aspect_ids,
+                 show_transits, show_combos, params_hash):
+    """Explanation of one timeline row from its stored aspect ids and those of the step before (if any)"""
+    positions = _row_positions(timestamp, params_hash)
+    aspects = aspects_from_ids(decode_aspect_ids(aspect_ids), positions)
+    aspects_df = pd.DataFrame(aspects, columns=ASPECT_COLUMNS)
+
+    new_aspects, dissolved_aspects, transits = [], [], []
+    if previous_timestamp is not None:
+        previous_positions = _row_positions(previous_timestamp, params_hash)
+        previous_aspects = aspects_from_ids(decode_aspect_ids(previous_aspect_ids), previous_positions)
+        new_aspects, dissolved_aspects = aspect_changes(aspects, previous_aspects)
+        if show_transits:
+            transits = detect_planetary_transits(positions, previous_positions)
+
+    session_info = analyze_market_session(session_time, aspects_df, positions)
+    _, _, _, _, signal_details, signal_reasons = calculate_enhanced_trading_signal(
+        aspects_df, session_info, transits
+    )
+
+    # Aspect combinations
+    combo_effects = []
+    if show_combos:
+        combo_effects = [a["Combo_Effect"] for a in aspects if a["Combo_Effect"]]
+
+    # Format transit information
+    transit_text = "None"
+    if transits:
+        major_transits = [t for t in transits if t["strength"] == "High"]
+        if major_transits:
+            transit_text = "; ".join([f"{t['planet']} {t['change']}" for t in major_transits])
+        else:
+            transit_text = "; ".join([f"{t['planet']} {t['change']}" for t in transits[:2]])
+
+    # New/Dissolved aspects info
+    change_text = [f"NEW: {a['Planet1']}-{a['Planet2']} {a['Aspect']}" for a in new_aspects]
+    change_text.extend([f"END: {a['Planet1']}-{a['Planet2']} {a['Aspect']}" for a in dissolved_aspects])
+
+    return {
+        "Transits": transit_text,
+        "Aspect_Changes": "; ".join(change_text) if change_text else "None",
+        "Combo_Effects": "; ".join(combo_effects) if combo_effects else "None",
+        "Signal_Details": signal_details,
+        "Signal_Reasons": "; ".join(signal_reasons[:3]) if signal_reasons else "Base aspects only"
+    }
+
+
+@timed("explain_timeline_rows")
+def explain_timeline_rows(timeline_df, rows, show_transits=True, show_combos=True, exchange="NSE"):
+    """Explanation text for the timeline rows labelled rows, rebuilt from their stored aspect ids
+
+    Only the requested rows (and the step before each) have their positions
+    recomputed, so a viewed page costs the same however long the timeline is.
+    Explanations and positions are memoized per row time and options, so a
+    rerun or a revisited page only looks them up. exchange is the one whose
+    local time labels the rows.
+    """
+    params_hash = engine_params_hash()
+
+    def engine_timestamp(timestamp):
+        local = datetime.strptime(timestamp, "%Y-%m-%d %H:%M")
+        return to_engine(local, exchange).strftime("%Y-%m-%d %H:%M")
+
+    explanations = {}
+    for row in rows:
+        position = timeline_df.index.get_loc(row)
+        current = timeline_df.iloc[position]
+
+        # The previous step only counts when it belongs to the same day
+        previous = timeline_df.iloc[position - 1] if position > 0 else None
+        if previous is not None and previous["DateTime"][:10] != current["DateTime"][:10]:
+            previous = None
+
+        explanations[row] = _explain_row(
+            engine_timestamp(current["DateTime"]), current["Time"], current["Aspect_Ids"],
+            None if previous is None else engine_timestamp(previous["DateTime"]),
+            None if previous is None else previous["Aspect_Ids"],
+            show_transits, show_combos, params_hash
+        )
+
+    return pd.DataFrame.from_dict(explanations, orient="index", columns=EXPLANATION_COLUMNS)
+
+
+REPORT_COLUMNS = [
+    "DateTime", "Signal", "Active_Aspects", "Bullish_Weight", "Bearish_Weight", "Session", "Session_Outlook"
+]
+
+
+def report_timeline(steps, aspects):
+    """Report timeline from compute_day_aspects output: every aspect scored, transits left out"""
+    if steps.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    timeline_df = score_timeline(steps, aspects, min_aspect_weight=0.0, show_transits=False)[REPORT_COLUMNS]
+    # The report names sessions and outlooks without their emoji
+    return timeline_df.assign(
+        Signal=timeline_df["Signal"].astype(str),
+        Active_Aspects=timeline_df["Active_Aspects"].astype("int64"),
+        Session=timeline_df["Session"].astype(str).str.split(" ", n=1).str[1].astype(str),
+        Session_Outlook=timeline_df["Session_Outlook"].astype(str).str.split(" ", n=1).str[1].astype(str)
+    )
+
+
+@timed("compute_report_timeline")
+def compute_report_timeline(report_date, interval_minutes=REPORT_INTERVAL_MINUTES, exchange="NSE"):
+    """Session timeline used by the professional daily report, in the exchange's local time"""
+    return report_timeline(*compute_exchange_aspects(report_date, [exchange], interval_minutes)[exchange])
+
+
+def compute_exchange_report_timelines(report_date, exchanges, interval_minutes=REPORT_INTERVAL_MINUTES, progress=None):
+    """{exchange: report timeline} of several exchanges, from positions computed once for all of them"""
+    day_aspects = compute_exchange_aspects(report_date, exchanges, interval_minutes, progress)
+    return {exchange: report_timeline(steps, aspects) for exchange, (steps, aspects) in day_aspects.items()}
+
+
+@timed("compute_daily_report")
+def compute_daily_report(report_date, timeline_df=None, symbols=DEFAULT_REPORT_SYMBOLS, exchange="NSE"):
+    """Rendered daily report for a date, indices and exchange, from its report timeline and opening positions"""
+    if timeline_df is None:
+        timeline_df = compute_report_timeline(report_date, exchange=exchange)
+    opening, _ = market_hours(exchange)
+    opening_positions = calculate_planetary_positions(
+        to_engine(datetime.combine(report_date, opening), exchange), station_notes=True
+    )
+    return generate_daily_report(report_date, opening_positions, timeline_df, symbols, exchange)
+
+
+@timed("compute_exchange_reports")
+def compute_exchange_reports(report_date, symbols=DEFAULT_REPORT_SYMBOLS, cache=None, progress=None):
+    """{exchange: (report timeline, rendered report)} of the indices' exchanges that trade on report_date
+
+    Each exchange reports on its own indices in its own session and time
+    zone. Entries found in the result cache (if given) are reused, and the
+    positions of every exchange still missing are computed in one pass.
+    progress is called at every step and before each exchange's report.
+    """
+    grouped = {
+        exchange: exchange_symbols for exchange, exchange_symbols in group_by_exchange(symbols).items()
+        if is_trading_day(report_date, exchange)
+    }
+    keys = {exchange: report_cache_fields(report_date, grouped[exchange], exchange) for exchange in grouped}
+    timelines = {}
+    if cache is not None:
+        for exchange in grouped:
+            cached = cache.get(kind="report_timeline", **keys[exchange])
+            if cached is not None:
+                timelines[exchange] = cached
+    missing = [exchange for exchange in grouped if exchange not in timelines]
+    if missing:
+        # Sampling the positions takes most of the time, so it spans the first 80% of the progress bar
+        def sample_progress(fraction, message):
+            progress(0.8 * fraction, message)
+
+        day_timelines = compute_exchange_report_timelines(report_date, missing,
+                                                          progress=sample_progress if progress else None)
+        for exchange, timeline_df in day_timelines.items():
+            timelines[exchange] = timeline_df
+            if cache is not None:
+                cache.put(timeline_df, kind="report_timeline", **keys[exchange])
+
+    reports = {}
+    for count, (exchange, exchange_symbols) in enumerate(grouped.items()):
+        if progress:
+            progress(0.8 + 0.2 * count / len(grouped), f"📜 Writing the {exchange} report ({count + 1}/{len(grouped)})")
+        report = cache.get(kind="daily_report", **keys[exchange]) if cache is not None else None
+        if report is None:
+            report = compute_daily_report(report_date, timelines[exchange], exchange_symbols, exchange)
+            if cache is not None:
+                cache.put(report, kind="daily_report", **keys[exchange])
+        reports[exchange] = (timelines[exchange], report)
+    return reports
+
+
+def summarize_day(day, timeline_df):
+    """One summary row for a single day's timeline"""
+    signal_counts = timeline_df["Signal"].value_counts()
+    summary = {
+        "Date": day.strftime("%Y-%m-%d"),
+        "Day": day.strftime("%A"),
+        "Intervals": len(timeline_df)
+    }
+    for signal in SIGNAL_CLASSES:
+        summary[signal] = int(signal_counts.get(signal, 0))
+    summary.update({
+        "Dominant_Signal": signal_counts.idxmax() if not signal_counts.empty else "Neutral",
+        "Avg_Net_Score": round(timeline_df["Net_Score"].mean(), 2) if "Net_Score" in timeline_df else 0.0,
+        "Peak_Bullish_Time": timeline_df.loc[timeline_df["Bullish_Weight"].idxmax(), "DateTime"].split(" ")[1],
+        "Peak_Bearish_Time": timeline_df.loc[timeline_df["Bearish_Weight"].idxmax(), "DateTime"].split(" ")[1],
+        "Max_Active_Aspects": int(timeline_df["Active_Aspects"].max())
+    })
+    return summary
+
+
+def day_aspects_cache_fields(day, start_time, end_time, interval_minutes):
+    """Result cache key fields for one day's unfiltered aspects, shared by every index and filter"""
+    return {
+        "kind": "day_aspects",
+        "day": day,
+        "interval": interval_minutes,
+        "min_aspect_weight": None,
+        "symbol": None,
+        "start": start_time,
+        "end": end_time
+    }
+
+
+def report_cache_fields(day, symbols, exchange="NSE"):
+    """Result cache key fields shared by a day's report timeline and rendered report on one exchange"""
+    return {
+        "day": day,
+        "interval": REPORT_INTERVAL_MINUTES,
+        "min_aspect_weight": None,
+        "symbol": ",".join(symbols),
+        "exchange": exchange
+    }
+
+
+def combine_day_aspects(day_results):
+    """One (steps, aspects) pair for several days, with a Date column and renumbered steps"""
+    steps, aspects, offset = [], [], 0
+    for day, (day_steps, day_aspects) in day_results:
+        if day_steps.empty:
+            continue
+        steps.append(day_steps.assign(Date=day.strftime("%Y-%m-%d")))
+        aspects.append(day_aspects.assign(Step=day_aspects["Step"] + offset))
+        offset += len(day_steps)
+    if not steps:
+        return pd.DataFrame(), pd.DataFrame(columns=list(STEP_ASPECT_DTYPES)).astype(STEP_ASPECT_DTYPES)
+    return pd.concat(steps, ignore_index=True), pd.concat(aspects, ignore_index=True)
+
+
+@timed("compute_range_aspects")
+def compute_range_aspects(start_date, end_date, start_time, end_time, interval_minutes, exchange="NSE",
+                          max_workers=None, progress=None, cache=None):
+    """Unfiltered aspects of every trading day in a date range, one process per day
+
+    Days already in the result cache are reused; only the rest are computed.
+    Returns the days combined as by combine_day_aspects.
+    """
+    days = trading_days(start_date, end_date, exchange)
+    cache_fields = {day: day_aspects_cache_fields(day, start_time, end_time, interval_minutes) for day in days}
+    results = {}
+    if cache is not None:
+        for day in days:
+            cached = cache.get(**cache_fields[day])
+            if cached is not None:
+                results[day] = cached
+
+    pending = {
+        day: (datetime.combine(day, start_time), datetime.combine(day, end_time), interval_minutes)
+        for day in days if day not in results
+    }
+
+    def finish(day, day_aspects):
+        results[day] = day_aspects
+        if cache is not None:
+            cache.put(day_aspects, **cache_fields[day])
+        if progress:
+            progress(len(results) / len(days), f"🔮 Analyzed {day.strftime('%d %b %Y')} ({len(results)}/{len(days)})")
+
+    if len(pending) == 1 or max_workers == 1:
+        for day, args in pending.items():
+            finish(day, compute_day_aspects(*args))
+    elif pending:
+        with process_pool(max_workers) as pool:
+            futures = {pool.submit(compute_day_aspects, *args): day for day, args in pending.items()}
+            try:
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+            except BaseException:
+                # A cancelled or failed range drops the days not yet started instead of waiting for them
+                pool.shutdown(cancel_futures=True)
+                raise
+
+    return combine_day_aspects((day, results[day]) for day in days)
+
+
+def summarize_range(timeline_df):
+    """Per-day summary rows of a range timeline with a Date column"""
+    if timeline_df.empty:
+        return pd.DataFrame()
+    return pd.DataFrame([
+        summarize_day(pd.Timestamp(day), day_df) for day, day_df in timeline_df.groupby("Date", sort=False)
+    ])
+
+
+def compute_range_timeline(start_date, end_date, start_time, end_time, interval_minutes, min_aspect_weight=1.0,
+                           show_transits=True, exchange="NSE", max_workers=None, progress=None, cache=None):
+    """Timelines for every trading day in a date range, one process per day
+
+    Returns the combined timeline (with a Date column) and a per-day summary.
+    """
+    steps, aspects = compute_range_aspects(start_date, end_date, start_time, end_time, interval_minutes,
+                                           exchange, max_workers, progress, cache)
+    if steps.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    timeline_df = score_timeline(steps, aspects, min_aspect_weight, show_transits)
+    return timeline_df, summarize_range(timeline_df)
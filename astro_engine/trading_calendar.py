@@ -0,0 +1,34 @@
+"""Exchange trading calendar backed by the bundled holiday file"""
+
+import functools
+import os
+from datetime import timedelta
+
+import pandas as pd
+
+HOLIDAY_FILE = os.path.join(os.path.dirname(__file__), "data", "exchange_holidays.csv")
+
+
+@functools.lru_cache(maxsize=None)
+def load_holidays(exchange="NSE"):
+    """Holiday dates of an exchange from the bundled holiday file"""
+    holidays = pd.read_csv(HOLIDAY_FILE, comment="#", parse_dates=["date"])
+    return tuple(sorted(holidays.loc[holidays["exchange"] == exchange, "date"].dt.date))
+
+
+def is_trading_day(day, exchange="NSE"):
+    """Whether the exchange is open on the given date"""
+    return day.weekday() < 5 and day not in load_holidays(exchange)
+
+
+def trading_days(start, end, exchange="NSE"):
+    """Trading days from start to end inclusive, skipping weekends and holidays"""
+    days = pd.bdate_range(start, end, freq="C", holidays=list(load_holidays(exchange)))
+    return [day.date() for day in days]
+
+
+def next_trading_days(start, count, exchange="NSE"):
+    """The first count trading days on or after start"""
+    # Three calendar weeks per trading week is ample even around long holidays
+    days = trading_days(start, start + timedelta(days=count * 3 + 21), exchange)
+    return days[:count]
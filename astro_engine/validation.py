@@ -0,0 +1,418 @@
+"""Differential validation of the fast engines against the scalar reference functions
+
+The vectorized, incremental and cached paths (planet_longitudes and
+planet_speeds, aspect_dynamics, AspectTracker, sweep_aspects,
+compute_day_aspects with score_timeline, and the exchange projection of
+compute_exchange_aspects) must agree with calculate_planetary_positions,
+get_aspects, detect_planetary_transits and calculate_enhanced_trading_signal
+applied one timestamp at a time. validate() runs both side by side on
+randomized days, windows and scoring parameters in worker processes and
+returns every divergence. ValidationSampler re-checks a small random share
+of production results, cached ones included, in a background thread and
+counts the outcome in the metrics registry. Run with
+``python -m astro_engine.validation --help``.
+"""
+
+import argparse
+import collections
+import functools
+import os
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .aspect_sweep import sweep_aspects
+from .aspect_tracker import AspectTracker
+from .core import (
+    analyze_market_session,
+    aspect_dynamics,
+    aspect_rules,
+    calculate_enhanced_trading_signal,
+    calculate_planetary_positions,
+    detect_planetary_transits,
+    get_aspects,
+    planet_longitudes,
+    planet_speeds,
+    transit_direction
+)
+from .exchanges import EXCHANGES, session_times, to_local
+from .jobs import process_pool
+from .metrics import default_registry, timed
+from .timeline import (
+    INTERVAL_MINUTES,
+    REPORT_INTERVAL_MINUTES,
+    compute_day_aspects,
+    compute_exchange_aspects,
+    decode_aspect_ids,
+    score_timeline
+)
+from .trading_calendar import trading_days
+
+# Set ASTRO_VALIDATE_RATE to the share (0-1) of production results the app re-checks in the background
+VALIDATION_SAMPLE_RATE = float(os.environ.get("ASTRO_VALIDATE_RATE", 0))
+
+# Timeline rows re-checked per sampled production result, and steps per randomized case
+SAMPLE_ROWS = 4
+MAX_CASE_STEPS = 12
+
+# Sampled checks allowed to wait for the background thread; more are dropped, never queued
+MAX_PENDING_CHECKS = 4
+
+# Randomized cases draw their days from here (the span the holiday calendar covers) and their filters from these
+VALIDATION_RANGE = (date(2025, 1, 1), date(2026, 12, 31))
+MIN_ASPECT_WEIGHTS = [0.0, 0.5, 1.0, 1.5, 2.0]
+
+# Largest differences that still count as agreement: floating-point noise in
+# degrees, and one rounding step of the 0.1-hour and 0.01-point displays
+DEGREE_TOLERANCE = 1e-9
+HOURS_TOLERANCE = 0.1 + 1e-9
+SCORE_TOLERANCE = 1e-9
+
+DIVERGENCE_COLUMNS = ["Check", "Case", "DateTime", "Field", "Expected", "Actual"]
+
+# Aspect row fields each fast aspect path must reproduce
+ASPECT_FIELDS = {
+    "tracker": ["Weight", "Tendency", "Strength", "Phase", "Hours_To_Exact", "Exact_Degree", "Orb"],
+    "sweep": ["Weight", "Tendency", "Strength", "Phase", "Hours_To_Exact"],
+    "dynamics": ["Weight", "Tendency", "Strength", "Phase", "Hours_To_Exact"]
+}
+
+VALIDATION_CASES = default_registry().counter(
+    "astro_validation_cases_total", "Differential validation cases by outcome", ("result",)
+)
+VALIDATION_DIVERGENCES = default_registry().counter(
+    "astro_validation_divergences_total", "Fields where a fast path disagreed with its reference", ("check",)
+)
+
+
+def _divergence(check, case, when, field, expected, actual):
+    return {"Check": check, "Case": case, "DateTime": str(when), "Field": field,
+            "Expected": expected, "Actual": actual}
+
+
+def _differs(expected, actual, tolerance=0.0):
+    """Whether two values disagree; NaN matches NaN and numbers may differ by tolerance"""
+    if isinstance(expected, (int, float, np.number)) and isinstance(actual, (int, float, np.number)):
+        if np.isnan(expected) or np.isnan(actual):
+            return not (np.isnan(expected) and np.isnan(actual))
+        return abs(float(expected) - float(actual)) > tolerance
+    return expected != actual
+
+
+def reference_step(current_time, previous_positions=None, min_aspect_weight=1.0, show_transits=True):
+    """Positions, kept aspects, transit directions and signal of one step from the scalar functions"""
+    positions = calculate_planetary_positions(current_time)
+    aspects_df, _ = get_aspects(positions)
+    if not aspects_df.empty:
+        aspects_df = aspects_df[aspects_df["Weight"] >= min_aspect_weight].reset_index(drop=True)
+    transits = detect_planetary_transits(positions, previous_positions) if previous_positions is not None else []
+    session_info = analyze_market_session(current_time.strftime("%H:%M"), aspects_df, positions)
+    signal, _, bullish, bearish, _, _ = calculate_enhanced_trading_signal(
+        aspects_df, session_info, transits if show_transits else None
+    )
+    return {
+        "positions": positions,
+        "aspects": aspects_df,
+        "directions": [transit_direction(transit) for transit in transits],
+        "session_info": session_info,
+        "signal": signal,
+        "bullish": bullish,
+        "bearish": bearish
+    }
+
+
+def check_positions(times, references, case=None):
+    """planet_longitudes and planet_speeds against calculate_planetary_positions"""
+    divergences = []
+    longitudes, speeds = planet_longitudes(times), planet_speeds(times)
+    for position, (current_time, positions) in enumerate(zip(times, references)):
+        for row in positions.itertuples():
+            offset = (longitudes.iloc[position][row.Planet] - row.Full_Degree + 180) % 360 - 180
+            if abs(offset) > DEGREE_TOLERANCE:
+                divergences.append(_divergence("positions", case, current_time, f"{row.Planet} Full_Degree",
+                                               row.Full_Degree, longitudes.iloc[position][row.Planet]))
+            if _differs(row.Speed, speeds.iloc[position][row.Planet]):
+                divergences.append(_divergence("positions", case, current_time, f"{row.Planet} Speed",
+                                               row.Speed, speeds.iloc[position][row.Planet]))
+    return divergences
+
+
+def compare_aspects(check, case, when, expected, actual, fields):
+    """Divergences between two get_aspects-style record lists: pairs, their order and the given fields"""
+    def key(aspect):
+        return aspect["Planet1"], aspect["Planet2"], aspect["Aspect"]
+
+    expected_keys, actual_keys = [key(a) for a in expected], [key(a) for a in actual]
+    divergences = []
+    if set(expected_keys) != set(actual_keys):
+        divergences.append(_divergence(check, case, when, "aspects",
+                                       sorted(set(expected_keys) - set(actual_keys)),
+                                       sorted(set(actual_keys) - set(expected_keys))))
+    elif expected_keys != actual_keys:
+        divergences.append(_divergence(check, case, when, "order", expected_keys, actual_keys))
+    actual_by_key = {key(a): a for a in actual}
+    for aspect in expected:
+        other = actual_by_key.get(key(aspect))
+        if other is None:
+            continue
+        for field in fields:
+            tolerance = HOURS_TOLERANCE if field == "Hours_To_Exact" else 0.0
+            if _differs(aspect[field], other[field], tolerance):
+                divergences.append(_divergence(check, case, when, f"{'-'.join(key(aspect))} {field}",
+                                               aspect[field], other[field]))
+    return divergences
+
+
+def check_aspects(times, references, case=None):
+    """AspectTracker, sweep_aspects and aspect_dynamics against get_aspects at each time"""
+    divergences = []
+    tracker = AspectTracker()
+    dynamics = aspect_dynamics(times)
+    dynamics["Strength"] = np.where(dynamics["Strong"], "Strong", "Moderate")
+    for current_time, positions in zip(times, references):
+        _, expected = get_aspects(positions)
+        _, tracked = tracker.get_aspects(positions, current_time)
+        _, swept = sweep_aspects(positions, aspect_rules())
+        vectorized = dynamics[dynamics["DateTime"] == pd.Timestamp(current_time)].to_dict("records")
+        for check, actual in (("tracker", tracked), ("sweep", swept), ("dynamics", vectorized)):
+            divergences += compare_aspects(check, case, current_time, expected, actual, ASPECT_FIELDS[check])
+    return divergences
+
+
+def check_timeline(steps, aspects, rows, min_aspect_weight=1.0, show_transits=True, case=None):
+    """Scored timeline rows (from compute_day_aspects output, cached or not) against the per-step references
+
+    rows are positions in steps; each is rebuilt from calculate_planetary_positions
+    at its DateTime, with the previous row of the same day for its transits.
+    """
+    rules = aspect_rules()
+    timeline_df = score_timeline(steps, aspects, min_aspect_weight, show_transits)
+    divergences = []
+    for row in rows:
+        current = timeline_df.iloc[row]
+        current_time = datetime.strptime(current["DateTime"], "%Y-%m-%d %H:%M")
+        previous_positions = None
+        if row > 0 and timeline_df.iloc[row - 1]["DateTime"][:10] == current["DateTime"][:10]:
+            previous_time = datetime.strptime(timeline_df.iloc[row - 1]["DateTime"], "%Y-%m-%d %H:%M")
+            previous_positions = calculate_planetary_positions(previous_time)
+        reference = reference_step(current_time, previous_positions, min_aspect_weight, show_transits)
+
+        expected_ids = [rules.aspect_id(a["Planet1"], a["Planet2"], a["Aspect"])
+                        for a in reference["aspects"].to_dict("records")]
+        if decode_aspect_ids(current["Aspect_Ids"]) != expected_ids:
+            divergences.append(_divergence("aspects", case, current_time, "Aspect_Ids",
+                                           expected_ids, decode_aspect_ids(current["Aspect_Ids"])))
+        directions = reference["directions"]
+        for field, expected in (("Transit_Bullish", directions.count(1)), ("Transit_Bearish", directions.count(-1))):
+            if _differs(expected, int(steps.iloc[row][field])):
+                divergences.append(_divergence("transits", case, current_time, field, expected,
+                                               int(steps.iloc[row][field])))
+
+        session_info = reference["session_info"]
+        expected_fields = {
+            "Signal": reference["signal"],
+            "Bullish_Weight": reference["bullish"],
+            "Bearish_Weight": reference["bearish"],
+            "Active_Aspects": len(reference["aspects"]),
+            "Session": f"{session_info['session_emoji']} {session_info['session']}",
+            "Session_Outlook": f"{session_info['emoji']} {session_info['outlook']}",
+            "Strength": session_info["strength"]
+        }
+        for field, expected in expected_fields.items():
+            actual = current[field]
+            actual = actual if isinstance(actual, str) else float(actual)
+            if _differs(expected, actual, SCORE_TOLERANCE):
+                divergences.append(_divergence("scores", case, current_time, field, expected, actual))
+    return divergences
+
+
+def check_exchange_projection(day, exchanges, interval_minutes=REPORT_INTERVAL_MINUTES, case=None):
+    """compute_exchange_aspects for several exchanges at once against each exchange's own scalar sweep"""
+    rules = aspect_rules()
+    projected = compute_exchange_aspects(day, exchanges, interval_minutes)
+    divergences = []
+    for exchange, (steps, aspects) in projected.items():
+        times = session_times(day, exchange, interval_minutes).to_pydatetime().tolist()
+        local = to_local(times, exchange).strftime("%Y-%m-%d %H:%M").tolist()
+        if steps["DateTime"].tolist() != local:
+            divergences.append(_divergence("exchanges", case, day, f"{exchange} DateTime", local,
+                                           steps["DateTime"].tolist()))
+            continue
+        previous_positions = None
+        for step, current_time in enumerate(times):
+            reference = reference_step(current_time, previous_positions, min_aspect_weight=0.0)
+            previous_positions = reference["positions"]
+            expected = [
+                (rules.aspect_id(a["Planet1"], a["Planet2"], a["Aspect"]), a["Strength"] == "Strong",
+                 a["Phase"] == "Applying")
+                for a in reference["aspects"].to_dict("records")
+            ]
+            stored = aspects[aspects["Step"] == step]
+            actual = list(zip(stored["Aspect_Id"].tolist(), stored["Strong"].tolist(), stored["Applying"].tolist()))
+            if actual != expected:
+                divergences.append(_divergence("exchanges", case, current_time, f"{exchange} aspects",
+                                               expected, actual))
+            directions = reference["directions"]
+            actual_transits = (int(steps.iloc[step]["Transit_Bullish"]), int(steps.iloc[step]["Transit_Bearish"]))
+            if actual_transits != (directions.count(1), directions.count(-1)):
+                divergences.append(_divergence("exchanges", case, current_time, f"{exchange} transits",
+                                               (directions.count(1), directions.count(-1)), actual_transits))
+    return divergences
+
+
+def random_cases(count, seed=None, start_date=VALIDATION_RANGE[0], end_date=VALIDATION_RANGE[1]):
+    """Randomized validation cases: a trading day, a short NSE window, an interval, filters and an exchange"""
+    generator = random.Random(seed)
+    days = trading_days(start_date, end_date)
+    cases = []
+    for number in range(count):
+        interval = generator.choice(list(INTERVAL_MINUTES.values()))
+        steps = generator.randint(2, MAX_CASE_STEPS)
+        # Any start from the pre-open to the close, on the 5-minute grid
+        start = datetime.combine(generator.choice(days), time(9, 0)) + timedelta(minutes=5 * generator.randint(0, 78))
+        cases.append({
+            "case": number,
+            "day": start.date(),
+            "start": start,
+            "end": start + timedelta(minutes=interval * (steps - 1)),
+            "interval": interval,
+            "min_aspect_weight": generator.choice(MIN_ASPECT_WEIGHTS),
+            "show_transits": generator.random() < 0.5,
+            "exchange": generator.choice([exchange for exchange in EXCHANGES if exchange != "NSE"])
+        })
+    return cases
+
+
+def check_case(case):
+    """Every differential check of one case; returns its divergences"""
+    times = pd.date_range(case["start"], case["end"], freq=f"{case['interval']}min").to_pydatetime().tolist()
+    references = [calculate_planetary_positions(current_time) for current_time in times]
+    steps, aspects = compute_day_aspects(case["start"], case["end"], case["interval"])
+    divergences = check_positions(times, references, case["case"])
+    divergences += check_aspects(times, references, case["case"])
+    divergences += check_timeline(steps, aspects, range(len(steps)), case["min_aspect_weight"],
+                                  case["show_transits"], case["case"])
+    # The exchange grids share nothing with the window above; the projection needs only a few steps of each
+    if trading_days(case["day"], case["day"], case["exchange"]):
+        divergences += check_exchange_projection(case["day"], ["NSE", case["exchange"]], case=case["case"])
+    return divergences
+
+
+@timed("validate")
+def validate(cases, max_workers=None, progress=None):
+    """Run check_case over cases, one process per case; returns (cases checked, divergences DataFrame)
+
+    A case that raises is reported as a divergence of check "error".
+    """
+    divergences, done = [], 0
+
+    def finish(case, result):
+        nonlocal done
+        done += 1
+        if isinstance(result, Exception):
+            result = [_divergence("error", case["case"], case["start"], type(result).__name__, None, str(result))]
+        divergences.extend(result)
+        if progress:
+            progress(done / len(cases), f"Validated case {case['case']} ({done}/{len(cases)})")
+
+    if len(cases) == 1 or max_workers == 1:
+        for case in cases:
+            try:
+                result = check_case(case)
+            except Exception as exc:  # reported as a divergence; the remaining cases still run
+                result = exc
+            finish(case, result)
+    elif cases:
+        with process_pool(max_workers) as pool:
+            futures = {pool.submit(check_case, case): case for case in cases}
+            for future in as_completed(futures):
+                finish(futures[future], future.exception() or future.result())
+    return len(cases), pd.DataFrame(divergences, columns=DIVERGENCE_COLUMNS)
+
+
+class ValidationSampler:
+    """Re-checks a random share of production timelines against the references in a background thread
+
+    Checking never blocks or fails the request it samples: checks run one
+    at a time, at most MAX_PENDING_CHECKS wait, and the rest are dropped.
+    Outcomes go to the astro_validation_* counters and the latest
+    divergences are kept in recent.
+    """
+
+    def __init__(self, rate=VALIDATION_SAMPLE_RATE, seed=None, max_pending=MAX_PENDING_CHECKS):
+        self.rate = rate
+        self.recent = collections.deque(maxlen=50)
+        self._random = random.Random(seed)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="astro-validation")
+
+    def maybe_check(self, steps, aspects):
+        """With probability rate, queue a check of a few rows of compute_day_aspects output; returns the future"""
+        if self.rate <= 0 or steps.empty or self._random.random() >= self.rate:
+            return None
+        if not self._slots.acquire(blocking=False):
+            VALIDATION_CASES.inc(result="dropped")
+            return None
+        rows = sorted(self._random.sample(range(len(steps)), min(SAMPLE_ROWS, len(steps))))
+        min_aspect_weight = self._random.choice(MIN_ASPECT_WEIGHTS)
+        show_transits = self._random.random() < 0.5
+        future = self._executor.submit(self._check, steps, aspects, rows, min_aspect_weight, show_transits)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _check(self, steps, aspects, rows, min_aspect_weight, show_transits):
+        try:
+            divergences = check_timeline(steps, aspects, rows, min_aspect_weight, show_transits, case="sampled")
+        except Exception as exc:  # a failed check is counted, never raised into the app
+            VALIDATION_CASES.inc(result="failed")
+            self.recent.append(_divergence("error", "sampled", None, type(exc).__name__, None, str(exc)))
+            return []
+        VALIDATION_CASES.inc(result="diverged" if divergences else "passed")
+        for divergence in divergences:
+            VALIDATION_DIVERGENCES.inc(check=divergence["Check"])
+            self.recent.append(divergence)
+        return divergences
+
+
+@functools.lru_cache(maxsize=None)
+def default_sampler():
+    """Process-wide sampler at the configured rate"""
+    return ValidationSampler()
+
+
+def main(argv=None):
+    """Command-line entry point; returns the process exit code (1 if anything diverged)"""
+    parser = argparse.ArgumentParser(description="Check the fast engines against the scalar reference functions")
+    parser.add_argument("--cases", type=int, default=20, help="randomized cases to run")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible cases")
+    parser.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        default=VALIDATION_RANGE[0], help="first day cases are drawn from")
+    parser.add_argument("--end", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        default=VALIDATION_RANGE[1], help="last day cases are drawn from")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="CSV file to write the divergences to")
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("--end is before --start")
+    try:
+        checked, divergences = validate(random_cases(args.cases, args.seed, args.start, args.end), args.workers)
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"Validation failed: {exc}", file=sys.stderr)
+        return 1
+    if args.output:
+        divergences.to_csv(args.output, index=False)
+    for check, count in divergences["Check"].value_counts().items():
+        print(f"{check}: {count} divergences", file=sys.stderr)
+    print(f"Checked {checked} cases: {len(divergences)} divergences in "
+          f"{divergences['Case'].nunique()} cases")
+    return 1 if len(divergences) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
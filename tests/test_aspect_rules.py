@@ -0,0 +1,173 @@
+"""Rule file validation and hot reloading"""
+
+import copy
+import json
+import os
+
+import pytest
+
+from astro_engine import aspect_rules
+from astro_engine.aspect_rules import DEFAULT_RULES_FILE, RuleError, current_rules, load_rules, rules_error, validate_rules
+from astro_engine.core import BASE_PLANETARY_DATA
+
+PLANETS = list(next(iter(BASE_PLANETARY_DATA.values())))
+
+
+@pytest.fixture(autouse=True)
+def check_every_call(monkeypatch):
+    """Look at the rule file on every call instead of once a second"""
+    monkeypatch.setattr(aspect_rules, "RULES_CHECK_SECONDS", 0)
+
+
+@pytest.fixture
+def rules():
+    """A fresh copy of the shipped rule file"""
+    with open(DEFAULT_RULES_FILE, encoding="utf-8") as rule_file:
+        return json.load(rule_file)
+
+
+def write_rules(path, rules, mtime_ns=None):
+    path.write_text(json.dumps(rules), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_shipped_rules_are_valid(rules):
+    assert validate_rules(rules, PLANETS) == []
+
+
+def _without_tendency_aspects(rules):
+    del rules["tendency_rules"][0]["aspects"]
+
+
+def _tendency_aspects_as_text(rules):
+    rules["tendency_rules"][0]["aspects"] = "Square"
+
+
+def _empty_tendency_aspects(rules):
+    rules["tendency_rules"][0]["aspects"] = []
+
+
+def _unknown_tendency_aspect(rules):
+    rules["tendency_rules"][0]["aspects"] = ["Square", "Quincunx of Doom"]
+
+
+def _negative_orb(rules):
+    rules["aspects"][0]["orb"] = -1
+
+
+def _duplicate_aspect(rules):
+    rules["aspects"].append(copy.deepcopy(rules["aspects"][0]))
+
+
+def _unknown_tendency(rules):
+    rules["default_tendency"]["tendency"] = "Sideways"
+
+
+def _unknown_planet_group(rules):
+    rules["tendency_rules"][0]["cases"][0]["when_any"] = "no such group"
+
+
+def _missing_planet_weight(rules):
+    del rules["planet_weights"]["Sun"]
+    rules.pop("default_planet_weight", None)
+
+
+def _combo_with_one_planet(rules):
+    rules["combos"] = [{"planets": ["Sun", "Sun"], "effect": "nothing"}]
+
+
+@pytest.mark.parametrize("break_rules, problem", [
+    (_without_tendency_aspects, "aspects must be a non-empty list of aspect names"),
+    (_tendency_aspects_as_text, "aspects must be a non-empty list of aspect names"),
+    (_empty_tendency_aspects, "aspects must be a non-empty list of aspect names"),
+    (_unknown_tendency_aspect, "unknown aspects ['Quincunx of Doom']"),
+    (_negative_orb, "orb must be positive"),
+    (_duplicate_aspect, "is listed twice"),
+    (_unknown_tendency, "tendency must be one of"),
+    (_unknown_planet_group, "unknown planet group"),
+    (_missing_planet_weight, "numeric weight for Sun"),
+    (_combo_with_one_planet, "must name two different planets")
+])
+def test_malformed_rules_are_rejected(rules, break_rules, problem):
+    break_rules(rules)
+    problems = validate_rules(rules, PLANETS)
+    assert any(problem in text for text in problems), problems
+
+
+def test_top_level_must_be_an_object():
+    assert validate_rules([], PLANETS) == ["top level must be an object"]
+
+
+def test_load_rules_raises_rule_error(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    _without_tendency_aspects(rules)
+    write_rules(path, rules)
+    with pytest.raises(RuleError) as error:
+        load_rules(str(path), PLANETS)
+    assert error.value.path == str(path)
+    assert error.value.problems
+
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(RuleError, match="invalid JSON"):
+        load_rules(str(path), PLANETS)
+
+
+def test_bad_edit_keeps_the_previous_rules(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    write_rules(path, rules, mtime_ns=1_000_000_000)
+    loaded = current_rules(PLANETS, str(path))
+    assert rules_error(str(path)) is None
+
+    # The edit from the tendency-rule bug: a rule without its aspect list
+    _without_tendency_aspects(rules)
+    write_rules(path, rules, mtime_ns=2_000_000_000)
+    assert current_rules(PLANETS, str(path)) is loaded
+    assert "non-empty list of aspect names" in rules_error(str(path))
+
+    # A later valid edit is picked up and clears the error
+    with open(DEFAULT_RULES_FILE, encoding="utf-8") as rule_file:
+        fixed = json.load(rule_file)
+    fixed["aspects"][0]["orb"] = 3.0
+    write_rules(path, fixed, mtime_ns=3_000_000_000)
+    reloaded = current_rules(PLANETS, str(path))
+    assert reloaded is not loaded
+    assert rules_error(str(path)) is None
+
+
+def test_bad_first_load_raises(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    _empty_tendency_aspects(rules)
+    write_rules(path, rules)
+    with pytest.raises(RuleError):
+        current_rules(PLANETS, str(path))
+
+
+def test_missing_file_keeps_the_previous_rules(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    write_rules(path, rules, mtime_ns=1_000_000_000)
+    loaded = current_rules(PLANETS, str(path))
+
+    # Editors that save by delete-and-rename leave the file briefly missing
+    path.unlink()
+    assert current_rules(PLANETS, str(path)) is loaded
+    assert "No such file" in rules_error(str(path))
+
+    write_rules(path, rules, mtime_ns=2_000_000_000)
+    assert current_rules(PLANETS, str(path)) is not loaded
+    assert rules_error(str(path)) is None
+
+
+def test_checks_are_throttled(tmp_path, rules, monkeypatch):
+    path = tmp_path / "rules.json"
+    write_rules(path, rules, mtime_ns=1_000_000_000)
+    monkeypatch.setattr(aspect_rules, "RULES_CHECK_SECONDS", 3600)
+    loaded = current_rules(PLANETS, str(path))
+
+    # Within the check interval neither a new version nor a missing file is noticed
+    rules["aspects"][0]["orb"] = 3.0
+    write_rules(path, rules, mtime_ns=2_000_000_000)
+    assert current_rules(PLANETS, str(path)) is loaded
+    path.unlink()
+    assert current_rules(PLANETS, str(path)) is loaded
+    assert rules_error(str(path)) is None
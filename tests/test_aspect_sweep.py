@@ -0,0 +1,61 @@
+"""find_aspect_pairs against a brute-force comparison of every pair"""
+
+import numpy as np
+import pytest
+
+from astro_engine.aspect_sweep import find_aspect_pairs
+from astro_engine.core import aspect_rules
+
+
+def brute_force_pairs(degrees, angles, orbs):
+    """Every pair i < j in order, with the first listed aspect whose orb contains their separation"""
+    firsts, seconds, kinds, separations = [], [], [], []
+    for first in range(len(degrees)):
+        for second in range(first + 1, len(degrees)):
+            separation = abs(degrees[second] - degrees[first])
+            if separation > 180:
+                separation = 360 - separation
+            for aspect, (angle, orb) in enumerate(zip(angles, orbs)):
+                if abs(separation - angle) <= orb:
+                    firsts.append(first)
+                    seconds.append(second)
+                    kinds.append(aspect)
+                    separations.append(separation)
+                    break
+    return firsts, seconds, kinds, separations
+
+
+def assert_same_pairs(degrees, angles, orbs):
+    first, second, kind, separation = find_aspect_pairs(degrees, angles, orbs)
+    expected = brute_force_pairs(degrees, angles, orbs)
+    assert first.tolist() == expected[0]
+    assert second.tolist() == expected[1]
+    assert kind.tolist() == expected[2]
+    np.testing.assert_allclose(separation, expected[3])
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("bodies", [0, 1, 2, 9, 40])
+def test_random_longitudes_match_brute_force(seed, bodies):
+    rules = aspect_rules()
+    degrees = np.random.default_rng(seed).uniform(0, 360, bodies)
+    assert_same_pairs(degrees, rules.angles, rules.orbs)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_crowded_longitudes_with_overlapping_orbs(seed):
+    # Wide, overlapping orbs make many pairs match several aspects; the first listed must win
+    generator = np.random.default_rng(seed)
+    degrees = generator.uniform(0, 40, 30)
+    assert_same_pairs(degrees, [0, 30, 45, 60], [8.0, 10.0, 10.0, 6.0])
+
+
+@pytest.mark.parametrize("degrees", [
+    [359.5, 0.5],        # conjunction across 0°
+    [10.0, 190.0],       # exact opposition
+    [0.0, 62.0, 120.0],  # orb edges
+    [45.0, 45.0, 45.0]   # identical longitudes
+])
+def test_edge_longitudes_match_brute_force(degrees):
+    rules = aspect_rules()
+    assert_same_pairs(np.array(degrees), rules.angles, rules.orbs)
@@ -0,0 +1,69 @@
+"""Headless batch reports written into a temporary directory"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from astro_engine import batch
+from astro_engine.batch import batch_reports, main, report_paths
+from astro_engine.timeline import compute_daily_report
+
+
+def test_command_line_writes_every_format(tmp_path, capsys):
+    # Friday to Monday: the weekend is skipped
+    assert main(["--start", "2025-03-07", "--end", "2025-03-10", "--symbol", "NIFTY", "--output", str(tmp_path),
+                 "--workers", "1"]) == 0
+    assert sorted(os.listdir(tmp_path / "NIFTY")) == [
+        f"2025-03-{day:02d}.{fmt}" for day in (7, 10) for fmt in ("html", "json", "md")
+    ]
+    assert "Wrote 6 files" in capsys.readouterr().out
+
+    paths = report_paths(str(tmp_path), date(2025, 3, 10), "NIFTY")
+    with open(paths["md"], encoding="utf-8") as markdown:
+        assert markdown.read() == compute_daily_report(date(2025, 3, 10), symbols=["NIFTY"]).strip() + "\n"
+    with open(paths["json"], encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    assert (report["symbol"], report["exchange"], report["date"]) == ("NIFTY", "NSE", "2025-03-10")
+    assert report["timeline"] and report["summary"]
+    with open(paths["html"], encoding="utf-8") as page:
+        assert page.read().startswith("<!DOCTYPE html>")
+
+
+def test_each_index_follows_its_exchange(tmp_path):
+    written, skipped, failures = batch_reports(date(2025, 3, 10), date(2025, 3, 10), ["NIFTY", "FTSE 100"],
+                                               str(tmp_path), formats=["json"], max_workers=1)
+    assert (written, skipped, failures) == (2, 0, {})
+    with open(report_paths(str(tmp_path), date(2025, 3, 10), "FTSE 100", ["json"])["json"], encoding="utf-8") as report:
+        assert json.load(report)["exchange"] == "LSE"
+
+
+def test_skip_existing_and_failed_days(tmp_path, monkeypatch):
+    batch_reports(date(2025, 3, 10), date(2025, 3, 10), ["NIFTY"], str(tmp_path), formats=["md"], max_workers=1)
+    real_render_day = batch.render_day
+
+    def render_day(day, *args):
+        if day == date(2025, 3, 12):
+            raise RuntimeError("ephemeris unavailable")
+        return real_render_day(day, *args)
+
+    monkeypatch.setattr(batch, "render_day", render_day)
+    written, skipped, failures = batch_reports(date(2025, 3, 10), date(2025, 3, 12), ["NIFTY"], str(tmp_path),
+                                               formats=["md"], max_workers=1, skip_existing=True)
+    assert (written, skipped) == (1, 1)
+    assert failures == {date(2025, 3, 12): "RuntimeError: ephemeris unavailable"}
+
+
+def test_days_in_worker_processes(tmp_path):
+    progress = []
+    written, _, failures = batch_reports(date(2025, 3, 10), date(2025, 3, 11), ["SENSEX"], str(tmp_path),
+                                         formats=["md"], max_workers=2,
+                                         progress=lambda fraction, message: progress.append(fraction))
+    assert (written, failures) == (2, {})
+    assert progress == [0.5, 1.0]
+
+
+def test_end_before_start_is_rejected(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["--start", "2025-03-10", "--end", "2025-03-07", "--output", str(tmp_path)])
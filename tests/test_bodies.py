@@ -0,0 +1,43 @@
+"""Extended body positions come from one model: the ephemeris"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from astro_engine.aspect_sweep import sweep_aspects
+from astro_engine.bodies import OUTER_PLANETS, extended_positions
+from astro_engine.event_study import EVENT_BODIES
+from astro_engine.stations import EPHEMERIS_FLAGS, to_julian_day
+
+MOMENT = datetime(2025, 3, 10, 10, 0)
+
+
+def ephemeris_longitude(body):
+    return swe.calc_ut(float(to_julian_day(MOMENT)), body, EPHEMERIS_FLAGS)[0][0]
+
+
+def test_base_and_outer_planets_match_the_ephemeris():
+    positions = extended_positions(MOMENT, ["Outer Planets"]).set_index("Planet")
+    for name, body in {**EVENT_BODIES, **OUTER_PLANETS}.items():
+        assert positions.loc[name, "Full_Degree"] == pytest.approx(ephemeris_longitude(body))
+    assert positions.loc["Ketu", "Full_Degree"] == pytest.approx((positions.loc["Rahu", "Full_Degree"] + 180) % 360)
+    assert positions.loc["Rahu", "Retrograde"] == "Yes"
+
+
+def test_base_planets_only():
+    positions = extended_positions(MOMENT, [])
+    assert positions["Planet"].tolist() == ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn",
+                                            "Rahu", "Ketu"]
+    assert set(positions["Kind"]) == {"Planet"}
+
+
+def test_cross_set_aspects_use_ephemeris_separations():
+    positions = extended_positions(MOMENT, ["Outer Planets", "Fixed Stars"], max_stars=10)
+    aspects_df, _ = sweep_aspects(positions)
+    degrees = positions.set_index("Planet")["Full_Degree"]
+    separation = np.abs(degrees[aspects_df["Planet1"]].to_numpy() - degrees[aspects_df["Planet2"]].to_numpy())
+    separation = np.where(separation > 180, 360 - separation, separation)
+    exact = aspects_df["Exact_Degree"].str.rstrip("°").astype(float).to_numpy()
+    np.testing.assert_allclose(exact, separation, atol=0.01)
@@ -0,0 +1,77 @@
+"""Divisional charts against the classical rules, one longitude at a time"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from astro_engine.divisional import (
+    DIVISIONAL_CHARTS,
+    divisional_chart,
+    divisional_ingresses,
+    divisional_sign_names,
+    divisional_signs
+)
+
+# Midpoints of every arc minute around the circle, away from part boundaries
+LONGITUDES = (np.arange(360 * 60) + 0.5) / 60
+
+
+def classical_sign(longitude, division):
+    """Divisional sign index of one longitude from the textbook rule of each chart"""
+    sign, within = int(longitude // 30), longitude % 30
+    odd = sign % 2 == 0  # Aries, the first sign, is odd
+    if division == 1:
+        return sign
+    if division == 2:
+        return (4 if within < 15 else 3) if odd else (3 if within < 15 else 4)
+    if division == 3:
+        return (sign + 4 * int(within // 10)) % 12
+    if division == 9:
+        return int(longitude // (30 / 9)) % 12
+    if division == 10:
+        return (sign + (0 if odd else 8) + int(within // 3)) % 12
+    if division == 12:
+        return (sign + int(within // 2.5)) % 12
+    if division == 30:
+        edges, signs = ([5, 10, 18, 25], [0, 10, 8, 2, 6]) if odd else ([5, 12, 20, 25], [1, 5, 11, 9, 7])
+        return signs[sum(within >= edge for edge in edges)]
+    if division == 60:
+        return (sign + int(within * 2)) % 12
+    raise ValueError(division)
+
+
+@pytest.mark.parametrize("division", [1, 2, 3, 9, 10, 12, 30, 60])
+def test_matches_the_classical_rules(division):
+    expected = [classical_sign(longitude, division) for longitude in LONGITUDES]
+    assert divisional_signs(LONGITUDES, division).tolist() == expected
+
+
+@pytest.mark.parametrize("division", list(DIVISIONAL_CHARTS))
+def test_every_chart_covers_the_circle(division):
+    signs = divisional_signs(LONGITUDES, division)
+    assert signs.min() >= 0 and signs.max() <= 11
+    # Wrapped and negative longitudes land on the same signs
+    assert (divisional_signs(LONGITUDES - 360, division) == signs).all()
+    assert (divisional_signs(LONGITUDES + 720, division) == signs).all()
+
+
+def test_shapes_and_names():
+    grid = LONGITUDES[:12].reshape(3, 4)
+    assert divisional_signs(grid, 9).shape == (3, 4)
+    assert divisional_sign_names([0.0, 3.5, 359.9], 9).tolist() == ["Aries", "Taurus", "Pisces"]
+    with pytest.raises(ValueError, match="Unsupported divisional chart"):
+        divisional_signs([0.0], 5)
+
+
+def test_chart_and_ingresses():
+    times = pd.date_range("2025-03-10 09:15", periods=4, freq="h")
+    longitudes = pd.DataFrame({"Moon": [2.0, 3.0, 4.0, 5.0], "Sun": [10.0, 10.1, 10.2, 10.3]}, index=times)
+    chart = divisional_chart(longitudes, divisions=(1, 9))
+    assert len(chart) == 8
+    assert chart["Planet"].tolist()[:2] == ["Moon", "Sun"]
+    assert chart.loc[chart["Planet"] == "Moon", "D9"].tolist() == ["Aries", "Aries", "Taurus", "Taurus"]
+
+    ingresses = divisional_ingresses(longitudes, 9)
+    assert ingresses[["Planet", "From", "To"]].values.tolist() == [["Moon", "Aries", "Taurus"]]
+    assert ingresses["DateTime"].tolist() == [times[2]]
+    assert ingresses["Chart"].tolist() == ["D9 Navamsa"]
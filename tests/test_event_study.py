@@ -0,0 +1,89 @@
+"""Exact aspect events against the ephemeris, and the event study on known returns"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import swisseph as swe
+
+from astro_engine.core import aspect_rules
+from astro_engine.event_study import EVENT_BODIES, aspect_events, event_study, load_price_bars, main
+from astro_engine.stations import EPHEMERIS_FLAGS, to_julian_day
+
+START, END = pd.Timestamp("2025-01-01"), pd.Timestamp("2025-03-01")
+
+
+def ephemeris_longitude(planet, julian_day):
+    if planet == "Ketu":
+        return (ephemeris_longitude("Rahu", julian_day) + 180) % 360
+    return swe.calc_ut(julian_day, EVENT_BODIES[planet], EPHEMERIS_FLAGS)[0][0]
+
+
+def separation(first, second, julian_day):
+    difference = abs(ephemeris_longitude(first, julian_day) - ephemeris_longitude(second, julian_day)) % 360
+    return min(difference, 360 - difference)
+
+
+def test_events_are_exact():
+    events = aspect_events(START, END)
+    assert len(events)
+    assert events["DateTime"].is_monotonic_increasing
+    assert events["DateTime"].between(START, END).all()
+    for event in events.itertuples():
+        julian_day = float(to_julian_day(event.DateTime.to_datetime64()))
+        # The Moon covers a hundredth of a degree in about a minute
+        assert separation(event.Planet1, event.Planet2, julian_day) == pytest.approx(event.Angle, abs=0.01)
+
+
+def test_sun_moon_events_match_an_hourly_scan():
+    # Every aspect angle is met once on each side of the Sun per lunar cycle (0 and 180 only once)
+    julian_days = [float(to_julian_day(hour.to_datetime64())) for hour in pd.date_range(START, END, freq="h")]
+    elongation = np.unwrap([ephemeris_longitude("Moon", jd) - ephemeris_longitude("Sun", jd) for jd in julian_days],
+                           period=360)
+    expected = 0
+    for boundary in {angle % 360 for angle in aspect_rules().angles} | {-angle % 360 for angle in aspect_rules().angles}:
+        turns = np.floor((elongation - boundary) / 360)
+        expected += int(np.count_nonzero(turns[1:] != turns[:-1]))
+    events = aspect_events(START, END)
+    assert len(events[(events["Planet1"] == "Sun") & (events["Planet2"] == "Moon")]) == expected
+
+
+def test_event_windows_average_the_abnormal_returns():
+    times = pd.date_range("2025-01-01", periods=40, freq="D")
+    returns = np.where(np.arange(40) % 10 == 0, 2.0, 0.0)
+    returns[0] = 0.0
+    closes = pd.Series(100 * np.exp(np.cumsum(returns) / 100), index=times)
+    events = pd.DataFrame({
+        "DateTime": [times[10], times[20] - pd.Timedelta(hours=3), times[30], times[1]],
+        "Planet1": ["Sun"] * 4, "Planet2": ["Moon"] * 4, "Aspect": ["Trine"] * 4, "Angle": [120.0] * 4
+    })
+    summary, paths = event_study(events, closes, before=2, after=2)
+    # The event on the second bar has no full window; the others all land on a jump
+    mean = np.mean(np.diff(np.log(closes.to_numpy())) * 100)
+    row = summary.loc[("Sun", "Moon", "Trine")]
+    assert row["Events"] == 3
+    assert row["Event_AR"] == pytest.approx(2.0 - mean, abs=1e-4)
+    assert row["Hit_Rate"] == 1.0
+    assert paths.loc[("Sun", "Moon", "Trine")].tolist() == pytest.approx([-mean, -mean, 2 - mean, -mean, -mean], abs=1e-4)
+
+
+def test_price_files(tmp_path):
+    path = tmp_path / "bars.csv"
+    pd.DataFrame({"DateTime": ["2025-03-10T03:45:00Z", "2025-03-10T03:46:00Z"], "Close": [100.0, 101.0]}).to_csv(
+        path, index=False)
+    closes = load_price_bars(path)
+    assert closes.index[0] == pd.Timestamp("2025-03-10 09:15")
+
+    pd.DataFrame({"Time": ["2025-03-10"], "Price": [1.0]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="Close column"):
+        load_price_bars(path)
+
+
+def test_command_line(tmp_path, capsys):
+    prices, output = tmp_path / "daily.csv", tmp_path / "summary.csv"
+    days = pd.bdate_range("2024-01-01", "2024-12-31")
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 1, len(days))) / 100)
+    pd.DataFrame({"Date": days.strftime("%Y-%m-%d"), "Close": closes}).to_csv(prices, index=False)
+    assert main([str(prices), "--min-events", "3", "--output", str(output)]) == 0
+    summary = pd.read_csv(output)
+    assert (summary["Events"] >= 3).all() and len(summary)
+    assert "pair/aspects written" in capsys.readouterr().out
@@ -0,0 +1,56 @@
+"""Engine (IST) and exchange-local time conversion across daylight saving changes"""
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from astro_engine.exchanges import session_times, timezone_name, to_engine, to_local
+
+# (exchange, local opening, last day before the change, first day after it, IST of that opening before, after)
+DST_CHANGES = [
+    ("NYSE", (9, 30), date(2025, 3, 7), date(2025, 3, 10), (20, 0), (19, 0)),     # EST to EDT
+    ("NYSE", (9, 30), date(2025, 10, 31), date(2025, 11, 3), (19, 0), (20, 0)),   # EDT to EST
+    ("LSE", (8, 0), date(2025, 3, 28), date(2025, 3, 31), (13, 30), (12, 30)),    # GMT to BST
+    ("LSE", (8, 0), date(2025, 10, 24), date(2025, 10, 27), (12, 30), (13, 30))   # BST to GMT
+]
+
+
+@pytest.mark.parametrize("exchange, opening, before, after, engine_before, engine_after", DST_CHANGES)
+def test_opening_moves_by_an_hour_in_engine_time(exchange, opening, before, after, engine_before, engine_after):
+    for day, engine_opening in [(before, engine_before), (after, engine_after)]:
+        local = datetime(day.year, day.month, day.day, *opening)
+        assert to_engine(local, exchange) == datetime(day.year, day.month, day.day, *engine_opening)
+        assert to_local(to_engine(local, exchange), exchange) == local
+
+
+@pytest.mark.parametrize("exchange, opening, before, after, engine_before, engine_after", DST_CHANGES)
+def test_arrays_match_scalars_and_round_trip(exchange, opening, before, after, engine_before, engine_after):
+    # Every local opening from the last day before the change to the first after it
+    local = pd.date_range(datetime(before.year, before.month, before.day, *opening),
+                          datetime(after.year, after.month, after.day, *opening), freq="D")
+    engine = to_engine(local, exchange)
+    assert list(engine) == [to_engine(moment.to_pydatetime(), exchange) for moment in local]
+    assert list(to_local(engine, exchange)) == list(local)
+
+
+def test_nse_is_engine_time():
+    moment = datetime(2025, 3, 10, 9, 15)
+    assert to_engine(moment, "NSE") == moment
+    assert to_local(moment, "NSE") == moment
+
+
+@pytest.mark.parametrize("exchange, before, after, names", [
+    ("NYSE", date(2025, 3, 7), date(2025, 3, 10), ("EST", "EDT")),
+    ("LSE", date(2025, 3, 28), date(2025, 3, 31), ("GMT", "BST"))
+])
+def test_session_follows_the_local_clock(exchange, before, after, names):
+    assert (timezone_name(before, exchange), timezone_name(after, exchange)) == names
+    before_session, after_session = session_times(before, exchange, 30), session_times(after, exchange, 30)
+
+    # Same local session and sample count, shifted by an hour against the engine clock
+    assert len(before_session) == len(after_session)
+    assert list(to_local(before_session, exchange).time) == list(to_local(after_session, exchange).time)
+    assert before_session[0].time() != after_session[0].time()
+    assert (before_session[0].hour * 60 + before_session[0].minute) - \
+        (after_session[0].hour * 60 + after_session[0].minute) == 60
@@ -0,0 +1,90 @@
+"""Lazily built timeline explanations against scoring every step eagerly"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from astro_engine import timeline
+from astro_engine.core import (
+    analyze_market_session,
+    calculate_enhanced_trading_signal,
+    calculate_planetary_positions,
+    detect_planetary_transits,
+    get_aspects
+)
+from astro_engine.exchanges import to_engine
+from astro_engine.export import day_timeline_rows
+from astro_engine.timeline import compute_day_timeline, explain_timeline_rows
+
+START, END, INTERVAL = datetime(2025, 3, 10, 9, 15), datetime(2025, 3, 10, 15, 30), 15
+
+
+def eager_explanations(min_aspect_weight, show_transits=True):
+    """Explanation columns computed step by step from fresh positions, as the timeline once did"""
+    rows, previous_positions, previous_keys = [], None, None
+    moment = START
+    while moment <= END:
+        positions = calculate_planetary_positions(moment)
+        aspects_df, _ = get_aspects(positions)
+        aspects_df = aspects_df[aspects_df["Weight"] >= min_aspect_weight]
+        keys = [(row["Planet1"], row["Planet2"], row["Aspect"]) for _, row in aspects_df.iterrows()]
+
+        changes, transits = [], []
+        if previous_keys is not None:
+            changes = [f"NEW: {p1}-{p2} {aspect}" for p1, p2, aspect in keys if (p1, p2, aspect) not in previous_keys]
+            changes += [f"END: {p1}-{p2} {aspect}" for p1, p2, aspect in previous_keys if (p1, p2, aspect) not in keys]
+            if show_transits:
+                transits = detect_planetary_transits(positions, previous_positions)
+        session_info = analyze_market_session(moment.strftime("%H:%M"), aspects_df, positions)
+        *_, signal_details, signal_reasons = calculate_enhanced_trading_signal(aspects_df, session_info, transits)
+        combos = [effect for effect in aspects_df["Combo_Effect"] if effect]
+        rows.append({
+            "Aspect_Changes": "; ".join(changes) if changes else "None",
+            "Combo_Effects": "; ".join(combos) if combos else "None",
+            "Signal_Details": signal_details,
+            "Signal_Reasons": "; ".join(signal_reasons[:3]) if signal_reasons else "Base aspects only"
+        })
+        previous_positions, previous_keys = positions, keys
+        moment += timedelta(minutes=INTERVAL)
+    return rows
+
+
+@pytest.mark.parametrize("min_aspect_weight", [1.0, 2.0])
+def test_lazy_explanations_match_eager_ones(min_aspect_weight):
+    timeline_df = compute_day_timeline(START, END, INTERVAL, min_aspect_weight)
+    explained = explain_timeline_rows(timeline_df, timeline_df.index)
+    expected = eager_explanations(min_aspect_weight)
+    assert len(explained) == len(expected)
+    for row, reference in zip(explained.to_dict("records"), expected):
+        assert {column: row[column] for column in reference} == reference
+
+
+def test_pages_match_the_whole_timeline():
+    timeline_df = compute_day_timeline(START, END, INTERVAL)
+    whole = explain_timeline_rows(timeline_df, timeline_df.index)
+    page = explain_timeline_rows(timeline_df, timeline_df.index[10:15])
+    assert page.equals(whole.iloc[10:15])
+
+
+def test_explanations_are_memoized():
+    timeline_df = compute_day_timeline(START, END, INTERVAL)
+    explain_timeline_rows(timeline_df, timeline_df.index)
+    hits = timeline._explain_row.cache_info().hits
+    explain_timeline_rows(timeline_df, timeline_df.index)
+    assert timeline._explain_row.cache_info().hits == hits + len(timeline_df)
+
+
+def test_exported_timeline_carries_explanations_and_rules():
+    exported = day_timeline_rows(date(2025, 3, 10), None, None, 60, exchange="NYSE")
+    for column in timeline.EXPLANATION_COLUMNS + ["Aspect_Ids", "Rules_Hash", "Engine_Version"]:
+        assert column in exported
+    assert exported["Rules_Hash"].nunique() == 1
+    assert (exported["Aspect_Changes"].iloc[0], exported["Transits"].iloc[0]) == ("None", "None")
+
+    # Rows are labelled in New York time but explained at the matching engine (IST) instants,
+    # here the hours up to midnight IST, after which an engine timeline starts a new day
+    opening = to_engine(datetime(2025, 3, 10, 9, 30), "NYSE")
+    engine_df = compute_day_timeline(opening, opening + timedelta(hours=3), 60)
+    engine_explained = explain_timeline_rows(engine_df, engine_df.index)
+    for column in ["Aspect_Changes", "Transits"]:
+        assert exported[column].tolist()[:4] == engine_explained[column].tolist()
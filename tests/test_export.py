@@ -0,0 +1,55 @@
+"""Chunked export: rechunking, CSV round trips, progress and exchange sessions"""
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from astro_engine.export import day_timeline_rows, export_range, iter_day_frames, main, rechunk
+from astro_engine.timeline import compute_day_timeline
+
+
+def test_rechunk_gives_fixed_size_chunks():
+    frames = [pd.DataFrame({"Row": range(start, start + size)}) for start, size in [(0, 3), (3, 0), (3, 8), (11, 2)]]
+    chunks = list(rechunk(frames, chunk_rows=5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 3]
+    assert pd.concat(chunks)["Row"].tolist() == list(range(13))
+
+
+def test_timeline_csv_round_trip(tmp_path):
+    path = tmp_path / "timeline.csv"
+    calls = []
+    rows = export_range("timeline", date(2025, 3, 7), date(2025, 3, 10), str(path), interval_minutes=60,
+                        chunk_rows=4, progress=lambda fraction, message: calls.append(fraction))
+    exported = pd.read_csv(path)
+
+    # Friday and Monday; the weekend is skipped
+    assert rows == len(exported) == 14
+    assert exported["Date"].unique().tolist() == ["2025-03-07", "2025-03-10"]
+    assert calls == [0.5, 1.0]
+    expected = compute_day_timeline(datetime(2025, 3, 10, 9, 15), datetime(2025, 3, 10, 15, 30), 60)
+    monday = exported[exported["Date"] == "2025-03-10"].reset_index(drop=True)
+    assert monday["DateTime"].tolist() == expected["DateTime"].tolist()
+    assert monday["Net_Score"].tolist() == pytest.approx(expected["Net_Score"].tolist())
+
+
+def test_sessions_follow_the_exchange():
+    timeline_df = day_timeline_rows(date(2025, 3, 10), None, None, 30, exchange="NYSE")
+    assert (timeline_df["Time"].iloc[0], timeline_df["Time"].iloc[-1]) == ("09:30", "16:00")
+    reports = list(iter_day_frames("reports", date(2025, 3, 10), date(2025, 3, 10), exchange="LSE"))
+    assert reports[0]["Exchange"].tolist() == ["LSE"]
+    assert "FTSE 100" in reports[0]["Report"][0]
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown export kind"):
+        list(iter_day_frames("everything", date(2025, 3, 10), date(2025, 3, 10)))
+
+
+def test_command_line(tmp_path, capsys):
+    path = tmp_path / "aspects.csv"
+    assert main(["--kind", "aspects", "--start", "2025-03-10", "--end", "2025-03-10", "--interval", "60",
+                 "--session-start", "10:00", "--session-end", "12:00", "--output", str(path)]) == 0
+    exported = pd.read_csv(path)
+    assert sorted(exported["DateTime"].unique()) == ["2025-03-10 10:00", "2025-03-10 11:00", "2025-03-10 12:00"]
+    assert f"to {path}" in capsys.readouterr().out
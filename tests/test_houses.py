@@ -0,0 +1,83 @@
+"""Ascendant, house cusps and lagna changes against the Swiss Ephemeris"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import swisseph as swe
+
+from astro_engine.divisional import SIGNS
+from astro_engine.houses import (
+    EXCHANGE_LOCATIONS,
+    ascendant,
+    exchange_angles,
+    house_cusps,
+    house_positions,
+    lagna_changes
+)
+from astro_engine.stations import to_julian_day
+
+# Every 97 hours over three years, so every hour of the sidereal day comes round
+TIMES = pd.date_range("2024-01-01 09:15", "2026-12-31", freq="97h")
+
+# Mean sidereal time and obliquity against the ephemeris's true values
+TOLERANCE_DEGREES = 0.02
+
+SYSTEM_CODES = {"Whole Sign": b"W", "Equal": b"E", "Porphyry": b"O", "Placidus": b"P"}
+
+
+def angular_error(actual, expected):
+    return np.abs(np.mod(np.asarray(actual) - np.asarray(expected) + 180, 360) - 180)
+
+
+def ephemeris_houses(exchange, code):
+    location = EXCHANGE_LOCATIONS[exchange]
+    cusps, angles = zip(*[
+        swe.houses_ex(julian_day, location["latitude"], location["longitude"], code)
+        for julian_day in to_julian_day(TIMES.to_numpy()).tolist()
+    ])
+    return np.array(cusps)[:, :12], np.array(angles)
+
+
+@pytest.mark.parametrize("exchange", list(EXCHANGE_LOCATIONS))
+def test_angles_match_the_ephemeris(exchange):
+    _, angles = ephemeris_houses(exchange, b"E")
+    computed = exchange_angles(TIMES, exchange)
+    assert angular_error(computed["Ascendant"], angles[:, 0]).max() < TOLERANCE_DEGREES
+    assert angular_error(computed["Midheaven"], angles[:, 1]).max() < TOLERANCE_DEGREES
+    assert angular_error(ascendant(TIMES.to_numpy(), exchange), angles[:, 0]).max() < TOLERANCE_DEGREES
+
+
+@pytest.mark.parametrize("system", list(SYSTEM_CODES))
+@pytest.mark.parametrize("exchange", ["NSE", "LSE"])
+def test_cusps_match_the_ephemeris(system, exchange):
+    expected, _ = ephemeris_houses(exchange, SYSTEM_CODES[system])
+    cusps = house_cusps(TIMES, exchange, system).to_numpy()
+    if system == "Whole Sign":
+        # Sign boundaries only move when the ascendant is within the tolerance of one
+        assert (angular_error(cusps, expected) < 1e-9).mean() > 0.99
+    else:
+        assert angular_error(cusps, expected).max() < TOLERANCE_DEGREES
+
+
+def test_house_positions():
+    cusps = np.array([[0, 30, 60, 90, 120, 150, 180, 210, 240, 270, 300, 330],
+                      [350, 20, 50, 80, 110, 140, 170, 200, 230, 260, 290, 320]], dtype=float)
+    longitudes = np.array([[0.0, 29.9, 359.0], [355.0, 10.0, 345.0]])
+    assert house_positions(longitudes, cusps).tolist() == [[1, 1, 12], [1, 1, 12]]
+
+
+@pytest.mark.parametrize("exchange", ["NSE", "NYSE"])
+def test_lagna_changes_are_sign_ingresses_of_the_ephemeris_ascendant(exchange):
+    location = EXCHANGE_LOCATIONS[exchange]
+    changes = lagna_changes(pd.Timestamp("2025-03-10"), pd.Timestamp("2025-03-12"), exchange)
+    assert 23 <= len(changes) <= 25
+
+    def ephemeris_sign(moment, seconds):
+        julian_day = float(to_julian_day(np.datetime64(moment))) + seconds / 86400
+        rising = swe.houses_ex(julian_day, location["latitude"], location["longitude"], b"E")[1][0]
+        return int(rising // 30)
+
+    for change in changes.itertuples():
+        # The ascendant moves about a degree every four minutes
+        assert SIGNS[ephemeris_sign(change.DateTime, -20)] == change.From
+        assert SIGNS[ephemeris_sign(change.DateTime, 20)] == change.To
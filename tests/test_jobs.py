@@ -0,0 +1,95 @@
+"""Background job queue: progress, results, failures, cancellation and retention"""
+
+import threading
+import time
+
+import pytest
+
+from astro_engine.jobs import JobCancelled, JobQueue, process_pool
+
+
+def wait_until_finished(queue, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while queue.get(job_id).state in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return queue.get(job_id)
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def test_result_and_progress(queue):
+    reports = []
+
+    def analysis(first, second, progress, scale=1):
+        progress(0.5, "halfway")
+        reports.append((progress.__self__.progress, progress.__self__.message))
+        return (first + second) * scale
+
+    job_id = queue.submit(analysis, 2, 3, label="Sum", owner="session-a", scale=10)
+    job = wait_until_finished(queue, job_id)
+    assert (job.state, job.result, job.progress, job.message) == ("done", 50, 1.0, "Complete")
+    assert reports == [(0.5, "halfway")]
+    assert job.label == "Sum" and job.elapsed() >= 0
+    assert [job.id for job in queue.jobs(owner="session-a")] == [job_id]
+    assert queue.jobs(owner="session-b") == []
+
+
+def test_failure_is_recorded(queue):
+    def broken(progress):
+        raise ValueError("no data for that day")
+
+    job = wait_until_finished(queue, queue.submit(broken))
+    assert (job.state, job.error, job.result) == ("failed", "no data for that day", None)
+    assert queue.counts()["failed"] == 1
+
+
+def test_cancel_running_and_queued_jobs(queue):
+    started, release = threading.Event(), threading.Event()
+
+    def long_analysis(progress):
+        started.set()
+        for step in range(1000):
+            release.wait(0.01)
+            progress(step / 1000, f"step {step}")
+        return "finished"
+
+    running = queue.submit(long_analysis)
+    queued = queue.submit(long_analysis)
+    assert started.wait(5)
+    assert queue.cancel(queued) and queue.get(queued).state == "cancelled"
+    assert queue.cancel(running)
+    job = wait_until_finished(queue, running)
+    assert (job.state, job.result) == ("cancelled", None)
+    assert not queue.cancel(running)
+
+
+def test_progress_raises_once_cancelled(queue):
+    job_id = queue.submit(lambda progress: None)
+    job = wait_until_finished(queue, job_id)
+    job._cancel_requested.set()
+    with pytest.raises(JobCancelled):
+        job.report(0.1, "too late")
+
+
+def test_finished_jobs_beyond_the_retention_count_are_forgotten():
+    queue = JobQueue(workers=1, retention_count=2)
+    try:
+        ids = []
+        for value in range(4):
+            ids.append(queue.submit(lambda progress, value=value: value))
+            wait_until_finished(queue, ids[-1])
+        assert queue.get(ids[0]) is None
+        assert queue.get(ids[-1]).result == 3
+        assert len(queue.jobs()) <= 3
+    finally:
+        queue.shutdown()
+
+
+def test_process_pool_runs_work():
+    with process_pool(2) as pool:
+        assert [future.result() for future in [pool.submit(pow, 2, n) for n in range(4)]] == [1, 2, 4, 8]
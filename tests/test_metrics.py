@@ -0,0 +1,103 @@
+"""Metric rendering, latency quantiles, timed stages and fork safety"""
+
+import math
+import os
+import urllib.request
+
+import pytest
+
+from astro_engine import metrics
+from astro_engine.metrics import Registry, default_registry, stage_summary, start_metrics_server, timed, write_metrics
+
+
+def test_counter_and_histogram_render():
+    registry = Registry()
+    requests = registry.counter("astro_requests_total", "Requests", ("kind",))
+    requests.inc(kind="timeline")
+    requests.inc(2, kind='say "hi"')
+    latency = registry.histogram("astro_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    registry.add_collector(lambda: [("astro_entries", "Entries", "gauge", ("cache",), [(("rules",), 3)])])
+
+    lines = registry.render().splitlines()
+    assert "# TYPE astro_requests_total counter" in lines
+    assert 'astro_requests_total{kind="timeline"} 1' in lines
+    assert 'astro_requests_total{kind="say \\"hi\\""} 2' in lines
+    assert [line for line in lines if line.startswith("astro_latency_seconds")] == [
+        'astro_latency_seconds_bucket{le="0.1"} 1',
+        'astro_latency_seconds_bucket{le="1.0"} 2',
+        'astro_latency_seconds_bucket{le="+Inf"} 3',
+        "astro_latency_seconds_count 3",
+        "astro_latency_seconds_sum 5.55"
+    ]
+    assert 'astro_entries{cache="rules"} 3' in lines
+
+
+def test_same_name_returns_the_same_metric():
+    registry = Registry()
+    assert registry.counter("astro_x_total", "X") is registry.counter("astro_x_total", "X")
+
+
+def test_quantiles_interpolate_inside_buckets():
+    histogram = Registry().histogram("astro_q_seconds", "Q", buckets=(1.0, 2.0))
+    assert math.isnan(histogram.quantile(0.5, [0, 0, 0]))
+    assert histogram.quantile(0.5, [2, 2, 0]) == pytest.approx(1.0)
+    assert histogram.quantile(0.75, [2, 2, 0]) == pytest.approx(1.5)
+    assert histogram.quantile(0.99, [0, 0, 5]) == 2.0
+
+
+def test_timed_stages_record_calls_and_errors():
+    @timed("test_stage")
+    def stage(fail):
+        if fail:
+            raise ValueError("bad input")
+        return "ok"
+
+    assert stage(False) == "ok"
+    with pytest.raises(ValueError):
+        stage(True)
+    summary = {row["Stage"]: row for row in stage_summary()}["test_stage"]
+    assert (summary["Calls"], summary["Errors"]) == (2, 1)
+
+
+def test_reset_locks_frees_a_held_lock():
+    registry = Registry()
+    counter = registry.counter("astro_held_total", "Held")
+    # As a forked child sees a lock another parent thread held at fork time
+    counter._lock.acquire()
+    registry._lock.acquire()
+    registry.reset_locks()
+    counter.inc()
+    assert "astro_held_total 1" in registry.render()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_can_record_while_the_parent_holds_a_lock():
+    counter = default_registry().counter("astro_fork_total", "Fork")
+    with counter._lock:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                counter.inc()
+                os._exit(0)
+            finally:
+                os._exit(1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+def test_lru_cache_metrics_and_exports(tmp_path):
+    path = tmp_path / "astro.prom"
+    write_metrics(str(path))
+    text = path.read_text(encoding="utf-8")
+    assert "astro_lru_cache_entries" in text
+    assert os.listdir(tmp_path) == ["astro.prom"]
+
+    server = start_metrics_server(port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+            assert "# TYPE astro_stage_seconds histogram" in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
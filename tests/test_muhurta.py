@@ -0,0 +1,72 @@
+"""Sunrise, sunset and the sunrise-based timing tables"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+import swisseph as swe
+
+from astro_engine.houses import EXCHANGE_LOCATIONS
+from astro_engine.muhurta import (
+    CHOGHADIYA_NATURE,
+    HORA_LORDS,
+    choghadiya_table,
+    hora_table,
+    market_timings,
+    rahu_kaal,
+    sun_times,
+    timing_columns
+)
+from astro_engine.stations import to_julian_day
+
+
+@pytest.mark.parametrize("exchange", list(EXCHANGE_LOCATIONS))
+def test_sunrise_and_sunset_match_the_ephemeris(exchange):
+    location = EXCHANGE_LOCATIONS[exchange]
+    geopos = (location["longitude"], location["latitude"], 0)
+    table = sun_times(2025, exchange).iloc[::7]
+    for column, event in [("Sunrise", swe.CALC_RISE), ("Sunset", swe.CALC_SET)]:
+        for moment in table[column]:
+            julian_day = float(to_julian_day(np.datetime64(moment)))
+            _, found = swe.rise_trans(julian_day - 0.1, swe.SUN, event, geopos, 1013.25, 10, swe.FLG_MOSEPH)
+            assert abs(found[0] - julian_day) * 1440 < 0.5
+
+
+def test_hora_table_follows_the_weekday_lord():
+    monday = date(2025, 3, 10)
+    horas = hora_table(monday)
+    assert len(horas) == 24
+    assert (horas["Start"].iloc[1:].to_numpy() == horas["End"].iloc[:-1].to_numpy()).all()
+    # The Moon rules Monday's first Hora; the lords then follow in the Hora order
+    first = HORA_LORDS.index("Moon")
+    assert horas["Hora"].tolist() == [HORA_LORDS[(first + hour) % 7] for hour in range(24)]
+    assert horas["Period"].tolist() == ["Day"] * 12 + ["Night"] * 12
+
+
+def test_choghadiya_table_and_rahu_kaal():
+    tuesday = date(2025, 3, 11)
+    choghadiyas = choghadiya_table(tuesday)
+    assert len(choghadiyas) == 16
+    assert choghadiyas["Nature"].tolist() == [CHOGHADIYA_NATURE[name] for name in choghadiyas["Choghadiya"]]
+    start, end = rahu_kaal(tuesday)
+    # Tuesday's Rahu Kaal is the seventh eighth of daytime
+    flagged = choghadiyas[choghadiyas["Rahu_Kaal"]]
+    assert flagged.index.tolist() == [6]
+    assert (flagged["Start"].iloc[0].to_pydatetime(), flagged["End"].iloc[0].to_pydatetime()) == (start, end)
+
+
+def test_before_sunrise_belongs_to_the_previous_night():
+    sunrise = sun_times(2025)["Sunrise"].loc["2025-03-10"]
+    labels = timing_columns([sunrise - timedelta(minutes=5), sunrise + timedelta(minutes=5)])
+    sunday_night = hora_table(date(2025, 3, 9))["Hora"].iloc[-1]
+    assert labels["Hora"].tolist() == [sunday_night, "Moon"]
+    assert timing_columns([]).empty
+
+
+def test_market_timings_are_clipped_to_the_session():
+    timings = market_timings(date(2025, 3, 10))
+    assert timings["sunrise"] < datetime(2025, 3, 10, 9, 15) < timings["sunset"]
+    for table in (timings["horas"], timings["choghadiyas"]):
+        assert table["Start"].iloc[0] == pd.Timestamp("2025-03-10 09:15")
+        assert table["End"].iloc[-1] == pd.Timestamp("2025-03-10 15:30")
@@ -0,0 +1,62 @@
+"""Panchang change times against direct ephemeris evaluation"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+import swisseph as swe
+
+from astro_engine.panchang import PANCHANG_ELEMENTS, SIDEREAL_FLAGS, panchang_at, panchang_changes
+from astro_engine.stations import to_julian_day
+
+START, END = datetime(2025, 3, 1), datetime(2025, 3, 15)
+
+
+def direct_part(element, moment):
+    """Name of the element in force at an IST time, straight from the sidereal (Lahiri) ephemeris"""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    julian_day = float(to_julian_day(np.datetime64(moment)))
+    sun = swe.calc_ut(julian_day, swe.SUN, SIDEREAL_FLAGS)[0][0]
+    moon = swe.calc_ut(julian_day, swe.MOON, SIDEREAL_FLAGS)[0][0]
+    (sun_coefficient, moon_coefficient), names = PANCHANG_ELEMENTS[element]
+    phase = (sun_coefficient * sun + moon_coefficient * moon) % 360
+    return names[int(phase // (360 / len(names)))]
+
+
+def test_every_change_is_a_boundary_crossing():
+    changes = panchang_changes(START, END)
+    assert set(changes["Element"]) == set(PANCHANG_ELEMENTS)
+    assert changes["DateTime"].is_monotonic_increasing
+    for change in changes.itertuples():
+        moment = change.DateTime.to_pydatetime()
+        assert direct_part(change.Element, moment - timedelta(seconds=5)) == change.From
+        assert direct_part(change.Element, moment + timedelta(seconds=5)) == change.To
+
+
+def test_labels_match_the_ephemeris():
+    times = pd.date_range(START, END, freq="217min")
+    labels = panchang_at(times)
+    for moment, row in zip(times, labels.itertuples(index=False)):
+        for element, label in zip(labels.columns, row):
+            assert label == direct_part(element, moment.to_pydatetime())
+
+
+def test_other_sidereal_modes_do_not_leak_in():
+    expected = panchang_changes(START, END)
+    swe.set_sid_mode(swe.SIDM_FAGAN_BRADLEY)
+    try:
+        pd.testing.assert_frame_equal(panchang_changes(START, END), expected)
+    finally:
+        swe.set_sid_mode(swe.SIDM_LAHIRI)
+
+
+def test_empty_times():
+    assert panchang_at([]).empty
+
+
+@pytest.mark.parametrize("year", [2024, 2025])
+def test_labels_across_new_year(year):
+    times = pd.date_range(f"{year}-12-31 18:00", f"{year + 1}-01-01 06:00", freq="1h")
+    labels = panchang_at(times)
+    assert labels["Nakshatra"].tolist() == [direct_part("Nakshatra", moment.to_pydatetime()) for moment in times]
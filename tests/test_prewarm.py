@@ -0,0 +1,34 @@
+"""The background prewarmer survives failed passes"""
+
+import time
+
+from astro_engine import prewarm
+from astro_engine.prewarm import Prewarmer
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_failure_to_pick_days_is_reported_and_retried(monkeypatch):
+    calls = []
+
+    def broken_days(**kwargs):
+        calls.append(kwargs)
+        raise ValueError("no trading calendar")
+
+    monkeypatch.setattr(prewarm, "prewarm_days", broken_days)
+    warmer = Prewarmer(cache=object(), check_seconds=0.01)
+    warmer.start()
+    try:
+        assert wait_for(lambda: len(calls) >= 2)
+        assert warmer.is_alive()
+        assert warmer.status["state"] == "failed"
+        assert warmer.status["error"] == "no trading calendar"
+    finally:
+        warmer.stop()
+        warmer.join(5)
+    assert not warmer.is_alive()
@@ -0,0 +1,77 @@
+"""SQLite result cache: round trips, parameter invalidation and eviction"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from astro_engine import result_cache
+from astro_engine.result_cache import ResultCache
+
+DAY = date(2025, 3, 10)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache" / "results.sqlite"))
+
+
+def test_round_trip(cache):
+    frame = pd.DataFrame({"Signal": pd.Categorical(["Buy", "Sell"]), "Net_Score": [1.5, -2.0]})
+    assert cache.get("timeline", DAY, 15, 1.0, "NIFTY") is None
+    assert not cache.contains("timeline", DAY, 15, 1.0, "NIFTY")
+    cache.put(frame, "timeline", DAY, 15, 1.0, "NIFTY")
+    assert cache.contains("timeline", DAY, 15, 1.0, "NIFTY")
+    pd.testing.assert_frame_equal(cache.get("timeline", DAY, 15, 1.0, "NIFTY"), frame)
+
+
+def test_every_input_is_part_of_the_key(cache):
+    cache.put("report", "daily_report", DAY, 30, 1.0, "NIFTY", exchange="NSE")
+    assert cache.get("daily_report", DAY, 30, 1.0, "NIFTY", exchange="NSE") == "report"
+    for changed in [dict(interval=15), dict(min_aspect_weight=2.0), dict(symbol="SENSEX")]:
+        fields = dict(interval=30, min_aspect_weight=1.0, symbol="NIFTY") | changed
+        assert cache.get("daily_report", DAY, exchange="NSE", **fields) is None
+    assert cache.get("daily_report", DAY, 30, 1.0, "NIFTY", exchange="NYSE") is None
+
+
+def test_get_or_compute_computes_once(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(5)
+
+    for _ in range(3):
+        assert cache.get_or_compute(compute, "timeline", DAY, 15, 1.0, "NIFTY").tolist() == list(range(5))
+    assert len(calls) == 1
+
+
+def test_parameter_change_misses_and_purges(cache, monkeypatch):
+    cache.put("old", "timeline", DAY, 15, 1.0, "NIFTY")
+    monkeypatch.setattr(result_cache, "engine_params_hash", lambda: "edited-rules")
+    assert cache.get("timeline", DAY, 15, 1.0, "NIFTY") is None
+    assert cache.stats()["timeline"]["entries"] == 1
+
+    # A cache opened under the new parameters drops everything computed under the old ones
+    assert ResultCache(cache.path).stats() == {}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / "small.sqlite"), max_bytes=30_000)
+    payload = np.random.default_rng(0).bytes(8_000)
+    for day in range(1, 6):
+        cache.put(payload, "timeline", date(2025, 3, day), 15, 1.0, "NIFTY")
+        cache.get("timeline", date(2025, 3, 1), 15, 1.0, "NIFTY")
+    assert cache.stats()["timeline"]["bytes"] <= 30_000
+    assert cache.contains("timeline", date(2025, 3, 1), 15, 1.0, "NIFTY")
+    assert cache.contains("timeline", date(2025, 3, 5), 15, 1.0, "NIFTY")
+    assert not cache.contains("timeline", date(2025, 3, 2), 15, 1.0, "NIFTY")
+
+
+def test_clear_and_size_metrics(cache):
+    cache.put("report", "daily_report", DAY, 30, 1.0, "NIFTY")
+    metrics = {name: samples for name, _, _, _, samples in cache.size_metrics()}
+    assert metrics["astro_result_cache_entries"] == [(("daily_report",), 1)]
+    cache.clear()
+    assert cache.stats() == {}
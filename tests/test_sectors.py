@@ -0,0 +1,45 @@
+"""Sector exposure against one position table at a time"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from astro_engine.core import aspect_rules, calculate_planetary_positions, zodiac_market_traits
+from astro_engine.sectors import SECTORS, sector_heatmap, sector_scores
+
+
+def reference_scores(moment):
+    """Each planet's weight added to every sector of the sign calculate_planetary_positions puts it in"""
+    rules = aspect_rules().source
+    scores = dict.fromkeys(SECTORS, 0.0)
+    for position in calculate_planetary_positions(moment).itertuples():
+        weight = rules["planet_weights"].get(position.Planet, rules.get("default_planet_weight", 1.0))
+        for sector in zodiac_market_traits[position.Sign]["sectors"].split(","):
+            scores[sector.strip()] += weight
+    return scores
+
+
+def test_scores_match_the_position_tables():
+    times = pd.date_range("2024-06-01", "2026-06-01", freq="53D") + pd.Timedelta(hours=9, minutes=15)
+    scores = sector_scores(times)
+    assert list(scores.columns) == SECTORS
+    for moment, row in scores.iterrows():
+        assert row.to_dict() == pytest.approx(reference_scores(moment.to_pydatetime()))
+
+
+def test_daily_heatmap_averages_the_samples():
+    heatmap = sector_heatmap(datetime(2025, 3, 10), datetime(2025, 3, 12))
+    assert list(heatmap.columns) == list(pd.date_range("2025-03-10", "2025-03-12", freq="D"))
+    assert sorted(heatmap.index) == sorted(SECTORS)
+    samples = sector_scores(pd.date_range("2025-03-11", periods=4, freq="6h"))
+    np.testing.assert_allclose(heatmap[pd.Timestamp("2025-03-11")], samples.mean()[heatmap.index], atol=5e-4)
+    # Sectors with the most exposure first
+    means = heatmap.mean(axis=1).to_numpy()
+    assert (np.diff(means) <= 1e-3).all()
+
+
+def test_weekly_heatmap():
+    heatmap = sector_heatmap(datetime(2025, 3, 3), datetime(2025, 3, 30), "Weekly")
+    assert list(heatmap.columns) == list(pd.date_range("2025-03-03", periods=4, freq="W-MON"))
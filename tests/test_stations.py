@@ -0,0 +1,66 @@
+"""Station times and retrograde flags against the ephemeris speed"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from astro_engine.stations import (
+    EPHEMERIS_FLAGS,
+    STATION_BODIES,
+    from_julian_day,
+    retrograde_days,
+    retrograde_mask,
+    station_table,
+    to_julian_day
+)
+
+# A minute either side of a station is enough to see the speed change sign
+MINUTE = 1 / 1440
+
+
+def speed(body, julian_day):
+    return swe.calc_ut(julian_day, body, EPHEMERIS_FLAGS)[0][3]
+
+
+@pytest.mark.parametrize("planet", list(STATION_BODIES))
+def test_speed_changes_sign_at_every_station(planet):
+    body, _ = STATION_BODIES[planet]
+    stations = station_table(2020, 2030)
+    stations = stations[stations["Planet"] == planet]
+    assert len(stations)
+    for julian_day, kind in zip(stations["Julian_Day"], stations["Station"]):
+        before, after = speed(body, julian_day - 5 * MINUTE), speed(body, julian_day + 5 * MINUTE)
+        retrograde = kind == "Stationary Retrograde"
+        assert (before > 0 > after) if retrograde else (before < 0 < after)
+
+
+@pytest.mark.parametrize("start, end", [("2024-01-01", "2025-01-01"), ("1975-01-01", "1976-01-01"),
+                                        ("2070-06-01", "2071-06-01")])
+def test_mask_matches_the_speed_sign(start, end):
+    # Inside the scan window and on either side of it
+    times = np.arange(np.datetime64(start), np.datetime64(end), np.timedelta64(1, "D")) + np.timedelta64(13, "h")
+    for planet, (body, _) in STATION_BODIES.items():
+        expected = [speed(body, julian_day) < 0 for julian_day in to_julian_day(times)]
+        assert retrograde_mask(planet, times).tolist() == expected
+
+
+def test_retrograde_days_match_a_daily_count():
+    for start, end in [(datetime(2024, 1, 1), datetime(2025, 1, 1)), (datetime(1970, 1, 1), datetime(1971, 1, 1))]:
+        times = np.arange(np.datetime64(start), np.datetime64(end), np.timedelta64(1, "h"))
+        counted = retrograde_mask("Mercury", times).sum() / 24
+        assert retrograde_days("Mercury", start, end) == pytest.approx(counted, abs=0.1)
+        assert retrograde_days("Mercury", end, start) == pytest.approx(-counted, abs=0.1)
+
+
+def test_nodes_and_luminaries():
+    moment = datetime(2025, 3, 10, 9, 15)
+    assert retrograde_mask("Rahu", moment) and not retrograde_mask("Sun", moment)
+    assert retrograde_days("Ketu", moment, datetime(2025, 3, 20, 9, 15)) == pytest.approx(10)
+    assert retrograde_days("Moon", moment, datetime(2025, 3, 20, 9, 15)) == 0
+
+
+def test_julian_day_round_trip():
+    times = np.array(["2025-03-10T09:15:00", "1990-01-01T00:00:00"], dtype="datetime64[s]")
+    assert (from_julian_day(to_julian_day(times)) == times).all()
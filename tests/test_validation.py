@@ -0,0 +1,54 @@
+"""Differential validation of the fast engines on seeded cases"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from astro_engine import validation
+from astro_engine.core import calculate_planetary_positions
+from astro_engine.validation import check_case, check_positions, random_cases, validate
+
+
+def test_random_cases_are_reproducible():
+    assert random_cases(6, seed=11) == random_cases(6, seed=11)
+    assert random_cases(6, seed=11) != random_cases(6, seed=12)
+
+
+@pytest.mark.parametrize("seed", [1, 7, 2025])
+def test_seeded_cases_agree_with_the_references(seed):
+    count, divergences = validate(random_cases(3, seed=seed), max_workers=1)
+    assert count == 3
+    assert divergences.empty, divergences.to_string()
+
+
+def test_validate_in_worker_processes():
+    count, divergences = validate(random_cases(2, seed=5), max_workers=2)
+    assert count == 2
+    assert divergences.empty, divergences.to_string()
+
+
+def test_injected_position_error_is_reported(monkeypatch):
+    times = [datetime(2025, 8, 12, 9, 15) + timedelta(minutes=15 * step) for step in range(3)]
+    references = [calculate_planetary_positions(moment) for moment in times]
+    assert check_positions(times, references) == []
+
+    real_longitudes = validation.planet_longitudes
+    monkeypatch.setattr(validation, "planet_longitudes", lambda moments: real_longitudes(moments) + 1e-6)
+    divergences = check_positions(times, references)
+    assert len(divergences) == 3 * len(references[0])
+    assert {divergence["Check"] for divergence in divergences} == {"positions"}
+
+
+def test_failing_case_is_reported_not_raised(monkeypatch):
+    def broken_case(case):
+        raise RuntimeError("engine exploded")
+
+    monkeypatch.setattr(validation, "check_case", broken_case)
+    count, divergences = validate(random_cases(2, seed=3), max_workers=1)
+    assert count == 2
+    assert list(divergences["Check"]) == ["error", "error"]
+    assert list(divergences["Actual"]) == ["engine exploded", "engine exploded"]
+
+
+def test_check_case_returns_no_divergences():
+    assert check_case(random_cases(1, seed=42)[0]) == []